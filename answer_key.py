@@ -0,0 +1,184 @@
+# answer_key.py
+# Records, inside each workbook, which cells grader.py marks and what the
+# right answer is.
+#
+# A task is stored as hidden workbook-level defined names, so the key travels
+# with the file and follows the cells if Excel inserts rows:
+#   Task3_Answer   the cell(s) the student fills in, e.g. Tasks!$C$6 or a
+#                  fill-down range such as Data!$E$3:$E$42
+#   Task3_Model    a model-answer cell (e.g. Answers!$C$6) whose formula is
+#                  the expected one, or
+#   Task3_Formula  the expected formula itself, e.g. LEN("Excel Skills")
+# The expected formula is evaluated as if it sat in the first answer cell
+# (on the answer cell's sheet); for a range it is filled down/across to each
+# cell in turn, the way the student's formula would be.
+#
+# export() also writes the key out as JSON Lines, one answer cell per line
+# with its worked-out result, so a grader can mark against it without
+# opening the original workbook:
+#   {"task": 3, "sheet": "Tasks", "cell": "C6", "formula": "=SUM(Data!C2:C21)",
+#    "expected": 1234.5, "tolerance": 1e-06}
+# An expected Excel error is written as "error": "#N/A" (expected null), and
+# a formula the evaluator can't work out has no "expected" at all.
+#
+# Usage:
+#   import answer_key
+#   answer_key.add_task(wb, 1, "Tasks!C4", "Answers!C4")
+#   answer_key.add_task(wb, 2, "Tasks!D4", '=LEN("Excel Skills")')
+#   answer_key.tasks(wb)     # [Task(task=1, answer=..., model=..., formula=None)]
+#   answer_key.export(wb, "Core_Functions_Practice.key.jsonl")
+#   answer_key.load("Core_Functions_Practice.key.jsonl")   # [{"task": 1, ...}]
+
+import json
+import os
+import re
+from collections import namedtuple
+
+from openpyxl.formula.translate import Translator
+from openpyxl.utils import (
+    absolute_coordinate,
+    get_column_letter,
+    quote_sheetname,
+    range_boundaries,
+)
+from openpyxl.workbook.defined_name import DefinedName
+
+import formula_eval
+
+Task = namedtuple("Task", "task answer model formula")
+
+# Relative tolerance for numeric answers
+TOLERANCE = 1e-6
+
+_TASK_NAME = re.compile(r"^Task(\d+)_(Answer|Model|Formula)$", re.I)
+
+
+def _absolute(ref):
+    """'Tasks'!$C$4 for "Tasks!C4" (a sheet is required)."""
+    sheet, cells = formula_eval.split_ref(ref)
+    if sheet is None:
+        raise ValueError(f"{ref!r} needs a sheet name")
+    return f"{quote_sheetname(sheet)}!{absolute_coordinate(cells.replace('$', ''))}"
+
+
+def _define(wb, name, text):
+    wb.defined_names[name] = DefinedName(name, attr_text=text, hidden=True)
+
+
+def add_task(wb, task, answer, expected):
+    """Register task number task: the student answers in answer ("Tasks!C4")
+    and expected is a model-answer cell ("Answers!C4") or a formula ("=...").
+    """
+    _define(wb, f"Task{task}_Answer", _absolute(answer))
+    if expected.startswith("="):
+        _define(wb, f"Task{task}_Formula", expected[1:])
+    else:
+        _define(wb, f"Task{task}_Model", _absolute(expected))
+
+
+def tasks(names):
+    """The Tasks in a workbook, in task order.
+
+    names is a workbook or its {NAME: text} from formula_eval.defined_names().
+    Tasks without both an answer and an expected part are skipped.
+    """
+    if not isinstance(names, dict):
+        names = formula_eval.defined_names(names)
+    found = {}
+    for name, text in names.items():
+        m = _TASK_NAME.match(name)
+        if m:
+            found.setdefault(int(m.group(1)), {})[m.group(2).lower()] = text
+    return [
+        Task(n, parts["answer"], parts.get("model"), parts.get("formula"))
+        for n, parts in sorted(found.items())
+        if "answer" in parts and ("model" in parts or "formula" in parts)
+    ]
+
+
+# ---------- Expected formulas ----------
+def cells(ref):
+    """(sheet, [(row, col), ...]) for an absolute reference like 'Data'!$E$3:$E$9."""
+    sheet, area = formula_eval.split_ref(ref)
+    min_col, min_row, max_col, max_row = range_boundaries(area.replace("$", ""))
+    return sheet, [
+        (r, c) for r in range(min_row, max_row + 1) for c in range(min_col, max_col + 1)
+    ]
+
+
+def _model_formula(evaluator, task):
+    if task.formula is not None:
+        return "=" + task.formula
+    sheet, [(row, col)] = cells(task.model)
+    cell = evaluator.sheets.get(sheet, {}).get((row, col))
+    value = None if cell is None else cell.value
+    if not (isinstance(value, str) and value.startswith("=")):
+        raise formula_eval.Unsupported(f"no model formula in {task.model}")
+    return value
+
+
+def expected_formulas(evaluator, task):
+    """[(sheet, row, col, formula)]: task's expected formula for each of its
+    answer cells, filled from the first one.
+
+    Raises formula_eval.Unsupported if the model cell holds no formula.
+    """
+    sheet, answer_cells = cells(task.answer)
+    formula = _model_formula(evaluator, task)
+    row, col = answer_cells[0]
+    translator = Translator(formula, f"{get_column_letter(col)}{row}")
+    return [
+        (sheet, r, c, translator.translate_formula(f"{get_column_letter(c)}{r}"))
+        for r, c in answer_cells
+    ]
+
+
+# ---------- Export ----------
+def entries(wb, tolerance=TOLERANCE):
+    """The key of wb as one dict per answer cell (see export())."""
+    evaluator = formula_eval.Evaluator.for_workbook(wb)
+    out = []
+    for task in tasks(wb):
+        try:
+            expected = expected_formulas(evaluator, task)
+        except formula_eval.Unsupported:
+            continue
+        for sheet, row, col, formula in expected:
+            entry = {
+                "task": task.task,
+                "sheet": sheet,
+                "cell": f"{get_column_letter(col)}{row}",
+                "formula": formula,
+            }
+            try:
+                value = evaluator.formula(formula, sheet)
+            except (formula_eval.Unsupported, RecursionError):
+                pass  # left without an expected value
+            else:
+                if isinstance(value, formula_eval.ExcelError):
+                    entry["expected"], entry["error"] = None, value.code
+                else:
+                    entry["expected"] = value
+            entry["tolerance"] = tolerance
+            out.append(entry)
+    return out
+
+
+def export(wb, output, tolerance=TOLERANCE):
+    """Write wb's key to output (a path or text stream) as JSON Lines.
+
+    Returns the number of answer cells written.
+    """
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, "w", encoding="utf-8") as fh:
+            return export(wb, fh, tolerance)
+    rows = entries(wb, tolerance)
+    for entry in rows:
+        output.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    return len(rows)
+
+
+def load(path):
+    """The entries of a key written by export(), in file order."""
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
@@ -0,0 +1,272 @@
+# bench.py
+# Benchmarks every topic generator at several Data sheet sizes and records
+# wall time, CPU time, peak memory and the size of the saved workbook.
+#
+# Each (topic, rows) case runs in a fresh Python process, so peak RSS belongs
+# to that case alone. The sample ROWS are repeated to reach the requested size
+# and SOURCE_DATE_EPOCH is pinned, so output sizes are comparable run to run.
+# topic5 switches to its streaming mode from STREAM_FROM rows up.
+#
+# Usage:
+#   python bench.py                                # all topics, 10 / 1k / 100k / 1M rows
+#   python bench.py topic5 topic9 --rows 10,1k     # some topics, some sizes
+#   python bench.py --repeat 3 --out before.json   # best of 3 runs, saved as JSON
+#   python bench.py --compare before.json          # flag regressions (exit 1)
+#   python bench.py --tracemalloc                  # also record Python heap peaks
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+
+import openpyxl
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+from build_all import HERE, find_topics
+
+DEFAULT_ROWS = "10,1k,100k,1M"
+STREAM_FROM = 100_000
+
+# metric -> (higher is worse by more than the threshold AND by at least this)
+METRICS = {
+    "wall_s": 0.02,
+    "cpu_s": 0.02,
+    "peak_rss_mb": 2.0,
+    "traced_peak_mb": 1.0,
+    "size_bytes": 0,
+}
+
+
+def parse_count(text):
+    """Turn "10", "1k", "100k" or "1M" into an int."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+class Repeat(Sequence):
+    """rows repeated (cyclically) out to n records, without copying them."""
+
+    def __init__(self, rows, n):
+        self.rows = rows
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.n))]
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        return list(self.rows[i % len(self.rows)])
+
+
+# ---------- One case (runs in its own process) ----------
+def run_case(topic, n, tracemalloc=False):
+    """Build topic with n Data rows into a temp file; return the measurements."""
+    module = importlib.import_module(topic)
+    kwargs = {"rows": Repeat(module.ROWS, n)}
+    mode = "normal"
+    if "stream" in inspect.signature(module.build).parameters and n >= STREAM_FROM:
+        kwargs["stream"] = True
+        mode = "stream"
+
+    if tracemalloc:
+        import tracemalloc as tm
+
+        tm.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / module.FILENAME
+        cpu = time.process_time()
+        started = time.perf_counter()
+        module.build(output=str(target), **kwargs)
+        wall = time.perf_counter() - started
+        cpu = time.process_time() - cpu
+        size = target.stat().st_size
+    result = {
+        "topic": topic,
+        "rows": n,
+        "mode": mode,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "size_bytes": size,
+    }
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result["peak_rss_mb"] = round(peak / 1024, 1)
+    if tracemalloc:
+        result["traced_peak_mb"] = round(tm.get_traced_memory()[1] / 2**20, 1)
+    return result
+
+
+def measure(topic, n, tracemalloc=False, timeout=None):
+    """Run one case in a fresh interpreter; failures come back as a status."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--case", topic, str(n)]
+    if tracemalloc:
+        cmd.append("--tracemalloc")
+    env = dict(os.environ)
+    env.setdefault("SOURCE_DATE_EPOCH", "315532800")
+    try:
+        proc = subprocess.run(
+            cmd, cwd=HERE, env=env, capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"topic": topic, "rows": n, "status": "timeout"}
+    if proc.returncode:
+        error = (proc.stderr.strip().splitlines() or ["?"])[-1]
+        return {"topic": topic, "rows": n, "status": "failed", "error": error}
+    return dict(json.loads(proc.stdout.splitlines()[-1]), status="ok")
+
+
+def best_of(runs):
+    """Fastest run's times, highest memory seen; a failure wins outright."""
+    for r in runs:
+        if r["status"] != "ok":
+            return r
+    best = dict(min(runs, key=lambda r: r["wall_s"]))
+    best["cpu_s"] = min(r["cpu_s"] for r in runs)
+    for key in ("peak_rss_mb", "traced_peak_mb"):
+        if key in best:
+            best[key] = max(r[key] for r in runs)
+    return best
+
+
+# ---------- Comparison ----------
+def compare(results, baseline, threshold):
+    """Return [(case, metric, old, new)] for metrics that got worse."""
+    old = {(r["topic"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        before = old.get((r["topic"], r["rows"]))
+        if before is None:
+            continue
+        case = f'{r["topic"]}@{r["rows"]}'
+        if r["status"] != "ok":
+            if before["status"] == "ok":
+                regressions.append((case, "status", "ok", r["status"]))
+            continue
+        if before["status"] != "ok" or before.get("mode") != r.get("mode"):
+            continue
+        # tracemalloc slows a run down and inflates its RSS, so only the
+        # output size is comparable between traced and untraced runs
+        metrics = METRICS
+        if ("traced_peak_mb" in r) != ("traced_peak_mb" in before):
+            metrics = {"size_bytes": METRICS["size_bytes"]}
+        for metric, floor in metrics.items():
+            if metric not in r or metric not in before:
+                continue
+            a, b = before[metric], r[metric]
+            if b > a * (1 + threshold) and b - a > floor:
+                regressions.append((case, metric, a, b))
+    return regressions
+
+
+def _row(r):
+    if r["status"] != "ok":
+        error = r.get("error", "")
+        return f'{r["topic"]:<10} {r["rows"]:>9,}  {r["status"].upper()} {error}'
+    rss, heap = (
+        f"{r[k]:8.1f}" if k in r else " " * 8 for k in ("peak_rss_mb", "traced_peak_mb")
+    )
+    return (
+        f'{r["topic"]:<10} {r["rows"]:>9,} {r["mode"]:<6} {r["wall_s"]:8.3f} '
+        f'{r["cpu_s"]:8.3f} {rss} {heap} {r["size_bytes"]:>12,}'
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the topic generators.")
+    parser.add_argument("topics", nargs="*", help="topic names (default: all)")
+    parser.add_argument(
+        "--rows", default=DEFAULT_ROWS, help=f"Data sizes (default {DEFAULT_ROWS})"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="runs per case (best kept)"
+    )
+    parser.add_argument("--tracemalloc", action="store_true", help="record heap peaks")
+    parser.add_argument(
+        "--timeout", type=float, default=900, help="seconds per run (default 900)"
+    )
+    parser.add_argument("--out", default="bench_results.json", help="results file")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown / growth that counts as a regression (default 0.10)",
+    )
+    parser.add_argument("--case", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        topic, n = args.case
+        print(json.dumps(run_case(topic, int(n), args.tracemalloc)))
+        return 0
+
+    known = find_topics()
+    unknown = [t for t in args.topics if t not in known]
+    if unknown:
+        parser.error(f"unknown topic(s): {', '.join(unknown)}")
+    sizes = [parse_count(s) for s in args.rows.split(",") if s.strip()]
+
+    print(
+        f'{"topic":<10} {"rows":>9} {"mode":<6} {"wall s":>8} {"cpu s":>8} '
+        f'{"rss MB":>8} {"heap MB":>8} {"bytes":>12}'
+    )
+    results = []
+    for topic in args.topics or known:
+        for n in sizes:
+            runs = [
+                measure(topic, n, args.tracemalloc, args.timeout)
+                for _ in range(max(1, args.repeat))
+            ]
+            results.append(best_of(runs))
+            print(_row(results[-1]), flush=True)
+
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "openpyxl": openpyxl.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results -> {args.out}")
+
+    status = 1 if any(r["status"] != "ok" for r in results) else 0
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        for case, metric, a, b in regressions:
+            print(f"REGRESSION {case:<18} {metric:<15} {a} -> {b}")
+        print(
+            f"{len(regressions)} regression(s) against {args.compare} "
+            f"(threshold {args.threshold:.0%})"
+        )
+        status = status or (1 if regressions else 0)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
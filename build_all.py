@@ -0,0 +1,336 @@
+# build_all.py
+# Regenerates every practice workbook by calling each topic's build()
+# (topic4.py ... topic11.py) across a pool of worker processes.
+#
+# Builds are incremental: each topic's inputs (generator source, sample data,
+# local helper modules it imports and the openpyxl version) are hashed and
+# recorded in <out>/.build_manifest.json after a successful build. A topic
+# whose hash matches the manifest and whose workbook (and, with
+# --answer-keys, its exported key) still exists is skipped.
+#
+# Usage:
+#   python build_all.py                 # all topics, one worker per CPU core
+#   python build_all.py -j 4            # four workers
+#   python build_all.py topic5 topic9   # only some topics
+#   python build_all.py --out dist      # write the .xlsx files into dist/
+#   python build_all.py --force         # ignore the manifest, rebuild everything
+#   python build_all.py --reproducible  # byte-identical output (see xlsx_io.py)
+#   python build_all.py --force --trace traces   # per-stage timings (instrument.py)
+#   python build_all.py --lint          # fail a topic whose references are wrong (lint.py)
+#   python build_all.py --answer-keys   # also write <workbook>.key.jsonl (answer_key.py)
+
+import argparse
+import ast
+import hashlib
+import importlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import openpyxl
+
+import answer_key
+import instrument
+import xlsx_io
+
+HERE = Path(__file__).resolve().parent
+MANIFEST = ".build_manifest.json"
+
+# status is "built", "cached" or "failed"
+Result = namedtuple("Result", "name output seconds status error")
+
+
+# ---------- Discovery ----------
+def _natural_key(name):
+    # topic4 < topic10a < topic11
+    return [int(p) if p.isdigit() else p for p in re.split(r"(\d+)", name)]
+
+
+def find_topics(root=HERE):
+    """Return the topic generator names (e.g. "topic10a") found in root."""
+    names = [p.stem for p in root.glob("topic*.py")]
+    return sorted(names, key=_natural_key)
+
+
+# ---------- Input hashing ----------
+def local_imports(path, root=HERE):
+    """Return the repo-local modules path imports, transitively (sorted)."""
+    seen = set()
+    pending = [Path(path)]
+    while pending:
+        tree = ast.parse(pending.pop().read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [a.name for a in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                dep = root / f"{name.split('.')[0]}.py"
+                if dep.exists() and dep not in seen:
+                    seen.add(dep)
+                    pending.append(dep)
+    seen.discard(Path(path))
+    return sorted(seen)
+
+
+def data_constants(module):
+    """The module-level sample data (ROWS, SCORES_ROWS, PRODUCTS, ...)."""
+    return {
+        k: v
+        for k, v in sorted(vars(module).items())
+        if k.isupper() and isinstance(v, (list, tuple))
+    }
+
+
+def input_hash(name, root=HERE):
+    """Hash everything that decides what topic `name` writes."""
+    h = hashlib.sha256()
+    source = root / f"{name}.py"
+    h.update(source.read_bytes())
+    for dep in local_imports(source, root):
+        h.update(dep.name.encode())
+        h.update(dep.read_bytes())
+    h.update(repr(data_constants(importlib.import_module(name))).encode())
+    h.update(f"openpyxl {openpyxl.__version__}".encode())
+    h.update(f"SOURCE_DATE_EPOCH={xlsx_io.source_date_epoch()}".encode())
+    return h.hexdigest()
+
+
+def load_manifest(out_dir, name=MANIFEST):
+    try:
+        return json.loads((Path(out_dir) / name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest, name=MANIFEST):
+    path = Path(out_dir) / name
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ---------- Worker ----------
+def atomic_save(build, target, **kwargs):
+    """Call build(output=<temp file>, **kwargs), then rename onto target.
+
+    The temporary file lives next to target, so os.replace() never crosses
+    a filesystem boundary and readers only ever see complete workbooks.
+    """
+    target = Path(target)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as fh:
+            build(output=fh, **kwargs)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return target
+
+
+def save_answer_key(wb, target):
+    """Write wb's answer key next to workbook target as <name>.key.jsonl,
+    if it has one; returns the key's path or None."""
+    if not answer_key.tasks(wb):
+        return None
+    text = io.StringIO()
+    answer_key.export(wb, text)
+    data = text.getvalue().encode("utf-8")
+    return atomic_save(
+        lambda output: output.write(data), Path(target).with_suffix(".key.jsonl")
+    )
+
+
+def build_topic(name, out_dir, trace=None, trace_format="json", answer_keys=False):
+    """Build one topic's workbook into out_dir and time it.
+
+    With trace set to a directory, the build's stage timings are written
+    there as <topic>.json (or <topic>.trace.json in Chrome format). With
+    answer_keys set the workbook's answer key is exported beside it.
+    Returns (workbook name, key file name or None, seconds).
+    """
+    if trace:
+        instrument.enable()
+    started = time.perf_counter()
+    built = []
+    key = None
+    try:
+        topic = importlib.import_module(name)
+        target = atomic_save(
+            lambda output: built.append(topic.build(output)),
+            Path(out_dir) / topic.FILENAME,
+        )
+        if answer_keys:
+            key = save_answer_key(built[0], target)
+    finally:
+        if trace:
+            suffix = ".trace.json" if trace_format == "chrome" else ".json"
+            instrument.dump(Path(trace) / f"{name}{suffix}", trace_format)
+            instrument.disable()
+    return target.name, key and key.name, time.perf_counter() - started
+
+
+# ---------- Driver ----------
+def _key_exists(out_dir, entry):
+    """Whether the manifest entry's answer key was exported and is still
+    there (a topic without tasks has none to export)."""
+    if "answer_key" not in entry:
+        return False
+    return entry["answer_key"] is None or (out_dir / entry["answer_key"]).exists()
+
+
+def build_all(
+    topics=None,
+    out_dir=HERE,
+    jobs=None,
+    force=False,
+    trace=None,
+    trace_format="json",
+    answer_keys=False,
+):
+    """Build the given topics (default: all) and return a Result per topic.
+
+    Topics whose input hash matches the manifest are reported as "cached"
+    unless force is set. Results are in topic order. trace names a directory
+    for per-topic stage timings (see build_topic); answer_keys exports each
+    workbook's answer key beside it.
+    """
+    topics = topics or find_topics()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if trace:
+        Path(trace).mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(out_dir)
+
+    results = {}
+    hashes = {}
+    stale = []
+    for name in topics:
+        hashes[name] = input_hash(name)
+        entry = manifest.get(name, {})
+        output = entry.get("output")
+        if (
+            not force
+            and entry.get("hash") == hashes[name]
+            and output
+            and (out_dir / output).exists()
+            and (not answer_keys or _key_exists(out_dir, entry))
+        ):
+            results[name] = Result(name, output, 0.0, "cached", None)
+        else:
+            stale.append(name)
+
+    if stale:
+        jobs = max(1, min(jobs or os.cpu_count() or 1, len(stale)))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(
+                    build_topic, t, str(out_dir), trace, trace_format, answer_keys
+                ): t
+                for t in stale
+            }
+            for fut in as_completed(futures):
+                name = futures[fut]
+                try:
+                    output, key, seconds = fut.result()
+                except Exception as exc:  # report and keep building the rest
+                    results[name] = Result(name, None, 0.0, "failed", exc)
+                    manifest.pop(name, None)
+                    continue
+                results[name] = Result(name, output, seconds, "built", None)
+                manifest[name] = {"hash": hashes[name], "output": output}
+                if answer_keys:
+                    manifest[name]["answer_key"] = key  # None: nothing to key
+        save_manifest(out_dir, manifest)
+    return [results[t] for t in topics]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build all practice workbooks.")
+    parser.add_argument("topics", nargs="*", help="topic names, e.g. topic5 topic9")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    parser.add_argument("--out", default=str(HERE), help="output directory")
+    parser.add_argument(
+        "--force", action="store_true", help="rebuild even if inputs are unchanged"
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="pin timestamps (SOURCE_DATE_EPOCH, default 1980-01-01)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="DIR",
+        help="write per-stage timings of each built topic into DIR",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=instrument.FORMATS,
+        default="json",
+        help="span tree (json) or Chrome trace events (chrome)",
+    )
+    parser.add_argument(
+        "--lint",
+        action="store_true",
+        help="check every workbook's references before saving it (lint.py)",
+    )
+    parser.add_argument(
+        "--answer-keys",
+        action="store_true",
+        help="also export each workbook's answer key as <name>.key.jsonl",
+    )
+    args = parser.parse_args(argv)
+    if args.reproducible:
+        # inherited by the worker processes
+        os.environ.setdefault("SOURCE_DATE_EPOCH", str(xlsx_io.ZIP_EPOCH))
+    if args.lint:
+        os.environ["XLSX_LINT"] = "1"
+
+    known = find_topics()
+    unknown = [t for t in args.topics if t not in known]
+    if unknown:
+        parser.error(f"unknown topic(s): {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    results = build_all(
+        args.topics or known,
+        args.out,
+        args.jobs,
+        args.force,
+        args.trace,
+        args.trace_format,
+        args.answer_keys,
+    )
+    wall = time.perf_counter() - started
+
+    for r in results:
+        if r.status == "failed":
+            print(f"{r.name:<10} FAILED  {r.error!r}")
+        elif r.status == "cached":
+            print(f"{r.name:<10}  cached  {r.output}")
+        else:
+            print(f"{r.name:<10} {r.seconds:7.2f}s  {r.output}")
+    built = sum(r.status == "built" for r in results)
+    cached = sum(r.status == "cached" for r in results)
+    failed = sum(r.status == "failed" for r in results)
+    total = sum(r.seconds for r in results)
+    print(
+        f"Built {built}/{len(results)} topics in {wall:.2f}s wall "
+        f"({total:.2f}s summed); cache: {cached} hits, {built + failed} misses"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,534 @@
+# charts.py
+# Draws the workbooks' charts as SVG for previews and other output that
+# can't show an Excel chart, with a disk cache so identical charts are
+# only drawn once.
+#
+# spec() reads a chart into a plain dict: its kind, titles, size and data
+# labels, plus the data its series point at. The data is worked out with
+# formula_eval, so a chart over formulas shows their results. svg() draws
+# that: column and bar charts (clustered), line charts and pie charts, which
+# is every chart the topics make. Other kinds are skipped.
+#
+# render() keys each drawing on a hash of the spec, data included, and of
+# this file, and keeps it in <cache>/<ab>/<hash>.svg. A bulk preview of many
+# student variants draws each distinct chart once; charts whose data
+# didn't change between variants (or runs) are copied from the cache.
+#
+# Usage:
+#   python charts.py                           # every topic's charts into previews/
+#   python charts.py topic10c topic11          # some topics
+#   python charts.py variants/topic10a -j 8    # every .xlsx under a folder
+#   python charts.py dist/*.xlsx --out previews --cache .chart_cache
+
+import argparse
+import hashlib
+import importlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl import load_workbook
+from openpyxl.utils import range_boundaries
+
+import build_all
+import formula_eval
+from grader import find_submissions
+from guides import width
+
+HERE = Path(__file__).resolve().parent
+CACHE = ".chart_cache"
+
+# Office's default series colours
+PALETTE = (
+    "#4472C4", "#ED7D31", "#A5A5A5", "#FFC000", "#5B9BD5",
+    "#70AD47", "#264478", "#9E480E", "#636363", "#997300",
+)  # fmt: skip
+FONT = "Helvetica, Arial, sans-serif"
+PX_PER_CM = 96 / 2.54
+EMU_PER_CM = 360000
+PAD = 10
+
+
+# ---------- Chart definitions ----------
+def _title_text(title, evaluator):
+    """The text of an openpyxl Title (rich text or a cell reference)."""
+    if title is None or title.tx is None:
+        return None
+    if title.tx.rich is not None:
+        text = "".join(run.t or "" for p in title.tx.rich.p for run in (p.r or ()))
+        return text or None
+    if title.tx.strRef is not None:
+        values = _values(title.tx.strRef.f, evaluator)
+        return None if not values else _label(values[0])
+
+
+def _values(ref, evaluator):
+    """The values of the cells ref ('Data'!$B$2:$B$13) names, row by row."""
+    sheet, area = formula_eval.split_ref(ref)
+    min_col, min_row, max_col, max_row = range_boundaries(area.replace("$", ""))
+    out = []
+    for row in range(min_row, max_row + 1):
+        for col in range(min_col, max_col + 1):
+            try:
+                value = evaluator.cell(sheet, row, col)
+            except (formula_eval.Unsupported, RecursionError):
+                value = None
+            if isinstance(value, formula_eval.ExcelError):
+                value = None
+            out.append(value)
+    return out
+
+
+def _label(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _number(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+def _source(data, evaluator):
+    """The values behind a series' cat/val/tx (a reference or literals)."""
+    if data is None:
+        return []
+    for kind in ("numRef", "strRef", "multiLvlStrRef"):
+        ref = getattr(data, kind, None)
+        if ref is not None and ref.f:
+            return _values(ref.f, evaluator)
+    literal = getattr(data, "numLit", None) or getattr(data, "strLit", None)
+    if literal is not None:
+        return [p.v for p in literal.pt]
+    if getattr(data, "v", None) is not None:
+        return [data.v]
+    return []
+
+
+def spec(chart, evaluator):
+    """A chart's definition and data as a JSON-friendly dict, or None for a
+    kind svg() can't draw."""
+    kind = type(chart).__name__
+    if kind not in ("BarChart", "LineChart", "PieChart") or len(chart._charts) > 1:
+        return None
+    width_cm, height_cm = chart.width, chart.height
+    extent = getattr(chart.anchor, "ext", None)
+    if extent is not None:  # a loaded chart's size is only in its anchor
+        width_cm, height_cm = extent.width / EMU_PER_CM, extent.height / EMU_PER_CM
+    labels = chart.dataLabels
+    series = []
+    for s in chart.series:
+        name = _source(s.tx, evaluator)
+        series.append(
+            {
+                "name": _label(name[0]) if name else f"Series{len(series) + 1}",
+                "categories": [_label(v) for v in _source(s.cat, evaluator)],
+                "values": [_number(v) for v in _source(s.val, evaluator)],
+            }
+        )
+    out = {
+        "kind": kind[: -len("Chart")].lower(),
+        "title": _title_text(chart.title, evaluator),
+        "width": round(width_cm * PX_PER_CM),
+        "height": round(height_cm * PX_PER_CM),
+        "series": series,
+        "labels": None,
+    }
+    if labels is not None:
+        out["labels"] = (
+            "percent" if labels.showPercent else "value" if labels.showVal else None
+        )
+    if kind == "BarChart":
+        out["horizontal"] = chart.type == "bar"
+    if kind != "PieChart":
+        out["x_title"] = _title_text(chart.x_axis.title, evaluator)
+        out["y_title"] = _title_text(chart.y_axis.title, evaluator)
+    return out
+
+
+def specs(wb, evaluator=None):
+    """[(sheet title, chart number from 1, spec or None)] for wb's charts."""
+    evaluator = evaluator or formula_eval.Evaluator.for_workbook(wb)
+    return [
+        (ws.title, n, spec(chart, evaluator))
+        for ws in wb.worksheets
+        for n, chart in enumerate(ws._charts, start=1)
+    ]
+
+
+# ---------- Drawing ----------
+def _fmt(x):
+    return f"{x:.1f}".rstrip("0").rstrip(".")
+
+
+def _text(
+    x, y, text, size=11, anchor="start", weight=None, color="#404040", rotate=None
+):
+    attrs = f'x="{_fmt(x)}" y="{_fmt(y)}" font-size="{size}"'
+    if anchor != "start":
+        attrs += f' text-anchor="{anchor}"'
+    if weight:
+        attrs += f' font-weight="{weight}"'
+    if rotate is not None:
+        attrs += f' transform="rotate({rotate} {_fmt(x)} {_fmt(y)})"'
+    return f'<text {attrs} fill="{color}">{escape(text)}</text>'
+
+
+def _fit(text, room, size):
+    """text cut short (with an ellipsis) to fit room pixels."""
+    if width(text, "regular", size) <= room:
+        return text
+    while text and width(text + "…", "regular", size) > room:
+        text = text[:-1]
+    return text + "…" if text else ""
+
+
+def _show(value):
+    """A value label or tick: 1,250 / 0.25 / 12.5"""
+    if float(value).is_integer():
+        return f"{int(value):,}"
+    return f"{value:,.2f}".rstrip("0").rstrip(".")
+
+
+def _ticks(values):
+    """(low, high, step) of a value axis that takes in 0 and every value."""
+    low = min([0.0] + values)
+    high = max([0.0] + values)
+    if high == low:
+        high = low + 1
+    raw = (high - low) / 5
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    return math.floor(low / step) * step, math.ceil(high / step) * step, step
+
+
+def _legend(names, x, y, colors):
+    out = []
+    for i, name in enumerate(names):
+        row = y + i * 18
+        out.append(
+            f'<rect x="{_fmt(x)}" y="{_fmt(row - 9)}" width="10" height="10" '
+            f'fill="{colors[i % len(colors)]}"/>'
+        )
+        out.append(_text(x + 15, row, name, size=10))
+    return out
+
+
+def _axes_chart(spec, parts, left, top, right, bottom):
+    """Column, bar and line charts: gridlines, axes, series and labels."""
+    series = spec["series"]
+    categories = max((s["categories"] for s in series), key=len, default=[])
+    count = max([len(categories)] + [len(s["values"]) for s in series]) or 1
+    numbers = [v for s in series for v in s["values"] if v is not None]
+    low, high, step = _ticks(numbers)
+    horizontal = spec.get("horizontal", False)
+    value_span = (right - left) if horizontal else (bottom - top)
+    cat_span = (bottom - top) if horizontal else (right - left)
+
+    def scale(value):  # value -> pixels along the value axis from low
+        return (value - low) / (high - low) * value_span
+
+    def at(cat_pos, value):  # (position along categories, value) -> (x, y)
+        if horizontal:  # first category at the bottom, like Excel
+            return left + scale(value), bottom - cat_pos
+        return left + cat_pos, bottom - scale(value)
+
+    # gridlines and value ticks
+    steps = round((high - low) / step)
+    for i in range(steps + 1):
+        value = low + i * step
+        x1, y1 = at(0, value)
+        x2, y2 = at(cat_span, value)
+        parts.append(
+            f'<line x1="{_fmt(x1)}" y1="{_fmt(y1)}" x2="{_fmt(x2)}" y2="{_fmt(y2)}" '
+            f'stroke="#D9D9D9"/>'
+        )
+        if horizontal:
+            parts.append(_text(x1, bottom + 14, _show(value), 9, "middle"))
+        else:
+            parts.append(_text(left - 5, y1 + 3, _show(value), 9, "end"))
+    zero = at(0, max(low, 0))
+    end = at(cat_span, max(low, 0))
+    parts.append(
+        f'<line x1="{_fmt(zero[0])}" y1="{_fmt(zero[1])}" x2="{_fmt(end[0])}" '
+        f'y2="{_fmt(end[1])}" stroke="#A6A6A6"/>'
+    )
+
+    # category labels, thinned out when they'd overlap
+    group = cat_span / count
+    every = 1 if horizontal else max(1, math.ceil(16 / group))
+    for i, name in enumerate(categories[:count]):
+        if i % every:
+            continue
+        mid = (i + 0.5) * group
+        if horizontal:
+            _, y = at(mid, low)
+            parts.append(
+                _text(left - 5, y + 3, _fit(name, left - PAD - 5, 9), 9, "end")
+            )
+        else:
+            x, _ = at(mid, low)
+            room = group * every - 4
+            parts.append(_text(x, bottom + 14, _fit(name, room, 9), 9, "middle"))
+
+    base = max(low, min(high, 0))
+    if spec["kind"] == "bar":
+        bar = group / (len(series) + 1.5)  # Excel's default 150% gap
+        for k, s in enumerate(series):
+            color = PALETTE[k % len(PALETTE)]
+            for i, value in enumerate(s["values"][:count]):
+                if value is None:
+                    continue
+                start = i * group + bar * (0.75 + k)
+                (x1, y1), (x2, y2) = at(start, base), at(start + bar, value)
+                x, y = min(x1, x2), min(y1, y2)
+                w, h = abs(x2 - x1), abs(y2 - y1)
+                parts.append(
+                    f'<rect x="{_fmt(x)}" y="{_fmt(y)}" width="{_fmt(w)}" '
+                    f'height="{_fmt(h)}" fill="{color}"/>'
+                )
+                if spec["labels"] == "value":
+                    if horizontal:
+                        parts.append(_text(x + w + 3, y + h / 2 + 3, _show(value), 8))
+                    else:
+                        parts.append(_text(x + w / 2, y - 3, _show(value), 8, "middle"))
+    else:  # line
+        for k, s in enumerate(series):
+            color = PALETTE[k % len(PALETTE)]
+            points = [
+                at((i + 0.5) * group, v)
+                for i, v in enumerate(s["values"][:count])
+                if v is not None
+            ]
+            path = " ".join(f"{_fmt(x)},{_fmt(y)}" for x, y in points)
+            parts.append(
+                f'<polyline points="{path}" fill="none" stroke="{color}" '
+                f'stroke-width="2.25"/>'
+            )
+            for x, y in points:
+                parts.append(
+                    f'<circle cx="{_fmt(x)}" cy="{_fmt(y)}" r="2.5" fill="{color}"/>'
+                )
+
+
+def _pie_chart(spec, parts, left, top, right, bottom):
+    """The first series as slices clockwise from 12 o'clock, like Excel."""
+    s = spec["series"][0] if spec["series"] else {"values": [], "categories": []}
+    values = [max(v or 0, 0) for v in s["values"]]
+    total = sum(values)
+    radius = max(min(right - left, bottom - top) / 2 - 4, 1)
+    cx, cy = (left + right) / 2, (top + bottom) / 2
+    angle = 0.0
+    for i, value in enumerate(values):
+        if not value:
+            continue
+        color = PALETTE[i % len(PALETTE)]
+        sweep = value / total * 2 * math.pi
+        if value == total:
+            parts.append(
+                f'<circle cx="{_fmt(cx)}" cy="{_fmt(cy)}" r="{_fmt(radius)}" '
+                f'fill="{color}"/>'
+            )
+        else:
+            x1 = cx + radius * math.sin(angle)
+            y1 = cy - radius * math.cos(angle)
+            x2 = cx + radius * math.sin(angle + sweep)
+            y2 = cy - radius * math.cos(angle + sweep)
+            large = 1 if sweep > math.pi else 0
+            parts.append(
+                f'<path d="M{_fmt(cx)},{_fmt(cy)} L{_fmt(x1)},{_fmt(y1)} '
+                f'A{_fmt(radius)},{_fmt(radius)} 0 {large} 1 {_fmt(x2)},{_fmt(y2)} Z" '
+                f'fill="{color}" stroke="#FFFFFF"/>'
+            )
+        if spec["labels"]:
+            mid = angle + sweep / 2
+            x = cx + radius * 0.65 * math.sin(mid)
+            y = cy - radius * 0.65 * math.cos(mid) + 3
+            text = (
+                f"{value / total:.0%}" if spec["labels"] == "percent" else _show(value)
+            )
+            parts.append(_text(x, y, text, 9, "middle", color="#FFFFFF"))
+        angle += sweep
+
+
+def svg(spec):
+    """The chart described by spec (see spec()) as an SVG document."""
+    w, h = spec["width"], spec["height"]
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" '
+        f'viewBox="0 0 {w} {h}" font-family={quoteattr(FONT)}>',
+        f'<rect width="{w}" height="{h}" fill="#FFFFFF" stroke="#D9D9D9"/>',
+    ]
+    left, top, right, bottom = PAD, PAD, w - PAD, h - PAD
+    if spec["title"]:
+        parts.append(
+            _text(w / 2, top + 14, _fit(spec["title"], w - 2 * PAD, 14), 14, "middle")
+        )
+        top += 26
+
+    pie = spec["kind"] == "pie"
+    names = (
+        (spec["series"][0]["categories"] if spec["series"] else [])
+        if pie
+        else [s["name"] for s in spec["series"]]
+    )
+    if pie or len(names) > 1:
+        legend = min(
+            max((width(n, "regular", 10) for n in names), default=0) + 25, w / 3
+        )
+        right -= legend
+        first = (top + bottom) / 2 - (len(names) - 1) * 9
+        parts += _legend(
+            [_fit(n, legend - 25, 10) for n in names], right + 10, first, PALETTE
+        )
+
+    if pie:
+        _pie_chart(spec, parts, left, top, right, bottom)
+    else:
+        if spec.get("y_title"):
+            parts.append(
+                _text(
+                    left + 10,
+                    (top + bottom) / 2,
+                    spec["y_title"],
+                    10,
+                    "middle",
+                    rotate=-90,
+                )
+            )
+            left += 16
+        if spec.get("x_title"):
+            parts.append(
+                _text((left + right) / 2, bottom - 2, spec["x_title"], 10, "middle")
+            )
+            bottom -= 16
+        numbers = [v for s in spec["series"] for v in s["values"] if v is not None]
+        low, high, step = _ticks(numbers)
+        if spec.get("horizontal"):
+            cats = [c for s in spec["series"] for c in s["categories"]]
+            left += (
+                min(max((width(c, "regular", 9) for c in cats), default=0), w / 4) + 8
+            )
+        else:
+            ticks = [
+                _show(low + i * step) for i in range(round((high - low) / step) + 1)
+            ]
+            left += max(width(t, "regular", 9) for t in ticks) + 8
+        bottom -= 18
+        _axes_chart(spec, parts, left, top, right, bottom)
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+# ---------- Cache ----------
+def _renderer_hash():
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def key(spec):
+    """The cache key of spec: a hash of the chart, its data and this file."""
+    h = hashlib.sha256(_renderer_hash().encode())
+    h.update(json.dumps(spec, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+def render(spec, cache=CACHE):
+    """(SVG text, True if it came from the cache) for spec. cache is the
+    cache directory, or None to always draw."""
+    if cache is None:
+        return svg(spec), False
+    path = Path(cache) / (digest := key(spec))[:2] / f"{digest}.svg"
+    try:
+        return path.read_text(encoding="utf-8"), True
+    except OSError:
+        pass
+    text = svg(spec)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode("utf-8")
+    build_all.atomic_save(lambda output: output.write(data), path)
+    return text, False
+
+
+# ---------- Previews ----------
+def preview(source, out_dir, cache=CACHE):
+    """Write every chart of source (a topic name or .xlsx path) as
+    <out_dir>/<workbook>/<sheet>-<n>.svg. Returns (drawn, reused, skipped)."""
+    if Path(source).is_file():
+        wb, stem = load_workbook(source), Path(source).stem
+    else:
+        module = importlib.import_module(source)
+        wb, stem = module.build(), Path(module.FILENAME).stem
+    drawn = reused = skipped = 0
+    for sheet, n, chart in specs(wb):
+        if chart is None:
+            skipped += 1
+            continue
+        text, hit = render(chart, cache)
+        reused += hit
+        drawn += not hit
+        target = Path(out_dir) / stem / f"{sheet}-{n}.svg"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+    return drawn, reused, skipped
+
+
+def _preview_job(job):
+    return preview(*job)
+
+
+def preview_all(sources, out_dir, cache=CACHE, jobs=None):
+    """preview() every source in parallel; returns the summed counts."""
+    work = [(str(s), str(out_dir), cache) for s in sources]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(work) or 1))
+    if jobs == 1:
+        counts = [_preview_job(w) for w in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunk = max(1, len(work) // (jobs * 8))
+            counts = list(pool.map(_preview_job, work, chunksize=chunk))
+    return tuple(sum(c) for c in zip(*counts)) if counts else (0, 0, 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Draw workbook charts as SVG.")
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="topic names, .xlsx files or folders of them (default: all topics)",
+    )
+    parser.add_argument("--out", default="previews", help="output directory")
+    parser.add_argument(
+        "--cache", default=CACHE, help=f"chart cache directory (default: {CACHE})"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="draw every chart")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    args = parser.parse_args(argv)
+
+    inputs = args.inputs or build_all.find_topics()
+    topics = [i for i in inputs if not Path(i).exists()]
+    sources = topics + find_submissions([i for i in inputs if Path(i).exists()])
+    started = time.perf_counter()
+    drawn, reused, skipped = preview_all(
+        sources, args.out, None if args.no_cache else args.cache, args.jobs
+    )
+    print(
+        f"{drawn + reused} charts from {len(sources)} workbooks in "
+        f"{time.perf_counter() - started:.2f}s -> {args.out}: {drawn} drawn, "
+        f"{reused} from the cache, {skipped} of kinds not drawn"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
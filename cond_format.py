@@ -0,0 +1,574 @@
+# cond_format.py
+# Works out what a sheet's conditional formats show, without Excel: the fill,
+# font colour, data bar or colour-scale colour each cell ends up with. Used by
+# previews and the PDF guides, and to check whether a student highlighted the
+# right cells: compare the formats of their sheet with the model's.
+#
+# Rules are applied a column at a time rather than cell by cell. A column's
+# values are read once as one range. A rule formula is parsed once, and every
+# part of it that doesn't move from cell to cell, such as the
+# LARGE($C$2:$C$41,3) in =C2>=LARGE($C$2:$C$41,3), is worked out once and
+# folded into the tree as a value. The rest is evaluated over the whole column
+# as lists. Thresholds for data bars, colour scales, top/bottom N, above
+# average and duplicates are worked out once per rule over its range.
+#
+# Supported rule types: cellIs, expression, dataBar, colorScale, top10,
+# aboveAverage, duplicateValues, uniqueValues, containsText, notContainsText,
+# beginsWith, endsWith, containsBlanks, notContainsBlanks, containsErrors and
+# notContainsErrors. Rules apply in priority order: a higher-priority rule's
+# fill or font wins, and stopIfTrue keeps lower ones off a cell. A rule of
+# another type (or one with a formula formula_eval can't work out) is
+# skipped and reported.
+#
+# Usage:
+#   cond_format.evaluate(wb)    # {sheet title: {"C5": {"fill": "FFC7CE", ...}}}
+#   cond_format.differences(model["Data"], student["Data"])  # [("C7", want, got)]
+#   python cond_format.py topic10b               # what each sheet highlights
+#   python cond_format.py returned/ann.xlsx --cells
+
+import argparse
+import importlib
+import math
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+
+import formula_eval
+from formula_eval import ExcelError, Unsupported
+
+_PART = re.compile(r"^(\$?)([A-Za-z]*)(\$?)(\d*)$")
+# rules that only colour cells, whose stopIfTrue Excel ignores
+_GRADED = ("dataBar", "colorScale", "iconSet")
+
+
+# ---------- Rule formulas ----------
+def _moves(area):
+    """(row, col, row, col) flags for the corners of area (C2, $C$2:$C9)
+    that move when the formula is filled to another cell."""
+    parts = area.split(":")
+    flags = []
+    for part in (parts[0], parts[-1]):
+        m = _PART.match(part)
+        if m is None:
+            return (False,) * 4
+        col_fixed, col, row_fixed, row = m.groups()
+        flags += [bool(row) and not row_fixed, bool(col) and not col_fixed]
+    return tuple(flags)
+
+
+class _RuleParser(formula_eval._Parser):
+    """formula_eval's parser, with relative references marked as
+    ("moving", ref node, _moves flags)."""
+
+    def operand(self, token):
+        node = super().operand(token)
+        if node[0] == "ref":
+            moves = _moves(formula_eval.split_ref(token.value)[1])
+            if any(moves):
+                return ("moving", node, moves)
+        return node
+
+
+def _moving(node):
+    kind = node[0]
+    if kind == "moving":
+        return True
+    if kind == "op":
+        return _moving(node[2]) or _moving(node[3])
+    if kind == "neg":
+        return _moving(node[1])
+    if kind == "call":
+        return any(_moving(a) for a in node[2])
+    return False
+
+
+def _fold(node, evaluator, sheet):
+    """node with every part that reads no moving reference worked out."""
+    kind = node[0]
+    if kind in ("value", "blank", "error", "moving"):
+        return node
+    if _moving(node):
+        if kind == "op":
+            return (
+                "op",
+                node[1],
+                _fold(node[2], evaluator, sheet),
+                _fold(node[3], evaluator, sheet),
+            )
+        if kind == "neg":
+            return ("neg", _fold(node[1], evaluator, sheet))
+        return ("call", node[1], [_fold(a, evaluator, sheet) for a in node[2]])
+    try:
+        return ("value", evaluator.eval(node, sheet))
+    except ExcelError as error:
+        return ("error", error.code)
+    except Unsupported:
+        return node  # e.g. the branch of an IF that is never taken
+
+
+def compile_rule(formula, evaluator, sheet):
+    """The parse tree of a rule formula, with fixed parts folded."""
+    try:
+        parser = _RuleParser("=" + formula.lstrip("="))
+    except Exception as problem:  # the Tokenizer's own errors
+        raise Unsupported(f"cannot parse {formula!r}: {problem}") from None
+    return _fold(parser.parse(), evaluator, sheet)
+
+
+def _shift(node, drow, dcol):
+    """The ref node a moving reference becomes drow rows, dcol columns on."""
+    _, ref, (row1, col1, row2, col2) = node
+    _, sheet, min_row, min_col, max_row, max_col, single = ref
+    min_row += drow if row1 else 0
+    min_col += dcol if col1 else 0
+    max_row += drow if row2 else 0
+    max_col += dcol if col2 else 0
+    if min(v for v in (min_row, min_col) if v is not None) < 1:
+        return ("error", "#REF!")
+    return ("ref", sheet, min_row, min_col, max_row, max_col, single)
+
+
+def _place(node, drow, dcol):
+    """node as it reads in the cell drow rows, dcol columns from the anchor."""
+    kind = node[0]
+    if kind == "moving":
+        return _shift(node, drow, dcol)
+    if kind == "op":
+        return ("op", node[1], _place(node[2], drow, dcol), _place(node[3], drow, dcol))
+    if kind == "neg":
+        return ("neg", _place(node[1], drow, dcol))
+    if kind == "call":
+        return ("call", node[1], [_place(a, drow, dcol) for a in node[2]])
+    return node
+
+
+def _safe(fn, *args):
+    try:
+        return fn(*args)
+    except ExcelError as error:
+        return error
+
+
+def _negate(value):
+    return -formula_eval._number(formula_eval._scalar(value))
+
+
+def column(node, evaluator, sheet, drow, dcol, count):
+    """The results of a compiled rule formula for count cells down a column,
+    the first drow rows and dcol columns from the rule's anchor cell.
+    Errors come back as ExcelError values."""
+    kind = node[0]
+    if kind == "value":
+        return [node[1]] * count
+    if kind == "error":
+        return [ExcelError(node[1])] * count
+    if kind == "moving" and node[1][6] and node[2][0]:
+        # a cell reference walking down: one read of the whole column
+        ref = _shift(node, drow, dcol)
+        if ref[0] == "error":
+            return [ExcelError(ref[1])] * count
+        ref_sheet = ref[1] or sheet
+        if ref_sheet not in evaluator.sheets:
+            return [ExcelError("#REF!")] * count
+        rows = evaluator.range(ref_sheet, ref[2], ref[3], ref[2] + count - 1, ref[3])
+        return [row[0] for row in rows.rows]
+    if kind == "op":
+        left = column(node[2], evaluator, sheet, drow, dcol, count)
+        right = column(node[3], evaluator, sheet, drow, dcol, count)
+        return [
+            _safe(formula_eval._operate, node[1], a, b) for a, b in zip(left, right)
+        ]
+    if kind == "neg":
+        return [
+            _safe(_negate, v)
+            for v in column(node[1], evaluator, sheet, drow, dcol, count)
+        ]
+    # anything else (a function of moving references): cell by cell
+    return [
+        _safe(evaluator.eval, _place(node, drow + i, dcol), sheet) for i in range(count)
+    ]
+
+
+# ---------- Rule types ----------
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _truth(v):
+    try:
+        return formula_eval._truth(formula_eval._scalar(v))
+    except ExcelError:
+        return False
+
+
+def _compare(op, a, b):
+    try:
+        return formula_eval._operate(op, a, b)
+    except ExcelError:
+        return False
+
+
+def _between(v, low, high):
+    try:
+        if formula_eval._compare(low, high) > 0:
+            low, high = high, low
+        return (
+            formula_eval._compare(v, low) >= 0 and formula_eval._compare(v, high) <= 0
+        )
+    except ExcelError:
+        return False
+
+
+_CELL_IS = {
+    "lessThan": lambda v, a, b: _compare("<", v, a),
+    "lessThanOrEqual": lambda v, a, b: _compare("<=", v, a),
+    "greaterThan": lambda v, a, b: _compare(">", v, a),
+    "greaterThanOrEqual": lambda v, a, b: _compare(">=", v, a),
+    "equal": lambda v, a, b: _compare("=", v, a),
+    "notEqual": lambda v, a, b: _compare("<>", v, a),
+    "between": _between,
+    "notBetween": lambda v, a, b: not _between(v, a, b),
+}
+
+
+def _blank(v):
+    return v is None or (isinstance(v, str) and not v.strip())
+
+
+def _folded(v):
+    return v.lower() if isinstance(v, str) else v
+
+
+def _text_test(kind, text):
+    text = (text or "").lower()
+
+    def test(v):
+        if isinstance(v, ExcelError):
+            return False
+        v = formula_eval._text(v).lower()
+        return {
+            "containsText": text in v,
+            "notContainsText": text not in v,
+            "beginsWith": v.startswith(text),
+            "endsWith": v.endswith(text),
+        }[kind]
+
+    return test
+
+
+def _percentile(numbers, fraction):
+    """PERCENTILE.INC of sorted numbers."""
+    position = (len(numbers) - 1) * fraction
+    low = math.floor(position)
+    high = min(low + 1, len(numbers) - 1)
+    return numbers[low] + (numbers[high] - numbers[low]) * (position - low)
+
+
+def _threshold(cfvo, numbers, evaluator, sheet):
+    """The number a colour scale or data bar point (cfvo) stands for."""
+    if cfvo.type == "min":
+        return numbers[0]
+    if cfvo.type == "max":
+        return numbers[-1]
+    value = cfvo.val
+    if isinstance(value, str):
+        value = formula_eval._scalar(evaluator.formula("=" + value.lstrip("="), sheet))
+    value = formula_eval._number(value)
+    if cfvo.type == "percent":
+        return numbers[0] + (numbers[-1] - numbers[0]) * value / 100
+    if cfvo.type == "percentile":
+        return _percentile(numbers, value / 100)
+    if cfvo.type in ("num", "formula"):
+        return value
+    raise Unsupported(f"{cfvo.type} point")
+
+
+def _rgb(color):
+    """ "RRGGBB" for an openpyxl Color, None if it isn't a plain RGB one."""
+    if color is None or color.type != "rgb" or not isinstance(color.rgb, str):
+        return None
+    return None if color.rgb == "00000000" else color.rgb[-6:].upper()
+
+
+def _blend(low, high, share):
+    a, b = int(low, 16), int(high, 16)
+    return "".join(
+        f"{round(((a >> s) & 255) + (((b >> s) & 255) - ((a >> s) & 255)) * share):02X}"
+        for s in (16, 8, 0)
+    )
+
+
+def _style(rule):
+    """The formats a dxf-based rule applies: fill, font, bold, italic."""
+    dxf = rule.dxf
+    out = {}
+    if dxf is None:
+        return out
+    if dxf.fill is not None:
+        # Excel draws a differential solid fill in its bgColor
+        fill = _rgb(dxf.fill.bgColor) or _rgb(dxf.fill.fgColor)
+        if fill:
+            out["fill"] = fill
+    if dxf.font is not None:
+        if _rgb(dxf.font.color):
+            out["font"] = _rgb(dxf.font.color)
+        if dxf.font.b is not None:
+            out["bold"] = bool(dxf.font.b)
+        if dxf.font.i is not None:
+            out["italic"] = bool(dxf.font.i)
+    return out
+
+
+# ---------- Ranges ----------
+class _Block:
+    """The cells one conditional format covers, read a column at a time."""
+
+    def __init__(self, evaluator, sheet, sqref):
+        self.evaluator = evaluator
+        self.sheet = sheet
+        areas = sorted(sqref.ranges, key=lambda r: (r.min_row, r.min_col))
+        self.anchor = (areas[0].min_row, areas[0].min_col)
+        self.columns = []  # (col, first row, [values])
+        seen = set()
+        for area in areas:
+            for col in range(area.min_col, area.max_col + 1):
+                if (col, area.min_row) in seen:
+                    continue
+                seen.add((col, area.min_row))
+                rows = evaluator.range(sheet, area.min_row, col, area.max_row, col)
+                self.columns.append((col, area.min_row, [r[0] for r in rows.rows]))
+
+    def cells(self):
+        for col, first, values in self.columns:
+            for i, value in enumerate(values):
+                yield (first + i, col), value
+
+    def numbers(self):
+        return sorted(v for _, v in self.cells() if _is_number(v))
+
+    def formula(self, text):
+        """[(key, result)] of a rule formula filled over every cell."""
+        tree = compile_rule(text, self.evaluator, self.sheet)
+        out = []
+        for col, first, values in self.columns:
+            drow, dcol = first - self.anchor[0], col - self.anchor[1]
+            results = column(tree, self.evaluator, self.sheet, drow, dcol, len(values))
+            out += [((first + i, col), r) for i, r in enumerate(results)]
+        return out
+
+
+def _matches(rule, block):
+    """{(row, col): formats} for the cells rule applies to in block."""
+    kind = rule.type
+    style = _style(rule)
+    if kind == "expression":
+        hits = [key for key, result in block.formula(rule.formula[0]) if _truth(result)]
+    elif kind == "cellIs":
+        test = _CELL_IS.get(rule.operator)
+        if test is None:
+            raise Unsupported(f"cellIs {rule.operator}")
+        operands = [block.formula(f) for f in rule.formula[:2]]
+        while len(operands) < 2:
+            operands.append(operands[0])
+        hits = [
+            key
+            for (key, value), (_, a), (_, b) in zip(block.cells(), *operands)
+            if test(value, a, b)
+        ]
+    elif kind in ("containsText", "notContainsText", "beginsWith", "endsWith"):
+        test = _text_test(kind, rule.text)
+        hits = [key for key, value in block.cells() if test(value)]
+    elif kind in ("containsBlanks", "notContainsBlanks"):
+        want = kind == "containsBlanks"
+        hits = [key for key, value in block.cells() if _blank(value) == want]
+    elif kind in ("containsErrors", "notContainsErrors"):
+        want = kind == "containsErrors"
+        hits = [
+            key for key, value in block.cells() if isinstance(value, ExcelError) == want
+        ]
+    elif kind in ("duplicateValues", "uniqueValues"):
+        counts = Counter(_folded(v) for _, v in block.cells() if not _blank(v))
+        want = kind == "duplicateValues"
+        hits = [
+            key
+            for key, value in block.cells()
+            if not _blank(value) and (counts[_folded(value)] > 1) == want
+        ]
+    elif kind == "top10":
+        numbers = block.numbers()
+        if not numbers:
+            return {}
+        rank = int(rule.rank or 10)
+        if rule.percent:
+            rank = max(1, len(numbers) * rank // 100)
+        rank = min(rank, len(numbers))
+        if rule.bottom:
+            cut = numbers[rank - 1]
+            hits = [k for k, v in block.cells() if _is_number(v) and v <= cut]
+        else:
+            cut = numbers[-rank]
+            hits = [k for k, v in block.cells() if _is_number(v) and v >= cut]
+    elif kind == "aboveAverage":
+        if rule.stdDev:
+            raise Unsupported("aboveAverage with stdDev")
+        numbers = block.numbers()
+        if not numbers:
+            return {}
+        mean = sum(numbers) / len(numbers)
+        above = rule.aboveAverage is None or rule.aboveAverage
+        hits = [
+            key
+            for key, v in block.cells()
+            if _is_number(v)
+            and ((v > mean if above else v < mean) or (rule.equalAverage and v == mean))
+        ]
+    elif kind == "dataBar":
+        numbers = block.numbers()
+        if not numbers:
+            return {}
+        bar = rule.dataBar
+        low = _threshold(bar.cfvo[0], numbers, block.evaluator, block.sheet)
+        high = _threshold(bar.cfvo[1], numbers, block.evaluator, block.sheet)
+        span = (high - low) or 1
+        color = _rgb(bar.color)
+        return {
+            key: {"bar": round(min(1, max(0, (v - low) / span)), 4), "bar_color": color}
+            for key, v in block.cells()
+            if _is_number(v)
+        }
+    elif kind == "colorScale":
+        numbers = block.numbers()
+        if not numbers:
+            return {}
+        scale = rule.colorScale
+        stops = [
+            _threshold(c, numbers, block.evaluator, block.sheet) for c in scale.cfvo
+        ]
+        colors = [_rgb(c) or "FFFFFF" for c in scale.color]
+        if len(colors) != len(stops):
+            raise Unsupported(
+                f"{len(stops)}-point colour scale with {len(colors)} colours"
+            )
+        out = {}
+        for key, v in block.cells():
+            if not _is_number(v):
+                continue
+            if v <= stops[0]:
+                out[key] = {"fill": colors[0]}
+                continue
+            for i in range(1, len(stops)):
+                if v <= stops[i] or i == len(stops) - 1:
+                    span = (stops[i] - stops[i - 1]) or 1
+                    share = min(1, (v - stops[i - 1]) / span)
+                    out[key] = {"fill": _blend(colors[i - 1], colors[i], share)}
+                    break
+        return out
+    else:
+        raise Unsupported(f"{kind} rule")
+    return {key: style for key in hits}
+
+
+# ---------- Sheets ----------
+def sheet_formats(ws, evaluator=None, skipped=None):
+    """{(row, col): {"fill": "FFC7CE", "font": ..., "bold": ..., "bar": 0.62,
+    "bar_color": ...}} for the cells ws's conditional formats change.
+
+    Rules that can't be worked out are left out, and (range, rule type,
+    reason) for each is appended to skipped if it is a list.
+    """
+    evaluator = evaluator or formula_eval.Evaluator.for_workbook(ws.parent)
+    rules = []
+    for cf in ws.conditional_formatting:
+        block = None
+        for rule in cf.rules:
+            if block is None:
+                block = _Block(evaluator, ws.title, cf.sqref)
+            rules.append((rule.priority or 0, len(rules), rule, block, cf.sqref))
+    rules.sort(key=lambda r: r[:2])
+
+    formats = {}
+    stopped = set()
+    for _, _, rule, block, sqref in rules:
+        try:
+            matches = _matches(rule, block)
+        except (Unsupported, ExcelError, RecursionError) as problem:
+            if skipped is not None:
+                skipped.append((str(sqref), rule.type, str(problem)))
+            continue
+        for key, style in matches.items():
+            if key in stopped:
+                continue
+            cell = formats.setdefault(key, {})
+            for name, value in style.items():
+                cell.setdefault(name, value)  # higher priority wins
+            if rule.stopIfTrue and rule.type not in _GRADED:
+                stopped.add(key)
+    return {key: style for key, style in formats.items() if style}
+
+
+def evaluate(wb):
+    """{sheet title: {"C5": formats}} for every conditionally formatted cell."""
+    evaluator = formula_eval.Evaluator.for_workbook(wb)
+    out = {}
+    for ws in wb.worksheets:
+        formats = sheet_formats(ws, evaluator)
+        if formats:
+            out[ws.title] = {
+                f"{get_column_letter(c)}{r}": style
+                for (r, c), style in sorted(formats.items())
+            }
+    return out
+
+
+def differences(expected, got):
+    """[(coordinate, expected formats, got formats)] for the cells whose
+    conditional formatting differs between two sheets, in order."""
+    want = sheet_formats(expected)
+    have = sheet_formats(got)
+    return [
+        (f"{get_column_letter(c)}{r}", want.get((r, c), {}), have.get((r, c), {}))
+        for r, c in sorted(want.keys() | have.keys())
+        if want.get((r, c), {}) != have.get((r, c), {})
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Show what a workbook's conditional formats highlight."
+    )
+    parser.add_argument("inputs", nargs="+", help="topic names or .xlsx files")
+    parser.add_argument("--cells", action="store_true", help="list every cell")
+    args = parser.parse_args(argv)
+
+    for item in args.inputs:
+        if Path(item).is_file():
+            wb = load_workbook(item)
+        else:
+            wb = importlib.import_module(item).build()
+        evaluator = formula_eval.Evaluator.for_workbook(wb)
+        for ws in wb.worksheets:
+            if not ws.conditional_formatting:
+                continue
+            skipped = []
+            started = time.perf_counter()
+            formats = sheet_formats(ws, evaluator, skipped)
+            seconds = time.perf_counter() - started
+            print(
+                f"{item} {ws.title}: {len(formats)} cells formatted in {seconds:.3f}s"
+            )
+            for where, kind, reason in skipped:
+                print(f"  skipped {kind} rule on {where}: {reason}")
+            if args.cells:
+                for (r, c), style in sorted(formats.items()):
+                    shown = ", ".join(f"{k}={v}" for k, v in style.items())
+                    print(f"  {get_column_letter(c)}{r}: {shown}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
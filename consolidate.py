@@ -0,0 +1,386 @@
+# consolidate.py
+# Tidies a workbook's conditional formats and data validations before it is
+# saved, without changing what any cell shows or accepts.
+#
+# Builds that add a rule per row or per block end up with one
+# <conditionalFormatting> element (and one priority) per range. The pass
+#   - merges ranges that carry the same rule into one multi-range sqref,
+#     as long as the rule's formulas still read the same cells and no rule
+#     in between in priority order overlaps the cells that move;
+#   - coalesces adjacent and overlapping ranges (C2 C3 C4 -> C2:C4);
+#   - drops differential styles (dxfs) no rule uses any more, as when a
+#     loaded workbook is saved again (openpyxl already shares equal ones);
+#   - sets stopIfTrue on a rule when no lower-priority rule on its cells can
+#     ever match the same value (topic11's > 0 and < 0 rules, say), so Excel
+#     stops evaluating sooner.
+# Rules whose result depends on the whole range (top/bottom N, above
+# average, duplicates, and data bars or colour scales scaled to the range's
+# min, max or percentiles) are never merged.
+#
+# Data validations get the same treatment: validators with identical
+# settings and formulas on a sheet become one, and their target cells are
+# collapsed into a minimal multi-range sqref (B2 B3 ... B40 -> B2:B40).
+# Generators can attach validations with validate(), which reuses an
+# identical validator already on the sheet and adds all its cells in one
+# go; DataValidation.add() checks each new cell against every range it
+# already holds, so adding cells one by one in a loop is quadratic.
+#
+# xlsx_io.save() runs it on every workbook; it returns a Report of how
+# much it saved.
+#
+# Usage:
+#   report = consolidate.workbook(wb)       # Report(ranges=(12, 1), ...)
+#   print(consolidate.describe(report))
+#   consolidate.validate(ws, [f"B{r}" for r in rows], type="list", formula1='"Yes,No"')
+#   python consolidate.py topic10b topic11  # what the pass saves per topic
+
+import argparse
+import importlib
+import math
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from openpyxl import load_workbook
+from openpyxl.cell import Cell
+from openpyxl.formatting.formatting import (
+    ConditionalFormatting,
+    ConditionalFormattingList,
+)
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.differential import DifferentialStyle, DifferentialStyleList
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange, MultiCellRange
+from openpyxl.worksheet.datavalidation import DataValidation
+from openpyxl.xml.functions import tostring
+
+# (before, after) pairs, but stops: the number of rules given stopIfTrue
+Report = namedtuple("Report", "ranges rules dxfs xml_bytes stops validations targets")
+
+# rules scaled to (or ranked over) their whole range
+_RANGE_WIDE = ("top10", "aboveAverage", "duplicateValues", "uniqueValues")
+_GRADED = ("dataBar", "colorScale", "iconSet")
+_INTERVALS = {
+    "lessThan": lambda a: (-math.inf, a, False, False),
+    "lessThanOrEqual": lambda a: (-math.inf, a, False, True),
+    "greaterThan": lambda a: (a, math.inf, False, False),
+    "greaterThanOrEqual": lambda a: (a, math.inf, True, False),
+    "equal": lambda a: (a, a, True, True),
+}
+
+
+# ---------- Ranges ----------
+def _rect(r):
+    return [r.min_row, r.min_col, r.max_row, r.max_col]
+
+
+def merge_ranges(ranges):
+    """A short list of CellRanges covering the same cells as ranges:
+    adjacent or overlapping ranges of the same width (or height) are joined
+    until nothing more joins."""
+    rects = [_rect(r) for r in ranges]
+    while True:
+        count = len(rects)
+        for lo, hi, keep in ((0, 2, (1, 3)), (1, 3, (0, 2))):
+            # join runs down columns, then along rows
+            rects.sort(key=lambda r: (r[keep[0]], r[keep[1]], r[lo]))
+            joined = []
+            for r in rects:
+                last = joined[-1] if joined else None
+                if (
+                    last is not None
+                    and last[keep[0]] == r[keep[0]]
+                    and last[keep[1]] == r[keep[1]]
+                    and r[lo] <= last[hi] + 1
+                ):
+                    last[hi] = max(last[hi], r[hi])
+                else:
+                    joined.append(r)
+            rects = joined
+        if len(rects) == count:
+            break
+    rects.sort()
+    return [
+        CellRange(min_row=a, min_col=b, max_row=c, max_col=d) for a, b, c, d in rects
+    ]
+
+
+def _overlap(first, second):
+    return any(not a.isdisjoint(b) for a in first for b in second)
+
+
+def _sqref(ranges):
+    return MultiCellRange([r.coord for r in ranges])
+
+
+# ---------- Conditional formats ----------
+def _anchor(ranges):
+    """The cell a rule's relative references are written from."""
+    top = min(ranges, key=lambda r: (r.min_row, r.min_col))
+    return f"{get_column_letter(top.min_col)}{top.min_row}"
+
+
+def _signature(rule):
+    """Everything about a rule but its priority and formulas."""
+    attrs = tuple(
+        getattr(rule, name)
+        for name in rule.__attrs__
+        if name not in ("priority", "dxfId")
+    )
+    return attrs, rule.colorScale, rule.dataBar, rule.iconSet, rule.dxf
+
+
+def _range_wide(rule):
+    if rule.type in _RANGE_WIDE:
+        return True
+    graded = rule.dataBar or rule.colorScale or rule.iconSet
+    return graded is not None and any(
+        c.type in ("min", "max", "percent", "percentile") for c in graded.cfvo
+    )
+
+
+def _moved(formulas, origin, target):
+    """formulas as written from origin, filled to target."""
+    return [Translator(f"={f}", origin).translate_formula(target)[1:] for f in formulas]
+
+
+class _Entry:
+    __slots__ = ("rule", "ranges", "signature")
+
+    def __init__(self, rule, ranges):
+        self.rule = rule
+        self.ranges = ranges
+        self.signature = None if _range_wide(rule) else _signature(rule)
+
+
+def _same_cells(formulas, ranges, other_formulas, other_ranges):
+    """True if formulas, written for ranges, read the same cells over
+    other_ranges as other_formulas do, and still do when both are written
+    from the merged ranges' anchor."""
+    formulas = [f.lstrip("=") for f in formulas]
+    if not formulas:
+        return not other_formulas
+    anchor = _anchor(ranges)
+    moved = _moved(formulas, anchor, _anchor(other_ranges))
+    if moved != [f.lstrip("=") for f in other_formulas]:
+        return False
+    if _anchor(ranges + other_ranges) == anchor:
+        return True
+    # written from another cell: only formulas that read the same cells
+    # from anywhere still fit
+    top = min(ranges + other_ranges, key=lambda r: (r.min_row, r.min_col))
+    diagonal = f"{get_column_letter(top.min_col + 1)}{top.min_row + 1}"
+    return _moved(formulas, anchor, diagonal) == formulas
+
+
+def _can_absorb(keep, other, between):
+    """True if other's cells can join keep's rule: same rule, formulas that
+    read the same cells, and no rule in between on the cells that change
+    priority."""
+    if keep.signature is None or keep.signature != other.signature:
+        return False
+    if not _same_cells(
+        keep.rule.formula or (), keep.ranges, other.rule.formula or (), other.ranges
+    ):
+        return False
+    return not any(_overlap(e.ranges, other.ranges) for e in between)
+
+
+def _interval(rule):
+    """(low, high, low included, high included) of the values a cellIs rule
+    with constant operands matches, or None."""
+    if rule.type != "cellIs":
+        return None
+    try:
+        operands = [float(f) for f in rule.formula]
+    except (TypeError, ValueError):
+        return None
+    if rule.operator == "between" and len(operands) == 2:
+        return (min(operands), max(operands), True, True)
+    make = _INTERVALS.get(rule.operator)
+    return None if make is None or not operands else make(operands[0])
+
+
+def _disjoint(first, second):
+    """True if two cellIs rules can never both match one value. Blanks
+    compare as 0 and text above every number, so the intervals hold."""
+    a, b = _interval(first), _interval(second)
+    if a is None or b is None:
+        return False
+
+    def before(x, y):  # x ends before y starts
+        return x[1] < y[0] or (x[1] == y[0] and not (x[3] and y[2]))
+
+    return before(a, b) or before(b, a)
+
+
+def _stop_early(entries):
+    """Give stopIfTrue to rules whose cells no lower rule can also match."""
+    stops = 0
+    for i, entry in enumerate(entries):
+        rule = entry.rule
+        if rule.stopIfTrue or rule.type in _GRADED:
+            continue
+        lower = [e for e in entries[i + 1 :] if _overlap(e.ranges, entry.ranges)]
+        if lower and all(_disjoint(rule, e.rule) for e in lower):
+            rule.stopIfTrue = True
+            stops += 1
+    return stops
+
+
+def _xml_size(formats):
+    return sum(len(tostring(cf.to_tree())) for cf in formats)
+
+
+def sheet(ws):
+    """Consolidate ws's conditional formats in place; returns
+    ((ranges, rules, xml bytes) before, the same after, stopIfTrue count)."""
+    formats = ws.conditional_formatting
+    before = (len(formats), sum(len(cf.rules) for cf in formats), _xml_size(formats))
+    entries = [
+        _Entry(rule, list(cf.sqref.ranges)) for cf in formats for rule in cf.rules
+    ]
+    entries.sort(key=lambda e: e.rule.priority or 0)
+
+    kept = []
+    for entry in entries:
+        for k in range(len(kept) - 1, -1, -1):
+            if _can_absorb(kept[k], entry, kept[k + 1 :]):
+                kept[k].ranges = merge_ranges(kept[k].ranges + entry.ranges)
+                break
+        else:
+            entry.ranges = merge_ranges(entry.ranges)
+            kept.append(entry)
+    stops = _stop_early(kept)
+
+    merged = ConditionalFormattingList()
+    for priority, entry in enumerate(kept, start=1):
+        entry.rule.priority = priority
+        merged.add(ConditionalFormatting(_sqref(entry.ranges)), entry.rule)
+    ws.conditional_formatting = merged
+    after = (len(merged), len(kept), _xml_size(merged))
+    return before, after, stops
+
+
+def _dxfs(wb, kept=()):
+    """The differential styles saving wb writes: kept plus its rules' own
+    (openpyxl shares equal ones)."""
+    styles = DifferentialStyleList(list(kept))
+    for ws in wb.worksheets:
+        for cf in ws.conditional_formatting:
+            for rule in cf.rules:
+                if rule.dxf and rule.dxf != DifferentialStyle():
+                    styles.append(rule.dxf)
+    return styles
+
+
+# ---------- Data validation ----------
+def _settings(dv):
+    """Everything about a validator but its cells and formulas."""
+    return tuple(getattr(dv, name) for name in dv.__attrs__ if name != "sqref")
+
+
+def _formulas(dv):
+    return [f for f in (dv.formula1, dv.formula2) if f]
+
+
+def validations(ws):
+    """Merge ws's identical data validations and collapse their cells in
+    place; returns ((validators, ranges) before, the same after)."""
+    found = ws.data_validations.dataValidation
+    before = (len(found), sum(len(dv.sqref.ranges) for dv in found))
+    kept = []  # (dv, settings, ranges)
+    for dv in found:
+        settings, ranges = _settings(dv), list(dv.sqref.ranges)
+        if not ranges:
+            continue  # never given any cells
+        for k in range(len(kept) - 1, -1, -1):
+            keep, keep_settings, keep_ranges = kept[k]
+            if (
+                keep_settings == settings
+                and _same_cells(_formulas(keep), keep_ranges, _formulas(dv), ranges)
+                and not any(_overlap(e[2], ranges) for e in kept[k + 1 :])
+            ):
+                kept[k] = (keep, settings, merge_ranges(keep_ranges + ranges))
+                break
+        else:
+            kept.append((dv, settings, merge_ranges(ranges)))
+    for dv, _, ranges in kept:
+        dv.sqref = _sqref(ranges)
+    ws.data_validations.dataValidation = [dv for dv, _, _ in kept]
+    return before, (len(kept), sum(len(ranges) for _, _, ranges in kept))
+
+
+def validate(ws, cells, **settings):
+    """Give cells (a range like "B2:B40", a cell, or a list of them) a
+    DataValidation(**settings), all at once. An identical validator already
+    on ws is extended rather than a new one added. Returns the validator."""
+    if isinstance(cells, (str, Cell)):
+        cells = [cells]
+    ranges = [CellRange(c.coordinate if isinstance(c, Cell) else c) for c in cells]
+    dv = DataValidation(**settings)
+    for existing in ws.data_validations.dataValidation:
+        if _settings(existing) == _settings(dv) and _same_cells(
+            _formulas(existing), list(existing.sqref.ranges), _formulas(dv), ranges
+        ):
+            dv = existing
+            break
+    else:
+        ws.add_data_validation(dv)
+    dv.sqref = _sqref(merge_ranges(list(dv.sqref.ranges) + ranges))
+    return dv
+
+
+# ---------- Workbooks ----------
+def workbook(wb):
+    """Consolidate every sheet's conditional formats and data validations;
+    returns a Report."""
+    dxfs = len(_dxfs(wb, wb._differential_styles.dxf).dxf)
+    totals = [[0, 0] for _ in range(5)]
+    stops = 0
+    for ws in wb.worksheets:
+        before, after, count = sheet(ws)
+        dv_before, dv_after = validations(ws)
+        for total, b, a in zip(totals, before + dv_before, after + dv_after):
+            total[0] += b
+            total[1] += a
+        stops += count
+    # drop the dxfs no rule uses, unless custom table styles point at them
+    if not wb._table_styles.tableStyle:
+        wb._differential_styles = _dxfs(wb)
+    ranges, rules, xml, validators, targets = (tuple(t) for t in totals)
+    dxfs = (dxfs, len(wb._differential_styles.dxf))
+    return Report(ranges, rules, dxfs, xml, stops, validators, targets)
+
+
+def describe(report):
+    def change(label, pair):
+        return f"{pair[0]} -> {pair[1]} {label}"
+
+    return (
+        f"{change('ranges', report.ranges)}, {change('rules', report.rules)}, "
+        f"{change('dxfs', report.dxfs)}, {change('XML bytes', report.xml_bytes)}, "
+        f"stopIfTrue on {report.stops}; "
+        f"{change('validations', report.validations)} over "
+        f"{change('ranges', report.targets)}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Report what consolidating conditional formats and "
+        "data validations saves."
+    )
+    parser.add_argument("inputs", nargs="+", help="topic names or .xlsx files")
+    args = parser.parse_args(argv)
+    for item in args.inputs:
+        if Path(item).is_file():
+            wb = load_workbook(item)
+        else:
+            wb = importlib.import_module(item).build()
+        print(f"{item}: {describe(workbook(wb))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
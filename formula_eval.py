@@ -0,0 +1,1832 @@
+# formula_eval.py
+# A small Excel formula evaluator for the functions the topic workbooks use.
+#
+# openpyxl writes formulas without results, so until Excel recalculates,
+# previewers, PDF exporters and load_workbook(data_only=True) see empty cells.
+# evaluate(wb) works out every formula in a workbook; xlsx_io.save() stores
+# the results as the cells' cached values.
+#
+# Formulas are tokenised with openpyxl's Tokenizer and parsed into small
+# tuples. Supported: numbers, text, TRUE/FALSE, cell and range references
+# (also on other sheets, through defined names and as structured table
+# references like SalesData[Units] or [@Units]), the arithmetic, &,
+# comparison and % operators, and the functions in FUNCTIONS. Whole-column
+# and whole-row references (A:A, 2:2) stop at the sheet's last used cell. A
+# formula using anything else raises Unsupported and is simply left without a
+# cached value.
+#
+# Criteria functions (COUNTIF(S), SUMIF(S), AVERAGEIF(S)) don't scan their
+# ranges per call: each range gets an _Index on first use that groups its
+# cells by value and sorts its numbers, so "=x" is a dict lookup, ">100" a
+# bisect, and sums come from per-group totals or prefix sums.
+#
+# Lookups work the same way: VLOOKUP, HLOOKUP, XLOOKUP and MATCH find their
+# key through a _Lookup built once per range (a dict of first positions for
+# exact matches, sorted keys and bisect for approximate ones). Indexes live
+# on the Evaluator's cached ranges; Evaluator.invalidate() drops the ranges
+# over a changed cell, and their indexes with them.
+#
+# Evaluator works from plain {(row, col): cell} dicts, so it also runs on
+# workbooks opened read-only (see grader.py).
+#
+# For interactive checking, Evaluator.update() recalculates after an edit:
+# Dependencies records which formula cells read which cells and areas (from
+# the parse trees), so only the formulas downstream of the edit are worked
+# out again, in dependency order, and their new values are patched into the
+# cached ranges instead of reading the ranges again.
+#
+# TODAY() and NOW() read the clock (or the pinned build time, see
+# xlsx_io.build_time()) unless the workbook pins an as-of date in a cell named
+# AsOf, or the Evaluator is given one; results then never drift by day.
+#
+# Usage:
+#   values = formula_eval.evaluate(wb)      # {sheet title: {"B7": 12, ...}}
+#   ev = formula_eval.Evaluator(sheets, names); ev.cell("Tasks", 4, 3)
+#   ws["F5"] = 30; ev.update([("Data", 5, 6)])   # {("Data", 5, 8): 135.0, ...}
+
+import math
+import re
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date, datetime, time
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from openpyxl.formula import Tokenizer
+from openpyxl.formula.tokenizer import Token
+from openpyxl.packaging.relationship import get_dependents, get_rels_path
+from openpyxl.utils import range_boundaries
+from openpyxl.utils.datetime import from_excel, to_excel
+from openpyxl.worksheet.table import Table
+from openpyxl.xml.functions import fromstring
+
+import xlsx_io
+
+
+class Unsupported(Exception):
+    """The formula uses something this evaluator doesn't implement."""
+
+
+class ExcelError(Exception):
+    """An Excel error value (#DIV/0!, #N/A, ...), raised while evaluating."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+    def __eq__(self, other):
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+
+class Range:
+    """The values of a rectangular range, row by row."""
+
+    __slots__ = ("rows", "_index", "_lookups")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self._index = None
+        self._lookups = {}
+
+    def values(self):
+        return [v for row in self.rows for v in row]
+
+    def index(self):
+        """The criteria index (_Index) of the values, built on first use."""
+        if self._index is None:
+            self._index = _Index(self.values())
+        return self._index
+
+    def lookup(self, axis):
+        """The _Lookup over the first column ("col"), the first row ("row")
+        or every value ("all"), built on first use."""
+        if axis not in self._lookups:
+            if axis == "col":
+                keys = [row[0] for row in self.rows]
+            elif axis == "row":
+                keys = list(self.rows[0]) if self.rows else []
+            else:
+                keys = self.values()
+            self._lookups[axis] = _Lookup(keys)
+        return self._lookups[axis]
+
+    @property
+    def shape(self):
+        return len(self.rows), len(self.rows[0]) if self.rows else 0
+
+
+# ---------- Parsing ----------
+# Binary operators, loosest first; all are left-associative in Excel
+_INFIX = {
+    "=": 1, "<>": 1, "<": 1, ">": 1, "<=": 1, ">=": 1,
+    "&": 2,
+    "+": 3, "-": 3,
+    "*": 4, "/": 4,
+    "^": 5,
+}  # fmt: skip
+_NEGATE = 6  # prefix minus binds tighter than ^ (=-2^2 is 4)
+_PERCENT = 7
+
+_ROW_PART = re.compile(r"\$?[A-Za-z]*(\$?)(\d*)$")
+_SHEET_REF = re.compile(r"^(?:'((?:[^']|'')+)'|([^'!:]+))!(.+)$")
+
+
+def split_ref(text):
+    """("Data", "$C$2:$C$21") for "Data!$C$2:Data!$C$21"; sheet None if local."""
+    parts = []
+    for piece in text.split(":"):
+        m = _SHEET_REF.match(piece)
+        if m:
+            sheet = (m.group(1) or "").replace("''", "'") or m.group(2)
+            parts.append((sheet, m.group(3)))
+        else:
+            parts.append((None, piece))
+    sheets = {s for s, _ in parts if s is not None}
+    if len(sheets) > 1:
+        raise Unsupported(f"3-D reference {text}")
+    return (sheets.pop() if sheets else None), ":".join(p for _, p in parts)
+
+
+# Structured-reference item specifiers, as Excel spells them
+_SPECIALS = {
+    "#ALL": "#All",
+    "#DATA": "#Data",
+    "#HEADERS": "#Headers",
+    "#TOTALS": "#Totals",
+    "#THIS ROW": "#This Row",
+}
+_BRACKETED = re.compile(r"\[((?:[^\[\]']|'.)*)\]")
+
+
+def _structured(text):
+    """("table", name, areas, first column, last column) for a structured
+    reference such as SalesData[Units], [@Units] or SalesData[[#Totals],[Sales]].
+
+    name is None for a bare [@Units]; areas defaults to ("#Data",) and the
+    columns to None (every column).
+    """
+    name, _, spec = text.partition("[")
+    if not spec.endswith("]"):
+        raise Unsupported(f"structured reference {text}")
+    spec = spec[:-1]
+    areas, columns = [], []
+    if spec.startswith("@"):
+        areas.append("#This Row")
+        spec = spec[1:]
+    items = _BRACKETED.findall(spec) if spec.startswith("[") else [spec]
+    for item in items:
+        special = _SPECIALS.get(item.strip().upper())
+        if special:
+            areas.append(special)
+        elif item:
+            columns.append(re.sub(r"'(.)", r"\1", item))  # '# '[ '] '' escapes
+    if len(columns) > 2:
+        raise Unsupported(f"structured reference {text}")
+    first, last = (columns[0], columns[-1]) if columns else (None, None)
+    return ("table", name or None, tuple(areas) or ("#Data",), first, last)
+
+
+class _Parser:
+    def __init__(self, formula):
+        self.tokens = [t for t in Tokenizer(formula).items if t.type != Token.WSPACE]
+        self.pos = 0
+        # id(ref node) -> whether its (min, max) rows are relative ($-free)
+        self.relative = {}
+        self.moving = 0  # relative row numbers in the text's references
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        if token is None:
+            raise Unsupported("formula ends early")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.expr(0)
+        if self.peek() is not None:
+            raise Unsupported(f"unexpected {self.peek().value!r}")
+        return node
+
+    def expr(self, min_prec):
+        node = self.prefix()
+        while True:
+            token = self.peek()
+            if token is None:
+                return node
+            if token.type == Token.OP_POST and _PERCENT >= min_prec:
+                self.take()
+                node = ("op", "/", node, ("value", 100))
+            elif token.type == Token.OP_IN and _INFIX.get(token.value, -1) >= min_prec:
+                self.take()
+                prec = _INFIX[token.value]
+                node = ("op", token.value, node, self.expr(prec + 1))
+            elif token.type == Token.OP_IN and token.value not in _INFIX:
+                raise Unsupported(f"operator {token.value!r}")
+            else:
+                return node
+
+    def prefix(self):
+        token = self.take()
+        if token.type == Token.OP_PRE:
+            operand = self.expr(_NEGATE)
+            return ("neg", operand) if token.value == "-" else operand
+        if token.type == Token.PAREN and token.subtype == Token.OPEN:
+            node = self.expr(0)
+            self.close(Token.PAREN)
+            return node
+        if token.type == Token.FUNC and token.subtype == Token.OPEN:
+            return self.call(token.value[:-1].upper())
+        if token.type == Token.OPERAND:
+            return self.operand(token)
+        raise Unsupported(f"unexpected {token.value!r}")
+
+    def close(self, kind):
+        token = self.take()
+        if token.type != kind or token.subtype != Token.CLOSE:
+            raise Unsupported(f"expected ')' not {token.value!r}")
+
+    def call(self, name):
+        if name.startswith("_XLFN."):
+            name = name[len("_XLFN.") :]
+        args = []
+        token = self.peek()
+        if (
+            token is not None
+            and token.type == Token.FUNC
+            and token.subtype == Token.CLOSE
+        ):
+            self.take()
+            return ("call", name, args)
+        while True:
+            token = self.peek()
+            if token is not None and (
+                token.type == Token.SEP
+                or (token.type == Token.FUNC and token.subtype == Token.CLOSE)
+            ):
+                args.append(("blank",))  # an omitted argument, e.g. IF(A1,,2)
+            else:
+                args.append(self.expr(0))
+            token = self.take()
+            if token.type == Token.FUNC and token.subtype == Token.CLOSE:
+                return ("call", name, args)
+            if token.type != Token.SEP or token.subtype != Token.ARG:
+                raise Unsupported(f"unexpected {token.value!r} in {name}()")
+
+    def operand(self, token):
+        text = token.value
+        if token.subtype == Token.NUMBER:
+            number = float(text)
+            return ("value", int(number) if number.is_integer() else number)
+        if token.subtype == Token.TEXT:
+            return ("value", text[1:-1].replace('""', '"'))
+        if token.subtype == Token.LOGICAL:
+            return ("value", text.upper() == "TRUE")
+        if token.subtype == Token.ERROR:
+            return ("error", text)
+        if "[" in text:
+            return _structured(text)
+        sheet, ref = split_ref(text)
+        try:
+            min_col, min_row, max_col, max_row = range_boundaries(ref.replace("$", ""))
+        except ValueError:
+            return ("name", text)
+        if None not in (min_row, max_row) and min_row > max_row:
+            min_row, max_row = max_row, min_row  # A11:A10 is A10:A11
+        if None not in (min_col, max_col) and min_col > max_col:
+            min_col, max_col = max_col, min_col
+        single = ":" not in ref
+        node = ("ref", sheet, min_row, min_col, max_row, max_col, single)
+        ends = [_ROW_PART.match(part).groups() for part in ref.split(":")]
+        ends = sorted((int(r), not anchor) for anchor, r in ends if r)
+        moving = sum(moves for _, moves in ends)
+        if moving:
+            self.moving += moving
+            self.relative[id(node)] = (ends[0][1], ends[-1][1])
+        return node
+
+
+# ---------- Values ----------
+_NUMERIC = re.compile(r"\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*")
+
+
+def _as_float(text):
+    """float(text) for numeric text (not "nan", "inf", ...), else None."""
+    return float(text) if _NUMERIC.fullmatch(text) else None
+
+
+def _as_serial(text):
+    """The date serial of ISO date text ("2025-01-05"), as Excel coerces it."""
+    try:
+        serial = to_excel(datetime.fromisoformat(text.strip()))
+    except ValueError:
+        return None
+    return int(serial) if serial.is_integer() else serial
+
+
+def _number(v):
+    if isinstance(v, ExcelError):
+        raise v
+    if isinstance(v, bool):
+        return int(v)
+    if v is None:
+        return 0
+    if isinstance(v, (int, float)):
+        return v
+    number = _as_float(v)
+    if number is None:
+        number = _as_serial(v)
+    if number is None:
+        raise ExcelError("#VALUE!")
+    return number
+
+
+def _text(v):
+    if isinstance(v, ExcelError):
+        raise v
+    if v is None:
+        return ""
+    if isinstance(v, bool):
+        return "TRUE" if v else "FALSE"
+    if isinstance(v, float):
+        return str(int(v)) if v.is_integer() else format(v, ".15g")
+    return str(v)
+
+
+def _truth(v):
+    if isinstance(v, ExcelError):
+        raise v
+    if isinstance(v, str):
+        if v.upper() in ("TRUE", "FALSE"):
+            return v.upper() == "TRUE"
+        raise ExcelError("#VALUE!")
+    return bool(_number(v))
+
+
+def _rank(v):
+    # Excel orders numbers < text < logicals
+    if isinstance(v, bool):
+        return 2
+    return 1 if isinstance(v, str) else 0
+
+
+def _compare(a, b):
+    """-1, 0 or 1, comparing the way Excel's = < > operators do."""
+    for v in (a, b):
+        if isinstance(v, ExcelError):
+            raise v
+    if a is None:
+        a = "" if isinstance(b, str) else (False if isinstance(b, bool) else 0)
+    if b is None:
+        b = "" if isinstance(a, str) else (False if isinstance(a, bool) else 0)
+    if _rank(a) != _rank(b):
+        return -1 if _rank(a) < _rank(b) else 1
+    if isinstance(a, str):
+        a, b = a.lower(), b.lower()
+    return (a > b) - (a < b)
+
+
+def _scalar(v):
+    if isinstance(v, Range):
+        if v.shape != (1, 1):
+            raise Unsupported("range used where a single value is needed")
+        v = v.rows[0][0]
+    if isinstance(v, ExcelError):
+        raise v
+    return v
+
+
+def _numbers(args):
+    """Numbers to aggregate: ranges give only their numbers, literals are coerced."""
+    out = []
+    for arg in args:
+        if isinstance(arg, Range):
+            for v in arg.values():
+                if isinstance(v, ExcelError):
+                    raise v
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    out.append(v)
+        elif arg is not None:
+            out.append(_number(arg))
+    return out
+
+
+def _flat(args):
+    for arg in args:
+        if isinstance(arg, Range):
+            yield from arg.values()
+        else:
+            yield arg
+
+
+# ---------- Criteria (COUNTIF, SUMIF, ...) ----------
+_CRITERION = re.compile(r"^(<=|>=|<>|<|>|=)?(.*)$", re.S)
+_WILDCARDS = re.compile(r"[*?~]")
+
+
+def _wildcard(pattern):
+    out = []
+    chars = iter(pattern)
+    for ch in chars:
+        if ch == "~":
+            out.append(re.escape(next(chars, "~")))
+        elif ch == "*":
+            out.append(".*")
+        elif ch == "?":
+            out.append(".")
+        else:
+            out.append(re.escape(ch))
+    return re.compile("".join(out), re.I | re.S)
+
+
+def _parse_criterion(crit):
+    """(op, target) for a COUNTIF-style criterion.
+
+    target is a number, bool or text, None for "blank" (the criteria "" and
+    "<>"), or a compiled pattern for =/<> text with wildcards in it.
+    """
+    if isinstance(crit, ExcelError):
+        raise crit
+    if not isinstance(crit, str):
+        return "=", 0 if crit is None else crit  # an empty cell counts as 0
+    op, operand = _CRITERION.match(crit).groups()
+    op = op or "="
+    if op not in ("=", "<>"):
+        target = _as_float(operand)
+        return op, operand if target is None else target
+    if operand == "":
+        return op, None
+    target = _as_float(operand)
+    if target is not None:
+        return op, target
+    if operand.upper() in ("TRUE", "FALSE"):
+        return op, operand.upper() == "TRUE"
+    return op, _wildcard(operand) if _WILDCARDS.search(operand) else operand
+
+
+def _criterion(crit):
+    """A predicate over cell values for a COUNTIF-style criterion."""
+    return _predicate(*_parse_criterion(crit))
+
+
+def _predicate(op, target):
+    if target is None:
+        blank = lambda v: v is None or v == ""
+        return blank if op == "=" else (lambda v: not blank(v))
+    if isinstance(target, re.Pattern):
+        match = lambda v: isinstance(v, str) and bool(target.fullmatch(v))
+        return match if op == "=" else (lambda v: not match(v))
+    if isinstance(target, str) and op in ("=", "<>"):
+        folded = target.lower()
+        match = lambda v: isinstance(v, str) and v.lower() == folded
+        return match if op == "=" else (lambda v: not match(v))
+
+    def test(v):
+        if v is None or isinstance(v, ExcelError) or _rank(v) != _rank(target):
+            return op == "<>"
+        c = _compare(v, target)
+        return {"=": c == 0, "<>": c != 0, "<": c < 0, ">": c > 0,
+                "<=": c <= 0, ">=": c >= 0}[op]  # fmt: skip
+
+    return test
+
+
+def _key(v):
+    """The group a cell value falls in for = criteria (None for errors)."""
+    if v is None or v == "":
+        return ("",)
+    if isinstance(v, ExcelError):
+        return None
+    if isinstance(v, bool):
+        return ("b", v)
+    if isinstance(v, str):
+        return ("s", v.lower())
+    return ("n", v)
+
+
+def _numeric(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+class _Index:
+    """A range's cells grouped for criteria lookups, built once per range.
+
+    groups maps each value's _key to its positions (ascending), so an =
+    criterion is one dict lookup; numbers holds the numeric values sorted
+    (order has their positions), so ">100" is a bisect. Sums over a second
+    range of the same shape are totalled once per group, or as prefix sums
+    in numbers order, and then read off per criterion.
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.groups = {}
+        numeric = []
+        for i, v in enumerate(values):
+            key = _key(v)
+            if key is not None:
+                self.groups.setdefault(key, []).append(i)
+            if _numeric(v):
+                numeric.append((v, i))
+        numeric.sort()
+        self.numbers = [v for v, _ in numeric]
+        self.order = [i for _, i in numeric]
+        # id(range) -> (range, ...); the range is kept so its id stays unique
+        self._totals = {}
+        self._prefixes = {}
+        self._composites = {}
+
+    def find(self, op, target):
+        """("group", key, negated) or ("slice", lo, hi) for a parsed
+        criterion, or None if it has to be tested cell by cell."""
+        if op in ("=", "<>"):
+            if isinstance(target, re.Pattern):
+                return None
+            if target is None:
+                key = ("",)
+            elif isinstance(target, str):
+                key = ("s", target.lower())
+            else:
+                key = _key(target)
+            return ("group", key, op == "<>")
+        if not _numeric(target):
+            return None
+        lo, hi = 0, len(self.numbers)
+        if op == "<":
+            hi = bisect_left(self.numbers, target)
+        elif op == "<=":
+            hi = bisect_right(self.numbers, target)
+        elif op == ">":
+            lo = bisect_right(self.numbers, target)
+        else:
+            lo = bisect_left(self.numbers, target)
+        return ("slice", lo, hi)
+
+    def positions(self, found):
+        """Ascending positions for a find() result."""
+        if found[0] == "slice":
+            return sorted(self.order[found[1] : found[2]])
+        _, key, negated = found
+        group = self.groups.get(key, [])
+        if not negated:
+            return group
+        skip = set(group)
+        return [i for i in range(len(self.values)) if i not in skip]
+
+    def count(self, found):
+        if found[0] == "slice":
+            return found[2] - found[1]
+        return len(self.positions(found))
+
+    def totals(self, found, rng):
+        """(sum, count) of rng's numbers at the found positions, or None."""
+        if found[0] == "slice":
+            if id(rng) not in self._prefixes:
+                values = rng.values()
+                sums, counts = [0], [0]
+                for i in self.order:
+                    v = values[i]
+                    numeric = _numeric(v)
+                    sums.append(sums[-1] + v if numeric else sums[-1])
+                    counts.append(counts[-1] + numeric)
+                self._prefixes[id(rng)] = rng, sums, counts
+            _, sums, counts = self._prefixes[id(rng)]
+            lo, hi = found[1], found[2]
+            return sums[hi] - sums[lo], counts[hi] - counts[lo]
+        _, key, negated = found
+        if negated:
+            return None
+        if id(rng) not in self._totals:
+            values = rng.values()
+            totals = {}
+            for k, positions in self.groups.items():
+                picked = [values[i] for i in positions if _numeric(values[i])]
+                totals[k] = sum(picked), len(picked)
+            self._totals[id(rng)] = rng, totals
+        return self._totals[id(rng)][1].get(key, (0, 0))
+
+    def composite(self, others):
+        """{(key, key, ...): positions} grouping by this range and others."""
+        ids = tuple(id(r) for r in others)
+        if ids not in self._composites:
+            columns = [self.values] + [r.index().values for r in others]
+            groups = {}
+            for i, row in enumerate(zip(*columns)):
+                keys = tuple(_key(v) for v in row)
+                if None not in keys:
+                    groups.setdefault(keys, []).append(i)
+            self._composites[ids] = others, groups
+        return self._composites[ids][1]
+
+
+def _criteria(pairs):
+    """[(range, op, target)] for (range, criterion) pairs of one shape."""
+    if not pairs:
+        raise ExcelError("#VALUE!")
+    shape = None
+    out = []
+    for rng, crit in pairs:
+        if not isinstance(rng, Range):
+            raise ExcelError("#VALUE!")
+        if shape is None:
+            shape = rng.shape
+        elif rng.shape != shape:
+            raise ExcelError("#VALUE!")
+        out.append((rng, *_parse_criterion(_scalar(crit))))
+    return out
+
+
+def _matching(criteria):
+    """Ascending positions of the cells meeting every criterion."""
+    found = [rng.index().find(op, target) for rng, op, target in criteria]
+    equal = [i for i, f in enumerate(found) if f and f[0] == "group" and not f[2]]
+    if len(equal) > 1:
+        # several = criteria: one lookup in their combined grouping
+        first = criteria[equal[0]][0].index()
+        others = tuple(criteria[i][0] for i in equal[1:])
+        hits = first.composite(others).get(tuple(found[i][1] for i in equal), [])
+        done = set(equal)
+    else:
+        # start from the most selective criterion the index can answer
+        indexed = [i for i, f in enumerate(found) if f]
+        if indexed:
+            best = min(indexed, key=lambda i: criteria[i][0].index().count(found[i]))
+            hits = criteria[best][0].index().positions(found[best])
+            done = {best}
+        else:
+            rows, cols = criteria[0][0].shape
+            hits, done = range(rows * cols), set()
+    for i, (rng, op, target) in enumerate(criteria):
+        if i not in done and hits:
+            test = _predicate(op, target)
+            values = rng.index().values
+            hits = [j for j in hits if test(values[j])]
+    return list(hits)
+
+
+def _count_matching(pairs):
+    """How many cells meet every (range, criterion) pair."""
+    criteria = _criteria(pairs)
+    if len(criteria) == 1:
+        rng, op, target = criteria[0]
+        found = rng.index().find(op, target)
+        if found:
+            return rng.index().count(found)
+    return len(_matching(criteria))
+
+
+def _total_matching(pairs, rng):
+    """(sum, count) of rng's numbers in the cells meeting every pair."""
+    criteria = _criteria(pairs)
+    if not isinstance(rng, Range):
+        raise ExcelError("#VALUE!")
+    if rng.shape != criteria[0][0].shape:
+        raise ExcelError("#VALUE!")
+    if len(criteria) == 1:
+        crit_rng, op, target = criteria[0]
+        found = crit_rng.index().find(op, target)
+        totals = found and crit_rng.index().totals(found, rng)
+        if totals:
+            return totals
+    values = rng.index().values
+    picked = [values[i] for i in _matching(criteria) if _numeric(values[i])]
+    return sum(picked), len(picked)
+
+
+def _pairs(args):
+    if len(args) % 2:
+        raise ExcelError("#VALUE!")
+    return list(zip(args[::2], args[1::2]))
+
+
+# ---------- Functions ----------
+# name -> f(*args); args are already evaluated (ranges as Range)
+FUNCTIONS = {}
+
+
+def function(name):
+    def register(fn):
+        FUNCTIONS[name] = fn
+        return fn
+
+    return register
+
+
+@function("SUM")
+def _sum(*args):
+    return sum(_numbers(args))
+
+
+@function("AVERAGE")
+def _average(*args):
+    values = _numbers(args)
+    if not values:
+        raise ExcelError("#DIV/0!")
+    return sum(values) / len(values)
+
+
+@function("MIN")
+def _min(*args):
+    return min(_numbers(args), default=0)
+
+
+@function("MAX")
+def _max(*args):
+    return max(_numbers(args), default=0)
+
+
+@function("COUNT")
+def _count(*args):
+    return sum(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in _flat(args)
+    )
+
+
+@function("COUNTA")
+def _counta(*args):
+    return sum(v is not None and v != "" for v in _flat(args))
+
+
+@function("LARGE")
+def _large(rng, k):
+    values = sorted(_numbers([rng]), reverse=True)
+    k = int(_number(_scalar(k)))
+    if not 1 <= k <= len(values):
+        raise ExcelError("#NUM!")
+    return values[k - 1]
+
+
+@function("SMALL")
+def _small(rng, k):
+    values = sorted(_numbers([rng]))
+    k = int(_number(_scalar(k)))
+    if not 1 <= k <= len(values):
+        raise ExcelError("#NUM!")
+    return values[k - 1]
+
+
+@function("ROUND")
+def _round(x, digits=0):
+    x, digits = _number(_scalar(x)), int(_number(_scalar(digits)))
+    # Excel rounds halves away from zero
+    try:
+        q = Decimal(1).scaleb(-digits)
+        result = float(Decimal(repr(x)).quantize(q, rounding=ROUND_HALF_UP))
+    except (InvalidOperation, OverflowError):
+        raise ExcelError("#NUM!") from None
+    return int(result) if result.is_integer() else result
+
+
+@function("INT")
+def _int(x):
+    try:
+        return math.floor(_number(_scalar(x)))
+    except (OverflowError, ValueError):  # inf and nan
+        raise ExcelError("#NUM!") from None
+
+
+@function("COUNTIF")
+def _countif(rng, crit):
+    return _count_matching([(rng, crit)])
+
+
+@function("COUNTIFS")
+def _countifs(*args):
+    return _count_matching(_pairs(args))
+
+
+@function("SUMIF")
+def _sumif(rng, crit, sum_range=None):
+    return _total_matching([(rng, crit)], sum_range or rng)[0]
+
+
+@function("SUMIFS")
+def _sumifs(sum_range, *args):
+    return _total_matching(_pairs(args), sum_range)[0]
+
+
+@function("AVERAGEIF")
+def _averageif(rng, crit, avg_range=None):
+    total, count = _total_matching([(rng, crit)], avg_range or rng)
+    if not count:
+        raise ExcelError("#DIV/0!")
+    return total / count
+
+
+@function("AVERAGEIFS")
+def _averageifs(avg_range, *args):
+    total, count = _total_matching(_pairs(args), avg_range)
+    if not count:
+        raise ExcelError("#DIV/0!")
+    return total / count
+
+
+def _logicals(args):
+    # text and blanks inside ranges are ignored, as in Excel
+    tests = []
+    for arg in args:
+        if isinstance(arg, Range):
+            tests += [
+                _truth(v) for v in arg.values() if not isinstance(v, (str, type(None)))
+            ]
+        else:
+            tests.append(_truth(arg))
+    if not tests:
+        raise ExcelError("#VALUE!")
+    return tests
+
+
+@function("AND")
+def _and(*args):
+    return all(_logicals(args))
+
+
+@function("OR")
+def _or(*args):
+    return any(_logicals(args))
+
+
+@function("NOT")
+def _not(v):
+    return not _truth(_scalar(v))
+
+
+def _lookup_equal(key):
+    if isinstance(key, str):
+        pattern = _wildcard(key)
+        return lambda v: isinstance(v, str) and bool(pattern.fullmatch(v))
+    return lambda v: v is not None and _rank(v) == _rank(key) and _compare(v, key) == 0
+
+
+def _sort_key(v):
+    return v.lower() if isinstance(v, str) else v
+
+
+class _Lookup:
+    """Where each key sits in a lookup column or row, built once per range.
+
+    first maps each value's _key to its first position, so an exact match
+    is one dict lookup. For approximate matches the keys of each type are
+    kept sorted (when the column is in ascending order, as Excel requires)
+    and searched with bisect; out-of-order columns fall back to a scan.
+    """
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.first = {}
+        for i, v in enumerate(keys):
+            k = _key(v)
+            if k is not None:
+                self.first.setdefault(k, i)
+        self._sorted = {}  # rank -> (sort keys, positions), or None if unsorted
+
+    def exact(self, key):
+        """Position of the first key equal to key (wildcards allowed in text)."""
+        if isinstance(key, str) and (key == "" or _WILDCARDS.search(key)):
+            equal = _lookup_equal(key)
+            for i, v in enumerate(self.keys):
+                if equal(v):
+                    return i
+            raise ExcelError("#N/A")
+        i = self.first.get(("n", 0) if key is None else _key(key))
+        if i is None:
+            raise ExcelError("#N/A")
+        return i
+
+    def approximate(self, key):
+        """Position of the last key <= key, in an ascending column."""
+        rank = _rank(key)
+        if rank not in self._sorted:
+            entries = [
+                (i, v)
+                for i, v in enumerate(self.keys)
+                if v is not None and _rank(v) == rank
+            ]
+            order = [_sort_key(v) for _, v in entries]
+            ordered = not any(isinstance(v, ExcelError) for _, v in entries) and all(
+                a <= b for a, b in zip(order, order[1:])
+            )
+            self._sorted[rank] = (order, [i for i, _ in entries]) if ordered else None
+        found = self._sorted[rank]
+        if found is None:
+            return _scan_approximate(key, self.keys)
+        order, positions = found
+        at = bisect_right(order, _sort_key(0 if key is None else key))
+        if not at:
+            raise ExcelError("#N/A")
+        return positions[at - 1]
+
+
+def _scan_approximate(key, keys):
+    # the last key <= lookup value before the first bigger one
+    found = None
+    for i, v in enumerate(keys):
+        if v is None or _rank(v) != _rank(key):
+            continue
+        if _compare(v, key) > 0:
+            break
+        found = i
+    if found is None:
+        raise ExcelError("#N/A")
+    return found
+
+
+def _find(lookup, key, exact):
+    return lookup.exact(key) if exact else lookup.approximate(key)
+
+
+@function("VLOOKUP")
+def _vlookup(key, table, col, approximate=True):
+    key, col = _scalar(key), int(_number(_scalar(col)))
+    if not isinstance(table, Range):
+        raise ExcelError("#VALUE!")
+    if not 1 <= col <= table.shape[1]:
+        raise ExcelError("#REF!")
+    exact = not _truth(_scalar(approximate))
+    return table.rows[_find(table.lookup("col"), key, exact)][col - 1]
+
+
+@function("HLOOKUP")
+def _hlookup(key, table, row, approximate=True):
+    key, row = _scalar(key), int(_number(_scalar(row)))
+    if not isinstance(table, Range):
+        raise ExcelError("#VALUE!")
+    if not 1 <= row <= table.shape[0]:
+        raise ExcelError("#REF!")
+    exact = not _truth(_scalar(approximate))
+    return table.rows[row - 1][_find(table.lookup("row"), key, exact)]
+
+
+@function("XLOOKUP")
+def _xlookup(key, lookup, result, if_not_found=None, match_mode=0, search_mode=1):
+    if _number(_scalar(match_mode)) != 0 or _number(_scalar(search_mode)) != 1:
+        raise Unsupported("XLOOKUP match/search modes")
+    if not isinstance(lookup, Range) or not isinstance(result, Range):
+        raise ExcelError("#VALUE!")
+    keys = lookup.lookup("all")
+    try:
+        i = keys.exact(_scalar(key))
+    except ExcelError:
+        if if_not_found is None:
+            raise
+        return _scalar(if_not_found)
+    rows, cols = result.shape
+    if rows == len(keys.keys):
+        return Range([result.rows[i]]) if cols > 1 else result.rows[i][0]
+    if cols == len(keys.keys):
+        column = [row[i] for row in result.rows]
+        return Range([[v] for v in column]) if rows > 1 else column[0]
+    raise ExcelError("#VALUE!")
+
+
+@function("MATCH")
+def _match(key, array, match_type=1):
+    key, match_type = _scalar(key), _number(_scalar(match_type))
+    if not isinstance(array, Range) or 1 not in array.shape:
+        raise ExcelError("#N/A")
+    keys = array.lookup("all")
+    if match_type == 0:
+        return keys.exact(key) + 1
+    if match_type > 0:
+        return keys.approximate(key) + 1
+    # -1: the last key >= lookup value in a descending list
+    found = None
+    for i, v in enumerate(keys.keys):
+        if v is None or _rank(v) != _rank(key):
+            continue
+        if _compare(v, key) < 0:
+            break
+        found = i
+    if found is None:
+        raise ExcelError("#N/A")
+    return found + 1
+
+
+@function("INDEX")
+def _index_at(array, row, col=None):
+    if not isinstance(array, Range):
+        array = Range([[array]])
+    rows, cols = array.shape
+    row = int(_number(_scalar(row)))
+    if col is None:
+        if rows == 1:  # INDEX(A1:E1, 3) picks the third column
+            row, col = 1, row
+        else:
+            col = 1 if cols == 1 else 0
+    else:
+        col = int(_number(_scalar(col)))
+    if not (0 <= row <= rows and 0 <= col <= cols):
+        raise ExcelError("#REF!")
+    if row and col:
+        return array.rows[row - 1][col - 1]
+    if row:
+        return Range([array.rows[row - 1]])
+    if col:
+        return Range([[r[col - 1]] for r in array.rows])
+    return array
+
+
+@function("LEN")
+def _len(v):
+    return len(_text(_scalar(v)))
+
+
+@function("LEFT")
+def _left(v, n=1):
+    n = int(_number(_scalar(n)))
+    if n < 0:
+        raise ExcelError("#VALUE!")
+    return _text(_scalar(v))[:n]
+
+
+@function("RIGHT")
+def _right(v, n=1):
+    n = int(_number(_scalar(n)))
+    if n < 0:
+        raise ExcelError("#VALUE!")
+    return _text(_scalar(v))[-n:] if n else ""
+
+
+@function("MID")
+def _mid(v, start, n):
+    start, n = int(_number(_scalar(start))), int(_number(_scalar(n)))
+    if start < 1 or n < 0:
+        raise ExcelError("#VALUE!")
+    return _text(_scalar(v))[start - 1 : start - 1 + n]
+
+
+@function("UPPER")
+def _upper(v):
+    return _text(_scalar(v)).upper()
+
+
+@function("LOWER")
+def _lower(v):
+    return _text(_scalar(v)).lower()
+
+
+@function("PROPER")
+def _proper(v):
+    return re.sub(r"[A-Za-z]+", lambda m: m.group().capitalize(), _text(_scalar(v)))
+
+
+@function("TRIM")
+def _trim(v):
+    # Excel's TRIM also squeezes runs of inner spaces down to one
+    return re.sub(" +", " ", _text(_scalar(v)).strip(" "))
+
+
+@function("CONCAT")
+def _concat(*args):
+    return "".join(_text(v) for v in _flat(args))
+
+
+@function("CONCATENATE")
+def _concatenate(*args):
+    return "".join(_text(_scalar(v)) for v in args)
+
+
+@function("TEXTJOIN")
+def _textjoin(delimiter, ignore_empty, *args):
+    skip = _truth(_scalar(ignore_empty))
+    parts = [_text(v) for v in _flat(args) if not (skip and (v is None or v == ""))]
+    return _text(_scalar(delimiter)).join(parts)
+
+
+def _date(v):
+    serial = _number(_scalar(v))
+    if serial < 0:
+        raise ExcelError("#NUM!")
+    try:
+        return from_excel(serial)
+    except (OverflowError, ValueError):  # past 9999-12-31
+        raise ExcelError("#NUM!") from None
+
+
+@function("YEAR")
+def _year(v):
+    return _date(v).year
+
+
+@function("MONTH")
+def _month(v):
+    return _date(v).month
+
+
+@function("DAY")
+def _day(v):
+    return _date(v).day
+
+
+@function("TODAY")
+def _today():
+    return int(to_excel(xlsx_io.build_time().date()))
+
+
+@function("NOW")
+def _now():
+    return to_excel(xlsx_io.build_time())
+
+
+# Functions whose arguments are evaluated lazily (only the branch taken)
+_LAZY = {"IF", "IFERROR"}
+# Functions whose optional third range Excel resizes to the first's shape
+_RESIZED = {"SUMIF", "AVERAGEIF"}
+# Functions whose result changes between calls; never memoised
+_VOLATILE = {"TODAY", "NOW"}
+# Defined name of a workbook's pinned "as-of" date and time; when present,
+# TODAY() and NOW() return it instead of the clock (see topic9.py)
+AS_OF = "AsOf"
+
+
+# ---------- Evaluation ----------
+def _operate(op, a, b):
+    if op == "&":
+        return _text(_scalar(a)) + _text(_scalar(b))
+    a, b = _scalar(a), _scalar(b)
+    if op in ("=", "<>", "<", ">", "<=", ">="):
+        c = _compare(a, b)
+        return {"=": c == 0, "<>": c != 0, "<": c < 0, ">": c > 0,
+                "<=": c <= 0, ">=": c >= 0}[op]  # fmt: skip
+    a, b = _number(a), _number(b)
+    if op == "+":
+        return _finite(a + b)
+    if op == "-":
+        return _finite(a - b)
+    if op == "*":
+        return _finite(a * b)
+    if op == "/":
+        if b == 0:
+            raise ExcelError("#DIV/0!")
+        return _finite(a / b)
+    try:
+        # in floats, as Excel does: an int power would give =10^400 exactly
+        result = float(a) ** b
+    except (OverflowError, ZeroDivisionError):
+        raise ExcelError("#NUM!") from None
+    if isinstance(result, complex):
+        raise ExcelError("#NUM!")
+    result = _finite(result)
+    return int(result) if result.is_integer() and abs(result) < 2**53 else result
+
+
+def _resized(node, like):
+    """Reference node stretched or cut to like's shape from its top-left
+    cell, as SUMIF(A1:A5,">1",B1) sums B1:B5; other nodes as they are."""
+    if node[0] != "ref" or like[0] != "ref" or None in (*node[2:6], *like[2:6]):
+        return node
+    _, sheet, row, col = node[:4]
+    rows, cols = like[4] - like[2], like[5] - like[3]
+    return ("ref", sheet, row, col, row + rows, col + cols, False)
+
+
+def _finite(x):
+    """x, or #NUM! if it's past what an Excel number (a double) can hold."""
+    try:
+        if math.isfinite(x):
+            return x
+    except OverflowError:  # an int too big for a float
+        pass
+    raise ExcelError("#NUM!")
+
+
+_OFFSET = re.compile(rb"[A-Z]\[-?\d+\]")
+
+
+def _template(formula, row, form):
+    """(tree, relative, row, formula) for Evaluator.parse, or Unsupported.
+    relative is None when the relative rows xlsx_io found in the text (its
+    relative form) aren't exactly those of the references parsed."""
+    try:
+        parser = _Parser(formula)
+        tree = parser.parse()
+    except Unsupported as problem:
+        return problem
+    except Exception as problem:  # the Tokenizer's own errors
+        return Unsupported(f"cannot parse {formula!r}: {problem}")
+    relative = parser.relative
+    if form is not None and len(_OFFSET.findall(form)) != parser.moving:
+        relative = None
+    return tree, relative, row, formula
+
+
+def _moved(node, relative, rows):
+    """Parse tree node with its relative row references moved down rows."""
+    kind = node[0]
+    if kind == "ref":
+        ends = relative.get(id(node))
+        if ends is None:
+            return node
+        _, sheet, min_row, min_col, max_row, max_col, single = node
+        low, high = sorted((min_row + rows * ends[0], max_row + rows * ends[1]))
+        return ("ref", sheet, low, min_col, high, max_col, single)
+    if kind == "call":
+        return ("call", node[1], [_moved(a, relative, rows) for a in node[2]])
+    if kind == "op":
+        moved = _moved(node[2], relative, rows), _moved(node[3], relative, rows)
+        return ("op", node[1], *moved)
+    if kind == "neg":
+        return ("neg", _moved(node[1], relative, rows))
+    return node
+
+
+class Evaluator:
+    """Evaluates the formulas of one workbook, each cell at most once.
+
+    sheets maps each sheet title to its {(row, col): cell} dict (as in
+    ws._cells; any cells with .value and .data_type will do) and names maps
+    workbook-level defined names to their formula text. tables maps table
+    names to their areas (see tables()), for structured references. as_of
+    (a datetime or date) pins TODAY() and NOW(); otherwise the workbook's
+    AsOf name does, if it has one, and failing that the build time.
+    """
+
+    def __init__(self, sheets, names=None, as_of=None, tables=None):
+        self.sheets = sheets
+        self.names = names or {}
+        self.tables = tables or {}
+        self.as_of = None if as_of is None else to_excel(as_of)
+        self.values = {}  # (sheet, row, col) -> value (ExcelError for errors)
+        self._parsed = {}  # formula text or relative form -> _template()
+        self._ranges = {}  # (sheet, bounds) -> Range
+        self._calls = {}  # memoised calls over ranges
+        self._busy = set()  # cells being evaluated (cycle check)
+        self._extents = {}  # sheet -> (last used row, last used column)
+        self._here = []  # formula cells being evaluated, innermost last
+        self._graph = None  # Dependencies, built on first update()
+
+    @classmethod
+    def for_workbook(cls, wb):
+        return cls(
+            {ws.title: ws._cells for ws in wb.worksheets},
+            defined_names(wb),
+            tables=tables(wb),
+        )
+
+    def parse(self, formula, row=None):
+        """The parse tree of formula. Given the row it sits in, one tree is
+        kept for a whole fill-down (=F2*G2, =F3*G3, ...) and moved to row."""
+        form = None if row is None else xlsx_io._relative_form(formula.encode(), row)
+        key = form or formula
+        entry = self._parsed.get(key)
+        if entry is None:
+            entry = self._parsed[key] = _template(formula, row, form)
+        if isinstance(entry, Unsupported):
+            raise entry
+        tree, relative, origin, text = entry
+        if relative is None and text != formula:
+            # a row-like name (a table called T1, ...) the key can't move
+            tree, relative, origin, _ = _template(formula, row, None)
+        if relative and row != origin:
+            tree = _moved(tree, relative, row - origin)
+        return tree
+
+    def cell(self, sheet, row, col):
+        """A cell's value, evaluating it first if it holds a formula."""
+        key = (sheet, row, col)
+        if key in self.values:
+            return self.values[key]
+        cell = self.sheets[sheet].get((row, col))
+        value = None if cell is None else cell.value
+        if _is_formula(cell):
+            if key in self._busy:
+                raise Unsupported(f"circular reference at {sheet}!{cell.coordinate}")
+            self._busy.add(key)
+            self._here.append(key)
+            try:
+                value = self.formula(value, sheet, row)
+            finally:
+                self._busy.discard(key)
+                self._here.pop()
+        elif isinstance(value, (datetime, date, time)):
+            value = to_excel(value)
+        elif value is not None and not isinstance(value, (int, float, str)):
+            raise Unsupported(f"{type(value).__name__} in {sheet}!{cell.coordinate}")
+        self.values[key] = value
+        return value
+
+    def formula(self, text, sheet, row=None):
+        """The result of formula text ("=SUM(A1:A3)") as if entered on sheet
+        (in row, if given: see parse)."""
+        try:
+            value = _scalar(self.eval(self.parse(text, row), sheet))
+            if isinstance(value, (int, float)):
+                value = _finite(value)
+        except ExcelError as error:
+            return error
+        return 0 if value is None else value  # =A1 with A1 empty shows 0
+
+    def extent(self, sheet):
+        if sheet not in self._extents:
+            keys = self.sheets[sheet].keys()
+            self._extents[sheet] = (
+                max((r for r, _ in keys), default=0),
+                max((c for _, c in keys), default=0),
+            )
+        return self._extents[sheet]
+
+    def range(self, sheet, min_row, min_col, max_row, max_col):
+        key = (sheet, min_row, min_col, max_row, max_col)
+        rng = self._ranges.get(key)
+        if rng is None:
+            rng = Range(
+                [
+                    [self.cell(sheet, r, c) for c in range(min_col, max_col + 1)]
+                    for r in range(min_row, max_row + 1)
+                ]
+            )
+            self._ranges[key] = rng
+        return rng
+
+    def invalidate(self, sheet, row, col):
+        """Forget what is cached about a cell whose content has changed.
+
+        Drops the cell's value and every cached range covering it, and with
+        them their criteria and lookup indexes. Formulas that depend on the
+        cell keep their results until they are invalidated as well.
+        """
+        self.values.pop((sheet, row, col), None)
+        self._extents.pop(sheet, None)
+        stale = [
+            key
+            for key in self._ranges
+            if key[0] == sheet and key[1] <= row <= key[3] and key[2] <= col <= key[4]
+        ]
+        for key in stale:
+            del self._ranges[key]
+        if stale:
+            self._calls.clear()  # memoised by the ids of the dropped ranges
+
+    def eval(self, node, sheet):
+        kind = node[0]
+        if kind == "value":
+            return node[1]
+        if kind == "ref":
+            _, ref_sheet, min_row, min_col, max_row, max_col, single = node
+            ref_sheet = ref_sheet or sheet
+            if ref_sheet not in self.sheets:
+                raise ExcelError("#REF!")
+            if None in (min_row, min_col, max_row, max_col):
+                # whole columns (A:A) or rows (2:2) stop at the last used cell
+                last_row, last_col = self.extent(ref_sheet)
+                min_row, min_col = min_row or 1, min_col or 1
+                max_row, max_col = max_row or last_row, max_col or last_col
+            if single:
+                value = self.cell(ref_sheet, min_row, min_col)
+                if isinstance(value, ExcelError):
+                    raise value
+                return value
+            return self.range(ref_sheet, min_row, min_col, max_row, max_col)
+        if kind == "table":
+            row = self._here[-1][1] if self._here else None
+            return self.eval(self.table_ref(node, sheet, row), sheet)
+        if kind == "op":
+            return _operate(
+                node[1], self.eval(node[2], sheet), self.eval(node[3], sheet)
+            )
+        if kind == "neg":
+            return -_number(_scalar(self.eval(node[1], sheet)))
+        if kind == "call":
+            return self.call(node[1], node[2], sheet)
+        if kind == "blank":
+            return None
+        if kind == "error":
+            raise ExcelError(node[1])
+        if kind == "name":
+            return self.name(node[1], sheet)
+        raise Unsupported(kind)
+
+    def name(self, text, sheet):
+        defined = self.names.get(text.upper())
+        if defined is None:
+            raise ExcelError("#NAME?")
+        return self.eval(self.parse(f"={defined}"), sheet)
+
+    def table_ref(self, node, sheet, row):
+        """The "ref" node a structured reference stands for in a formula on
+        sheet at row (row only matters for [@Column])."""
+        _, name, areas, first, last = node
+        if name is None:  # [@Units]: the table the formula sits in
+            table = next(
+                (
+                    t
+                    for t in self.tables.values()
+                    if t.sheet == sheet and row and t.min_row <= row <= t.max_row
+                ),
+                None,
+            )
+        else:
+            table = self.tables.get(name.upper())
+        if table is None:
+            raise ExcelError("#REF!")
+        top, bottom = table.min_row + table.headers, table.max_row - table.totals
+        spans = []
+        for area in areas:
+            if area == "#All":
+                spans.append((table.min_row, table.max_row))
+            elif area == "#Data":
+                spans.append((top, bottom))
+            elif area == "#Headers" and table.headers:
+                spans.append((table.min_row, top - 1))
+            elif area == "#Totals" and table.totals:
+                spans.append((bottom + 1, table.max_row))
+            elif area == "#This Row" and row is not None and top <= row <= bottom:
+                spans.append((row, row))
+            else:
+                raise ExcelError("#REF!" if area != "#This Row" else "#VALUE!")
+        min_col, max_col = table.min_col, table.max_col
+        if first is not None:
+            columns = [c.upper() for c in table.columns]
+            if first.upper() not in columns or last.upper() not in columns:
+                raise ExcelError("#REF!")
+            min_col, max_col = sorted(
+                table.min_col + columns.index(c.upper()) for c in (first, last)
+            )
+        min_row = min(lo for lo, _ in spans)
+        max_row = max(hi for _, hi in spans)
+        single = areas == ("#This Row",) and min_col == max_col
+        return ("ref", table.sheet, min_row, min_col, max_row, max_col, single)
+
+    def precedents(self, sheet, row, col):
+        """([(sheet, min_row, min_col, max_row, max_col), ...], volatile) for
+        the formula in a cell: the areas it reads (None bounds for whole
+        columns or rows) and whether it calls an unpinned TODAY()/NOW().
+
+        Both branches of IF and IFERROR count, whichever one is taken.
+        """
+        areas, volatile = [], []
+        cell = self.sheets[sheet][(row, col)]
+
+        def walk(node, seen):
+            kind = node[0]
+            if kind == "ref":
+                areas.append((node[1] or sheet, *node[2:6]))
+            elif kind == "table":
+                try:
+                    walk(self.table_ref(node, sheet, row), seen)
+                except ExcelError:
+                    pass
+            elif kind == "name":
+                defined = self.names.get(node[1].upper())
+                if defined is not None and node[1].upper() not in seen:
+                    walk(self.parse(f"={defined}"), seen | {node[1].upper()})
+            elif kind == "call":
+                if node[1] in _VOLATILE:
+                    if AS_OF.upper() in self.names:
+                        walk(("name", AS_OF), seen)
+                    elif self.as_of is None:
+                        volatile.append(node[1])
+                args = node[2]
+                if node[1] in _RESIZED and len(args) == 3:
+                    args = [*args[:2], _resized(args[2], args[0])]
+                for arg in args:
+                    walk(arg, seen)
+            elif kind == "op":
+                walk(node[2], seen)
+                walk(node[3], seen)
+            elif kind == "neg":
+                walk(node[1], seen)
+
+        walk(self.parse(cell.value, row), frozenset())
+        return areas, bool(volatile)
+
+    def dependencies(self):
+        """The workbook's Dependencies, built on first use."""
+        if self._graph is None:
+            self._graph = Dependencies(self)
+        return self._graph
+
+    def update(self, changed):
+        """Recalculate after the cells in changed ((sheet, row, col) keys)
+        were edited in the sheets.
+
+        Only the formulas that depend on them, directly or not, are worked
+        out again, precedents first. Each new value is written into the
+        cached ranges that cover it, so a 10,000-row range is patched rather
+        than read again, and only the indexes and memoised calls over ranges
+        whose values actually changed are dropped. Returns
+        {(sheet, row, col): value} for the recalculated formulas; ones the
+        evaluator can't handle are left out.
+        """
+        graph = self.dependencies()
+        changed = list(dict.fromkeys(changed))
+        for key in changed:
+            graph.discard(key)
+            if _is_formula(self.sheets[key[0]].get(key[1:])):
+                graph.add(key)
+        order = graph.order(changed)
+        for key in changed + order:
+            self.values.pop(key, None)
+        for sheet, row, col in changed:
+            last_row, last_col = self.extent(sheet)
+            if row > last_row or col > last_col:
+                # whole-column and whole-row ranges on sheet grow
+                self.invalidate(sheet, row, col)
+            elif (sheet, row, col) not in graph.reads:
+                self._patch(sheet, row, col)
+        results = {}
+        for key in order:
+            try:
+                results[key] = self.cell(*key)
+            except (Unsupported, RecursionError):
+                self.invalidate(*key)
+                continue
+            self._patch(*key)
+        return results
+
+    def _patch(self, sheet, row, col):
+        """Write a cell's current value into the cached ranges over it."""
+        value = self.cell(sheet, row, col)
+        altered = []
+        for (s, min_row, min_col, max_row, max_col), rng in self._ranges.items():
+            if s == sheet and min_row <= row <= max_row and min_col <= col <= max_col:
+                cells = rng.rows[row - min_row]
+                old = cells[col - min_col]
+                if type(old) is not type(value) or old != value:
+                    cells[col - min_col] = value
+                    altered.append(rng)
+        if altered:
+            self._forget(altered)
+
+    def _forget(self, ranges):
+        """Drop the indexes and memoised calls built over ranges."""
+        ids = {id(rng) for rng in ranges}
+        for rng in ranges:
+            rng._index, rng._lookups = None, {}
+        for rng in self._ranges.values():
+            index = rng._index
+            if index is None:
+                continue
+            for cache in (index._totals, index._prefixes):
+                for stale in ids & cache.keys():
+                    del cache[stale]
+            for key in [k for k in index._composites if ids.intersection(k)]:
+                del index._composites[key]
+        for key in [k for k in self._calls if ids.intersection(k[1:])]:
+            del self._calls[key]
+
+    def pinned_now(self, sheet):
+        """The pinned as-of serial for TODAY()/NOW(), or None for the clock."""
+        if self.as_of is not None:
+            return self.as_of
+        if AS_OF.upper() in self.names:
+            return _number(_scalar(self.name(AS_OF, sheet)))
+        return None
+
+    def call(self, name, args, sheet):
+        if name in _LAZY:
+            return self.lazy(name, args, sheet)
+        if name in _VOLATILE and not args:
+            now = self.pinned_now(sheet)
+            if now is not None:
+                return math.floor(now) if name == "TODAY" else now
+        fn = FUNCTIONS.get(name)
+        if fn is None:
+            raise Unsupported(f"function {name}")
+        if name in _RESIZED and len(args) == 3:
+            args = [*args[:2], _resized(args[2], args[0])]
+        values = [self.eval(a, sheet) for a in args]
+        # the same aggregate over the same range (e.g. a fixed $D$3:$D$40
+        # total in every row) is worked out once
+        if name in _VOLATILE or not any(isinstance(v, Range) for v in values):
+            return self.invoke(name, fn, values)
+        key = (name, *(id(v) if isinstance(v, Range) else (type(v), v) for v in values))
+        if key not in self._calls:
+            try:
+                self._calls[key] = self.invoke(name, fn, values)
+            except ExcelError as error:
+                self._calls[key] = error
+        result = self._calls[key]
+        if isinstance(result, ExcelError):
+            raise result
+        return result
+
+    def invoke(self, name, fn, values):
+        # an omitted optional argument (None) falls back to its default
+        while values and values[-1] is None:
+            values = values[:-1]
+        try:
+            return fn(*values)
+        except TypeError:
+            raise ExcelError("#VALUE!") from None
+
+    def lazy(self, name, args, sheet):
+        if name == "IF":
+            if not 1 < len(args) <= 3:
+                raise ExcelError("#VALUE!")
+            test = _truth(_scalar(self.eval(args[0], sheet)))
+            if test:
+                value = self.eval(args[1], sheet)
+                return 0 if value is None else value
+            if len(args) == 2:
+                return False
+            value = self.eval(args[2], sheet)
+            return 0 if value is None else value
+        # IFERROR
+        if len(args) != 2:
+            raise ExcelError("#VALUE!")
+        try:
+            return _scalar(self.eval(args[0], sheet))
+        except ExcelError:
+            value = self.eval(args[1], sheet)
+            return 0 if value is None else value
+
+
+def _is_formula(cell):
+    return cell is not None and cell.data_type == "f" and isinstance(cell.value, str)
+
+
+# ---------- Dependencies ----------
+# Areas of up to this many cells become per-cell edges; bigger ones (a fixed
+# $D$2:$D$500 criteria range) are kept whole and found through their columns
+_SMALL_AREA = 64
+_MAX_ROW, _MAX_COL = 1048576, 16384
+
+
+class Dependencies:
+    """Which formula cells read which cells: a workbook's dependency graph.
+
+    Built from the parse trees of every formula the Evaluator's sheets hold,
+    including defined names and structured (table) references. Small areas
+    are stored cell by cell; large ones are bucketed by (sheet, column) and
+    whole-row areas by (sheet, None), so finding what reads a cell never
+    walks the whole graph.
+    """
+
+    def __init__(self, evaluator):
+        self.evaluator = evaluator
+        self.reads = {}  # formula cell -> [area, ...] it reads
+        self.cells = {}  # (sheet, row, col) -> {formula cell, ...}
+        self.areas = {}  # (sheet, col or None) -> {area: {formula cell, ...}}
+        self.volatile = set()  # formula cells that call an unpinned TODAY()
+        for sheet in evaluator.sheets:
+            for (row, col), cell in list(evaluator.sheets[sheet].items()):
+                if _is_formula(cell):
+                    self.add((sheet, row, col))
+
+    def add(self, key):
+        """Record the areas the formula cell key reads."""
+        try:
+            areas, volatile = self.evaluator.precedents(*key)
+        except (Unsupported, RecursionError):
+            areas, volatile = [], False
+        if volatile:
+            self.volatile.add(key)
+        stored = []
+        for sheet, min_row, min_col, max_row, max_col in areas:
+            if min_col is None:  # whole rows
+                area = (sheet, min_row, 1, max_row, _MAX_COL)
+                buckets = [(sheet, None)]
+            else:
+                min_row, max_row = min_row or 1, max_row or _MAX_ROW
+                area = (sheet, min_row, min_col, max_row, max_col)
+                size = (max_row - min_row + 1) * (max_col - min_col + 1)
+                if size <= _SMALL_AREA:
+                    for r in range(min_row, max_row + 1):
+                        for c in range(min_col, max_col + 1):
+                            self.cells.setdefault((sheet, r, c), set()).add(key)
+                    stored.append((area, None))
+                    continue
+                buckets = [(sheet, c) for c in range(min_col, max_col + 1)]
+            for bucket in buckets:
+                self.areas.setdefault(bucket, {}).setdefault(area, set()).add(key)
+            stored.append((area, buckets))
+        self.reads[key] = stored
+
+    def discard(self, key):
+        """Forget the areas the cell key read (if it held a formula)."""
+        self.volatile.discard(key)
+        for area, buckets in self.reads.pop(key, ()):
+            sheet, min_row, min_col, max_row, max_col = area
+            if buckets is None:
+                for r in range(min_row, max_row + 1):
+                    for c in range(min_col, max_col + 1):
+                        self.cells.get((sheet, r, c), set()).discard(key)
+                continue
+            for bucket in buckets:
+                readers = self.areas.get(bucket, {}).get(area)
+                if readers is not None:
+                    readers.discard(key)
+                    if not readers:
+                        del self.areas[bucket][area]
+
+    def dependents(self, key):
+        """The formula cells that read cell key directly."""
+        sheet, row, col = key
+        found = set(self.cells.get(key, ()))
+        for bucket in ((sheet, col), (sheet, None)):
+            for area, readers in self.areas.get(bucket, {}).items():
+                if area[1] <= row <= area[3] and area[2] <= col <= area[4]:
+                    found |= readers
+        return found
+
+    def order(self, changed):
+        """Every formula cell affected by the cells in changed, precedents
+        first: the changed formulas themselves, everything that depends on
+        them, and the volatile cells."""
+        seen, post = set(), []
+        starts = [k for k in changed if k in self.reads] + sorted(self.volatile)
+        for key in changed:
+            starts += sorted(self.dependents(key))
+        for start in starts:
+            if start in seen:
+                continue
+            seen.add(start)
+            stack = [(start, iter(sorted(self.dependents(start))))]
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    post.append(node)
+                elif child not in seen:
+                    seen.add(child)
+                    stack.append((child, iter(sorted(self.dependents(child)))))
+        return post[::-1]
+
+
+def defined_names(wb):
+    """{NAME: formula text} of wb's workbook-level defined names.
+
+    Names are case-insensitive in Excel, so the keys are upper-cased.
+    """
+    return {
+        name.upper(): defined.attr_text
+        for name, defined in wb.defined_names.items()
+        if defined.attr_text
+    }
+
+
+_Table = namedtuple(
+    "_Table", "sheet min_row min_col max_row max_col columns headers totals"
+)
+
+
+def _sheet_tables(ws):
+    """ws's Tables; a read-only sheet doesn't load them, so they are read
+    from its table parts."""
+    if hasattr(ws, "tables"):
+        return list(ws.tables.values())
+    archive = ws.parent._archive
+    rels = get_rels_path(ws._worksheet_path)
+    if rels not in archive.namelist():
+        return []
+    return [
+        Table.from_tree(fromstring(archive.read(rel.target)))
+        for rel in get_dependents(archive, rels).find(Table._rel_type)
+    ]
+
+
+def tables(wb):
+    """{NAME: table area} of wb's tables (read-only or not), for structured
+    references."""
+    found = {}
+    for ws in wb.worksheets:
+        for table in _sheet_tables(ws):
+            min_col, min_row, max_col, max_row = range_boundaries(table.ref)
+            headers = 1 if table.headerRowCount is None else table.headerRowCount
+            columns = [c.name for c in table.tableColumns]
+            if not columns and headers:  # named from the header row on save
+                columns = [
+                    str(getattr(ws._cells.get((min_row, c)), "value", ""))
+                    for c in range(min_col, max_col + 1)
+                ]
+            found[table.displayName.upper()] = _Table(
+                ws.title, min_row, min_col, max_row, max_col,
+                columns, headers, table.totalsRowCount or 0,
+            )  # fmt: skip
+    return found
+
+
+def evaluate(wb):
+    """Evaluate every formula in wb.
+
+    Returns {sheet title: {coordinate: value}} with numbers, text, booleans
+    and ExcelError values. Formulas that can't be evaluated are left out.
+    """
+    evaluator = Evaluator.for_workbook(wb)
+    results = {}
+    for ws in wb.worksheets:
+        found = {}
+        for (row, col), cell in sorted(ws._cells.items()):
+            if cell.data_type != "f" or not isinstance(cell.value, str):
+                continue
+            try:
+                found[cell.coordinate] = evaluator.cell(ws.title, row, col)
+            except Exception:
+                # left uncached: save() then has Excel recalculate on load
+                continue
+        if found:
+            results[ws.title] = found
+    return results
+
+
+def formula_count(wb):
+    """How many cells in wb hold a formula."""
+    return sum(
+        cell.data_type == "f" for ws in wb.worksheets for cell in ws._cells.values()
+    )
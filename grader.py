@@ -0,0 +1,367 @@
+# grader.py
+# Marks returned student workbooks against the answer key stored in each file
+# (see answer_key.py) and writes one row of scores per student.
+#
+# Each submission is opened read-only, so openpyxl streams the sheet XML
+# instead of building a full workbook, and only the sheets the answer key and
+# the formulas touch are read at all. The student's formulas are evaluated
+# (formula_eval.py) against that workbook's own Data sheet, so per-student
+# variants are marked against their own records, and compared with the
+# expected formula worked out on the same data. Files are spread over a
+# process pool.
+#
+# With --keys, a submission is marked against an exported answer key
+# (answer_key.export(); build_all.py / variants.py --answer-keys write one per
+# workbook as <name>.key.jsonl) instead of the key inside the file. The
+# expected results then come straight from the key file: nothing but the
+# student's own formulas is evaluated.
+#
+# TODAY() and NOW() follow a workbook's pinned AsOf date (see topic9.py) or
+# --as-of, so marks don't change with the day the grader runs.
+#
+# A task scores the share of its answer cells that are right; a fill-down
+# task with 38 of 40 rows right scores 0.95. Cells are marked:
+#   correct     the cell's result matches the expected result
+#   wrong       it doesn't
+#   blank       nothing entered
+#   no formula  a value typed in rather than worked out (unless --accept-values)
+#   unsupported a formula the evaluator can't work out; check by hand
+#
+# Usage:
+#   python grader.py returned/                     # every .xlsx under returned/
+#   python grader.py returned/*.xlsx -j 8 --out scores.csv
+#   python grader.py returned/ --details marks.jsonl   # per-cell results too
+#   python grader.py returned/ --as-of 2025-06-30      # pin TODAY()/NOW()
+#   python grader.py returned/ --keys keys/           # exported keys (see below)
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from openpyxl import load_workbook
+from openpyxl.utils import coordinate_to_tuple, get_column_letter
+
+import answer_key
+import formula_eval
+
+TOLERANCE = answer_key.TOLERANCE
+
+
+# ---------- Loading ----------
+class Sheets(Mapping):
+    """{title: {(row, col): cell}} over a read-only workbook.
+
+    A sheet's XML is only parsed the first time a formula (or the answer
+    key) looks at it, so Instructions, Hints and the like are never read.
+    """
+
+    def __init__(self, wb):
+        self.wb = wb
+        self.loaded = {}
+
+    def __getitem__(self, title):
+        if title not in self.loaded:
+            if title not in self.wb.sheetnames:
+                raise KeyError(title)
+            cells = {}
+            for row in self.wb[title].iter_rows():
+                for cell in row:
+                    if cell.value is not None:
+                        cells[(cell.row, cell.column)] = cell
+            self.loaded[title] = cells
+        return self.loaded[title]
+
+    def __iter__(self):
+        return iter(self.wb.sheetnames)
+
+    def __len__(self):
+        return len(self.wb.sheetnames)
+
+    def __contains__(self, title):
+        return title in self.wb.sheetnames
+
+
+# ---------- Marking ----------
+def same(got, want, tolerance=TOLERANCE):
+    """True if a student's result matches the expected one."""
+    if isinstance(want, bool) or isinstance(got, bool):
+        return got is want
+    if isinstance(want, (int, float)) and isinstance(got, (int, float)):
+        return abs(got - want) <= tolerance * max(1, abs(want))
+    return type(got) is type(want) and got == want
+
+
+def _mark_cell(evaluator, sheet, row, col, want, tolerance, accept_values):
+    """(coordinate, status, got, expected) for one answer cell; want is the
+    expected result, or a function that works it out."""
+    coord = f"{get_column_letter(col)}{row}"
+    cell = evaluator.sheets.get(sheet, {}).get((row, col))
+    if cell is None or cell.value in (None, ""):
+        return coord, "blank", None, None
+    if callable(want):
+        # a key the evaluator can't work out fails the whole task (see mark)
+        want = want()
+    try:
+        got = evaluator.cell(sheet, row, col)
+    except Exception:  # Unsupported, or a formula the evaluator trips on
+        return coord, "unsupported", cell.value, None
+    if cell.data_type != "f" and not accept_values:
+        status = "no formula"
+    else:
+        status = "correct" if same(got, want, tolerance) else "wrong"
+    return coord, status, got, want
+
+
+def mark_task(evaluator, task, tolerance=TOLERANCE, accept_values=False):
+    """[(coordinate, status, got, expected)] for each answer cell of task."""
+    return [
+        _mark_cell(
+            evaluator,
+            sheet,
+            row,
+            col,
+            lambda: evaluator.formula(formula, sheet),
+            tolerance,
+            accept_values,
+        )
+        for sheet, row, col, formula in answer_key.expected_formulas(evaluator, task)
+    ]
+
+
+def _expected(entry):
+    if "error" in entry:
+        return formula_eval.ExcelError(entry["error"])
+    if "expected" not in entry:
+        raise formula_eval.Unsupported(f"no expected result for {entry['cell']}")
+    return entry["expected"]
+
+
+def mark_entries(evaluator, entries, tolerance=None, accept_values=False):
+    """[(coordinate, status, got, expected)] for exported key entries; each
+    entry's own tolerance applies unless tolerance is given."""
+    marks = []
+    for entry in entries:
+        row, col = coordinate_to_tuple(entry["cell"])
+        marks.append(
+            _mark_cell(
+                evaluator,
+                entry["sheet"],
+                row,
+                col,
+                lambda entry=entry: _expected(entry),
+                entry["tolerance"] if tolerance is None else tolerance,
+                accept_values,
+            )
+        )
+    return marks
+
+
+def _plain(value):
+    if isinstance(value, formula_eval.ExcelError):
+        return value.code
+    return value
+
+
+def mark(evaluator, key, tolerance=None, accept_values=False):
+    """{task number: {"score": 0..1, "cells": [...]}} for the tasks in key.
+
+    key is a list of Tasks, or the entries of an exported key. tolerance
+    None means each entry's own (TOLERANCE for Tasks).
+    """
+    if key and isinstance(key[0], dict):
+        by_task = {}
+        for entry in key:
+            by_task.setdefault(entry["task"], []).append(entry)
+        work = [
+            (n, lambda e=e: mark_entries(evaluator, e, tolerance, accept_values))
+            for n, e in sorted(by_task.items())
+        ]
+    else:
+        tolerance = TOLERANCE if tolerance is None else tolerance
+        work = [
+            (t.task, lambda t=t: mark_task(evaluator, t, tolerance, accept_values))
+            for t in key
+        ]
+    tasks = {}
+    for number, marker in work:
+        try:
+            marks = marker()
+        except formula_eval.Unsupported as problem:
+            tasks[number] = {"score": 0, "error": str(problem)}
+            continue
+        except Exception as problem:  # only this task's key, not the file
+            tasks[number] = {
+                "score": 0,
+                "error": f"{type(problem).__name__}: {problem}",
+            }
+            continue
+        right = sum(status == "correct" for _, status, _, _ in marks)
+        tasks[number] = {
+            "score": round(right / len(marks), 4),
+            "cells": [
+                {"cell": c, "status": s, "got": _plain(g), "expected": _plain(w)}
+                for c, s, g, w in marks
+            ],
+        }
+    return tasks
+
+
+def grade(path, tolerance=None, accept_values=False, as_of=None, key=None):
+    """Mark one submission; returns a JSON-friendly dict.
+
+    key names an exported key file to mark against instead of the key in
+    the workbook. tolerance None means the key's own. as_of (a datetime)
+    pins TODAY()/NOW() over the workbook's own AsOf.
+    """
+    result = {"file": str(path), "student": Path(path).stem, "tasks": {}}
+    wb = None
+    try:
+        wb = load_workbook(path, read_only=True)
+        names = formula_eval.defined_names(wb)
+        key = answer_key.load(key) if key else answer_key.tasks(names)
+        if not key:
+            result["error"] = "no answer key in workbook"
+            return result
+        evaluator = formula_eval.Evaluator(
+            Sheets(wb), names, as_of, formula_eval.tables(wb)
+        )
+        result["tasks"] = mark(evaluator, key, tolerance, accept_values)
+    except Exception as problem:  # a corrupt or non-xlsx upload
+        result["error"] = f"{type(problem).__name__}: {problem}"
+        return result
+    finally:
+        if wb is not None:
+            wb.close()
+    result["score"] = round(sum(t["score"] for t in result["tasks"].values()), 4)
+    result["out_of"] = len(result["tasks"])
+    return result
+
+
+def key_file(path, keys):
+    """The exported key for submission path: keys itself if it is a file,
+    else <keys>/<submission name>.key.jsonl if that exists, else None."""
+    if not keys or Path(keys).is_file():
+        return keys
+    candidate = Path(keys) / f"{Path(path).stem}.key.jsonl"
+    return str(candidate) if candidate.exists() else None
+
+
+def _grade_job(job):
+    return grade(*job)
+
+
+def grade_all(
+    paths, jobs=None, tolerance=None, accept_values=False, as_of=None, keys=None
+):
+    """Mark every file in paths in parallel; results come back in path order.
+
+    keys is an exported key file, or a directory of <name>.key.jsonl files;
+    submissions without one are marked against their own key.
+    """
+    work = [(str(p), tolerance, accept_values, as_of, key_file(p, keys)) for p in paths]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(work) or 1))
+    if jobs == 1:
+        return [_grade_job(w) for w in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # batch the small jobs to keep inter-process overhead down
+        chunk = max(1, len(work) // (jobs * 8))
+        return list(pool.map(_grade_job, work, chunksize=chunk))
+
+
+# ---------- Reporting ----------
+def write_scores(results, path):
+    """One CSV row per student: total, out of, then a column per task."""
+    numbers = sorted({n for r in results for n in r["tasks"]})
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        out = csv.writer(fh)
+        out.writerow(
+            ["file", "student", "score", "out_of"]
+            + [f"task{n}" for n in numbers]
+            + ["error"]
+        )
+        for r in results:
+            tasks = r["tasks"]
+            out.writerow(
+                [r["file"], r["student"], r.get("score", ""), r.get("out_of", "")]
+                + [tasks[n]["score"] if n in tasks else "" for n in numbers]
+                + [r.get("error", "")]
+            )
+
+
+def find_submissions(inputs):
+    """The .xlsx files named by inputs (files, or directories searched recursively)."""
+    paths = []
+    for item in inputs:
+        item = Path(item)
+        if item.is_dir():
+            paths += sorted(item.rglob("*.xlsx"))
+        else:
+            paths.append(item)
+    # skip Excel's "~$Book.xlsx" lock files
+    return [p for p in paths if not p.name.startswith("~$")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade returned student workbooks.")
+    parser.add_argument("inputs", nargs="+", help="submission files or directories")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    parser.add_argument("--out", default="scores.csv", help="scores CSV")
+    parser.add_argument("--details", help="also write per-cell marks as JSON lines")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help=f"relative tolerance for numbers (default: the key's, {TOLERANCE})",
+    )
+    parser.add_argument(
+        "--keys",
+        help="exported answer key (.key.jsonl) or a directory of them, "
+        "one per workbook name",
+    )
+    parser.add_argument(
+        "--accept-values",
+        action="store_true",
+        help="give marks for typed-in results as well as formulas",
+    )
+    parser.add_argument(
+        "--as-of",
+        type=datetime.fromisoformat,
+        help="ISO date/time that TODAY() and NOW() return (default: the "
+        "workbook's AsOf cell, else the clock)",
+    )
+    args = parser.parse_args(argv)
+
+    paths = find_submissions(args.inputs)
+    if not paths:
+        parser.error("no .xlsx submissions found")
+    started = time.perf_counter()
+    results = grade_all(
+        paths, args.jobs, args.tolerance, args.accept_values, args.as_of, args.keys
+    )
+    wall = time.perf_counter() - started
+
+    write_scores(results, args.out)
+    if args.details:
+        with open(args.details, "w", encoding="utf-8") as fh:
+            for r in results:
+                fh.write(json.dumps(r, default=str) + "\n")
+    failed = [r for r in results if "error" in r]
+    for r in failed:
+        print(f"FAILED {r['file']}: {r['error']}")
+    print(
+        f"Graded {len(results) - len(failed)}/{len(results)} files in {wall:.2f}s -> {args.out}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,550 @@
+# guides.py
+# Renders each topic's PDF guide (Charts_Practice.pdf, lookup_practice.pdf,
+# ...) from the workbook its generator builds, so a guide always says what
+# the workbook says.
+#
+# A guide holds the Instructions, Tasks, Hints, Answers and Checklist sheets
+# of the topic's build(), in that order, one section per sheet. Each row of a
+# sheet becomes a paragraph (bold cells stay bold, formulas are set in
+# Courier); rows of three or more cells, like the expected-results tables,
+# are laid out in columns sized like the sheet's. The pages are written by
+# the small PDF writer below with the PDF standard fonts (Helvetica,
+# Helvetica-Bold, Courier), so nothing is embedded, installed or fetched.
+#
+# Rendering is incremental, like build_all.py: the hash of a guide's content
+# (and of this file) is recorded in <out>/.guide_manifest.json, and a guide
+# whose content hasn't changed isn't rendered again, so fixing one hint
+# re-renders only that topic's guide. Topics render in a pool of worker
+# processes.
+#
+# Usage:
+#   python guides.py                  # every topic's guide, one worker per CPU core
+#   python guides.py topic5 topic9    # only some topics
+#   python guides.py --out dist -j 4  # write the .pdf files into dist/
+#   python guides.py --force          # ignore the manifest, render everything
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from pathlib import Path
+
+from openpyxl.utils import get_column_letter
+
+import build_all
+
+HERE = Path(__file__).resolve().parent
+MANIFEST = ".guide_manifest.json"
+SHEETS = ("Instructions", "Tasks", "Hints", "Answers", "Checklist")
+
+# Build stamps (topic7's "Generated: ..." footers) change on every build;
+# they're left out so the guide doesn't.
+_STAMP = re.compile(r"^Generated: ")
+
+# ---------- Page metrics (points; A4) ----------
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 54
+BODY, LEADING = 10, 13.5
+TITLE_SIZE, HEADING_SIZE, SUBHEADING_SIZE, FOOTER_SIZE = 18, 14, 11.5, 8
+# regular, bold and monospace: PDF resource name and base font
+FONTS = {
+    "regular": ("F1", "Helvetica"),
+    "bold": ("F2", "Helvetica-Bold"),
+    "mono": ("F3", "Courier"),
+}
+
+# Advance widths (1/1000 em) of the printable ASCII characters, 32-126, from
+# the standard Helvetica and Helvetica-Bold metrics; Courier is 600 throughout.
+_WIDTHS = {
+    "regular": [
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333,
+        278, 278, 556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278,
+        584, 584, 584, 556, 1015, 667, 667, 722, 722, 667, 611, 778, 722, 278,
+        500, 667, 556, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944,
+        667, 667, 611, 278, 278, 278, 469, 556, 333, 556, 556, 500, 556, 556,
+        278, 556, 556, 222, 222, 500, 222, 833, 556, 556, 556, 556, 333, 500,
+        278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+    ],
+    "bold": [
+        278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333,
+        278, 278, 556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333,
+        584, 584, 584, 611, 975, 722, 722, 722, 722, 667, 611, 778, 722, 278,
+        556, 722, 611, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944,
+        667, 667, 611, 333, 278, 333, 584, 556, 333, 556, 611, 556, 611, 556,
+        333, 611, 611, 278, 278, 556, 278, 889, 611, 611, 611, 611, 389, 556,
+        333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+    ],
+}  # fmt: skip
+# the rest of WinAnsiEncoding that the sheets use; other letters ~ 556
+_WIDE = {"•": 350, "–": 556, "—": 1000, "‘": 222, "’": 222, "“": 333, "”": 333,
+         "…": 1000, "·": 278, "×": 584, "°": 400, "€": 556}  # fmt: skip
+# characters outside WinAnsiEncoding, spelled with ones inside it
+_SUBSTITUTES = str.maketrans(
+    {"→": "->", "←": "<-", "≥": ">=", "≤": "<=", "≠": "<>", "⌘": "Cmd",
+     "▼": "v", "✓": "v", "✔": "v", "☐": "[ ]", " ": " ", "\t": " "}
+)  # fmt: skip
+
+
+def _plain(text):
+    return text.translate(_SUBSTITUTES)
+
+
+def width(text, font, size):
+    """Width of text in points when set in font ("regular", "bold", "mono")."""
+    if font == "mono":
+        return len(text) * 0.6 * size
+    table = _WIDTHS[font]
+    units = 0
+    for ch in text:
+        code = ord(ch)
+        units += table[code - 32] if 32 <= code <= 126 else _WIDE.get(ch, 556)
+    return units * size / 1000
+
+
+# ---------- Content ----------
+def _text(value):
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime) and value.time() == datetime.min.time():
+        return value.date().isoformat()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat(sep=" ")
+    return _plain(str(value))
+
+
+def _column_widths(ws, columns):
+    """Each column's share of the page, in proportion to its sheet width."""
+    widths = []
+    for col in columns:
+        dim = ws.column_dimensions.get(get_column_letter(col))
+        widths.append(dim.width if dim is not None and dim.width else 9)
+    total = sum(widths)
+    return [w / total for w in widths]
+
+
+def _sheet_blocks(ws, title=None):
+    """The blocks of one sheet's section (see content())."""
+    rows = []
+    for row in ws.iter_rows():
+        cells = [
+            c
+            for c in row
+            if c.value not in (None, "") and not _STAMP.match(str(c.value))
+        ]
+        if cells:
+            rows.append(cells)
+    # columns used by table rows, and how wide each one is on the page
+    used = sorted({c.column for cells in rows if len(cells) > 2 for c in cells})
+    starts = {}
+    if used:
+        columns = range(used[0], used[-1] + 1)
+        x = 0.0
+        for col, share in zip(columns, _column_widths(ws, columns)):
+            starts[col] = round(x, 4)
+            x += share
+
+    blocks = []
+    last_row = None
+    for cells in rows:
+        row = cells[0].row
+        if last_row is not None and row > last_row + 1:
+            blocks.append(["gap"])
+        last_row = row
+        first = cells[0]
+        if len(cells) == 1:
+            text = _text(first.value)
+            if text == title or text.lower() == ws.title.lower():
+                continue  # already the guide's title or the section heading
+            if (first.font.sz or 11) >= 14:
+                blocks.append(["subheading", text])
+                continue
+        runs = [
+            [
+                "mono" if c.data_type == "f" else "bold" if c.font.b else "regular",
+                _text(c.value),
+            ]
+            for c in cells
+        ]
+        if len(cells) > 2:
+            blocks.append(
+                ["row"] + [[starts[c.column]] + run for c, run in zip(cells, runs)]
+            )
+        else:
+            blocks.append(["paragraph"] + runs)
+    return blocks
+
+
+def content(wb):
+    """(title, blocks) of wb's guide; the title is the Instructions sheet's
+    first cell. blocks are JSON-friendly lists:
+      ["heading", text]          a sheet's section heading
+      ["subheading", text]       a title cell inside a sheet
+      ["paragraph", run, ...]    one row; run = [font, text]
+      ["row", cell, ...]         a table row; cell = [x (share of page), font, text]
+      ["gap"]                    blank rows in the sheet
+    """
+    sheets = [wb[name] for name in SHEETS if name in wb.sheetnames]
+    title = next(
+        (
+            _text(c.value)
+            for row in (sheets[0].iter_rows() if sheets else ())
+            for c in row
+            if c.value not in (None, "")
+        ),
+        "Guide",
+    )
+    blocks = []
+    for ws in sheets:
+        blocks.append(["heading", ws.title])
+        blocks += _sheet_blocks(ws, title)
+    return title, blocks
+
+
+# ---------- Layout ----------
+class _Pages:
+    """Places lines of text top to bottom, starting new pages as needed.
+
+    Each page is a list of drawing operations:
+      ("text", font, size, x, y, text, grey)   grey is 0 (black) to 1
+      ("rule", x1, x2, y)
+    """
+
+    def __init__(self):
+        self.pages = []
+        self.y = 0
+        self.new_page()
+
+    def new_page(self):
+        self.pages.append([])
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def room(self, height):
+        if self.y - height < MARGIN + FOOTER_SIZE * 2:
+            self.new_page()
+
+    def text(self, font, size, x, text, grey=0):
+        self.pages[-1].append(("text", font, size, x, self.y, text, grey))
+
+    def rule(self, x1, x2):
+        self.pages[-1].append(("rule", x1, x2, self.y))
+
+
+def _words(runs):
+    """[[(font, word), ...] per hard line] for a paragraph's runs; the cells
+    of a row are kept apart by a wide space."""
+    lines = [[]]
+    for i, (font, text) in enumerate(runs):
+        if i:
+            lines[-1].append((font, " "))  # an em space between cells
+        for j, part in enumerate(text.split("\n")):
+            if j:
+                lines.append([])
+            lines[-1] += [(font, w) for w in part.split(" ") if w]
+    return lines
+
+
+def _split(word, font, size, room):
+    """word cut into pieces no wider than room (for overlong formulas/URLs)."""
+    pieces, piece = [], ""
+    for ch in word:
+        if piece and width(piece + ch, font, size) > room:
+            pieces.append(piece)
+            piece = ""
+        piece += ch
+    return pieces + [piece]
+
+
+def _wrap(runs, size, room):
+    """[[(font, x offset, text), ...] per line] for a paragraph."""
+    lines = []
+    for words in _words(runs):
+        line, x = [], 0.0
+        for font, word in words:
+            space = width(" ", font, size) if line and word != " " else 0
+            w = width(word, font, size) if word != " " else size
+            if line and x + space + w > room:
+                lines.append(line)
+                line, x, space = [], 0.0, 0
+                if word == " ":
+                    continue
+            if w > room:
+                for piece in _split(word, font, size, room)[:-1]:
+                    lines.append([(font, 0.0, piece)])
+                word = _split(word, font, size, room)[-1]
+                w = width(word, font, size)
+            if word != " ":
+                line.append((font, x + space, word))
+            x += space + w
+        lines.append(line)
+    return lines
+
+
+def _clip(text, font, size, room):
+    if width(text, font, size) <= room:
+        return text
+    while text and width(text + "…", font, size) > room:
+        text = text[:-1]
+    return text + "…"
+
+
+def layout(title, blocks):
+    """The pages of a guide, as lists of drawing operations (see _Pages)."""
+    out = _Pages()
+    left, room = MARGIN, PAGE_WIDTH - 2 * MARGIN
+    for line in _wrap([("bold", title)], TITLE_SIZE, room):
+        out.y -= TITLE_SIZE
+        for font, x, word in line:
+            out.text(font, TITLE_SIZE, left + x, word)
+        out.y -= TITLE_SIZE * 0.35
+    out.y -= LEADING
+    for kind, *parts in blocks:
+        if kind == "heading":
+            out.room(HEADING_SIZE * 2 + LEADING * 3)  # keep with what follows
+            out.y -= HEADING_SIZE * 1.6
+            out.text("bold", HEADING_SIZE, left, parts[0], grey=0.2)
+            out.y -= 5
+            out.rule(left, left + room)
+            out.y -= LEADING * 0.6
+        elif kind == "subheading":
+            out.room(SUBHEADING_SIZE + LEADING * 2)
+            out.y -= SUBHEADING_SIZE * 1.4
+            out.text("bold", SUBHEADING_SIZE, left, parts[0])
+            out.y -= 4
+        elif kind == "gap":
+            out.y -= LEADING * 0.5
+        elif kind == "row":
+            out.room(LEADING)
+            out.y -= LEADING
+            edges = [x for x, _, _ in parts] + [1.0]
+            for (x, font, text), end in zip(parts, edges[1:]):
+                cell = _clip(text, font, BODY, (end - x) * room - 6)
+                out.text(font, BODY, left + x * room, cell)
+        else:  # paragraph
+            for line in _wrap(parts, BODY, room):
+                out.room(LEADING)
+                out.y -= LEADING
+                for font, x, word in line:
+                    out.text(font, BODY, left + x, word)
+    return out.pages
+
+
+# ---------- PDF ----------
+def _pdf_string(text):
+    data = text.encode("cp1252", "replace")
+    return b"(" + re.sub(rb"([\\()])", rb"\\\1", data) + b")"
+
+
+def _page_stream(ops, footer):
+    out = []
+    for op in ops + footer:
+        if op[0] == "rule":
+            _, x1, x2, y = op
+            out.append(b"0.75 G 0.6 w %.2f %.2f m %.2f %.2f l S" % (x1, y, x2, y))
+            continue
+        _, font, size, x, y, text, grey = op
+        out.append(
+            b"BT %.2f g /%s %.1f Tf %.2f %.2f Td %s Tj ET"
+            % (grey, FONTS[font][0].encode(), size, x, y, _pdf_string(text))
+        )
+    return b"\n".join(out)
+
+
+def _join_words(page):
+    """Merge the words of each line set in one font into single strings
+    (fewer, shorter text operations)."""
+    merged = []
+    for op in page:
+        prev = merged[-1] if merged else None
+        if (
+            op[0] == "text"
+            and prev is not None
+            and prev[0] == "text"
+            and prev[1:3] == op[1:3]
+            and prev[4] == op[4]
+            and prev[6] == op[6]
+        ):
+            gap = op[3] - (prev[3] + width(prev[5], prev[1], prev[2]))
+            if abs(gap - width(" ", op[1], op[2])) < 0.01:
+                merged[-1] = prev[:5] + (prev[5] + " " + op[5], prev[6])
+                continue
+        merged.append(op)
+    return merged
+
+
+def render(title, blocks):
+    """The guide as PDF bytes (the same content always gives the same bytes)."""
+    pages = layout(title, blocks)
+    fonts = {
+        name: b"<< /Type /Font /Subtype /Type1 /BaseFont /%s "
+        b"/Encoding /WinAnsiEncoding >>" % base.encode()
+        for name, base in FONTS.values()
+    }
+    # 1 catalog, 2 page tree, 3 info, then fonts, then a page and its
+    # content stream for each page
+    first_font = 4
+    first_page = first_font + len(fonts)
+    font_refs = b" ".join(
+        b"/%s %d 0 R" % (name.encode(), first_font + i) for i, name in enumerate(fonts)
+    )
+    kids = b" ".join(b"%d 0 R" % (first_page + 2 * i) for i in range(len(pages)))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d /MediaBox [0 0 %d %d] "
+        b"/Resources << /Font << %s >> >> >>"
+        % (kids, len(pages), PAGE_WIDTH, PAGE_HEIGHT, font_refs),
+        b"<< /Title <FEFF%s> /Producer (guides.py) >>"
+        % title.encode("utf-16-be").hex().upper().encode(),
+    ]
+    objects += list(fonts.values())
+    for n, page in enumerate(pages, start=1):
+        label = f"{title}  ·  {n}/{len(pages)}"
+        x = (PAGE_WIDTH - width(label, "regular", FOOTER_SIZE)) / 2
+        footer = [("text", "regular", FOOTER_SIZE, x, MARGIN / 2, label, 0.45)]
+        stream = zlib.compress(_page_stream(_join_words(page), footer), 9)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /Contents %d 0 R >>"
+            % (first_page + 2 * n - 1)
+        )
+        objects.append(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+            % (len(stream), stream)
+        )
+
+    out = [b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"]
+    offsets = []
+    size = len(out[0])
+    for i, body in enumerate(objects, start=1):
+        offsets.append(size)
+        chunk = b"%d 0 obj\n%s\nendobj\n" % (i, body)
+        out.append(chunk)
+        size += len(chunk)
+    xref = [b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)]
+    xref += [b"%010d 00000 n \n" % offset for offset in offsets]
+    out += xref
+    out.append(
+        b"trailer\n<< /Size %d /Root 1 0 R /Info 3 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, size)
+    )
+    return b"".join(out)
+
+
+# ---------- Worker ----------
+def _renderer_hash():
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def content_hash(title, blocks):
+    """Hash of a guide's content and of the code that renders it."""
+    h = hashlib.sha256(_renderer_hash().encode())
+    h.update(json.dumps([title, blocks], ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+def guide_name(topic):
+    """The guide's file name: the topic's workbook name with .pdf."""
+    return Path(importlib.import_module(topic).FILENAME).with_suffix(".pdf").name
+
+
+def render_topic(name, out_dir, known=None):
+    """Render topic name's guide into out_dir unless its content hash equals
+    known and the file is there. Returns (file name, hash, seconds, rendered)."""
+    started = time.perf_counter()
+    title, blocks = content(importlib.import_module(name).build())
+    digest = content_hash(title, blocks)
+    target = Path(out_dir) / guide_name(name)
+    if digest == known and target.exists():
+        return target.name, digest, time.perf_counter() - started, False
+    pdf = render(title, blocks)
+    build_all.atomic_save(lambda output: output.write(pdf), target)
+    return target.name, digest, time.perf_counter() - started, True
+
+
+# ---------- Driver ----------
+def render_all(topics=None, out_dir=HERE, jobs=None, force=False):
+    """Render the given topics' guides (default: all) and return a
+    build_all.Result per topic, in topic order.
+
+    Every topic's workbook is built to read its content; guides whose
+    content hash matches the manifest are "cached" unless force is set.
+    """
+    topics = topics or build_all.find_topics()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = build_all.load_manifest(out_dir, MANIFEST)
+
+    results = {}
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(topics)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(
+                render_topic,
+                t,
+                str(out_dir),
+                None if force else manifest.get(t, {}).get("hash"),
+            ): t
+            for t in topics
+        }
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                output, digest, seconds, rendered = fut.result()
+            except Exception as exc:  # report and keep rendering the rest
+                results[name] = build_all.Result(name, None, 0.0, "failed", exc)
+                manifest.pop(name, None)
+                continue
+            status = "built" if rendered else "cached"
+            results[name] = build_all.Result(name, output, seconds, status, None)
+            manifest[name] = {"hash": digest, "output": output}
+    build_all.save_manifest(out_dir, manifest, MANIFEST)
+    return [results[t] for t in topics]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the topics' PDF guides.")
+    parser.add_argument("topics", nargs="*", help="topic names, e.g. topic5 topic9")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    parser.add_argument("--out", default=str(HERE), help="output directory")
+    parser.add_argument(
+        "--force", action="store_true", help="render even if the content is unchanged"
+    )
+    args = parser.parse_args(argv)
+
+    known = build_all.find_topics()
+    unknown = [t for t in args.topics if t not in known]
+    if unknown:
+        parser.error(f"unknown topic(s): {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    results = render_all(args.topics or known, args.out, args.jobs, args.force)
+    wall = time.perf_counter() - started
+
+    for r in results:
+        if r.status == "failed":
+            print(f"{r.name:<10} FAILED  {r.error!r}")
+        elif r.status == "cached":
+            print(f"{r.name:<10}  cached  {r.output}")
+        else:
+            print(f"{r.name:<10} {r.seconds:7.2f}s  {r.output}")
+    rendered = sum(r.status == "built" for r in results)
+    cached = sum(r.status == "cached" for r in results)
+    failed = sum(r.status == "failed" for r in results)
+    print(
+        f"Rendered {rendered}/{len(results)} guides in {wall:.2f}s wall; "
+        f"unchanged: {cached}, failed: {failed}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+# instrument.py
+# Optional timing spans for the topic generators.
+#
+# Each topic's build() is wrapped in a span and marks its stages (one per
+# sheet, plus charts, conditional formatting and the save) with stage(); a
+# stage lasts until the next one starts or the span ends. xlsx_io.save() adds
+# nested spans for serialising the workbook and rewriting the zip. Every span
+# records wall time, CPU time and the net change in allocated memory blocks
+# (plus traced bytes if tracemalloc is running).
+#
+# Off by default, and then span() / stage() / traced() do nothing but check
+# a flag. Turn it on with enable(), or for a whole run with
+#   XLSX_TRACE=build.json python topic5.py
+#   XLSX_TRACE=build.trace.json XLSX_TRACE_FORMAT=chrome python topic9.py
+# Chrome-format files open in chrome://tracing or https://ui.perfetto.dev.
+
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+FORMATS = ("json", "chrome")
+
+_active = False
+_t0 = 0.0
+_stack = []  # open spans, innermost last
+_roots = []  # top-level spans, in start order
+
+
+class _Span:
+    __slots__ = (
+        "name", "stage", "start", "cpu", "blocks", "traced", "end", "cpu_end",
+        "blocks_end", "traced_end", "children",
+    )  # fmt: skip
+
+    def __init__(self, name, stage=False):
+        self.name = name
+        self.stage = stage
+        self.children = []
+        self.end = None
+        self.traced = (
+            tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        )
+        self.blocks = sys.getallocatedblocks()
+        self.cpu = time.process_time()
+        self.start = time.perf_counter()
+
+    def close(self):
+        self.end = time.perf_counter()
+        self.cpu_end = time.process_time()
+        self.blocks_end = sys.getallocatedblocks()
+        if self.traced is not None and tracemalloc.is_tracing():
+            self.traced_end = tracemalloc.get_traced_memory()[0]
+        else:
+            self.traced_end = None
+
+    def as_dict(self):
+        out = {
+            "name": self.name,
+            "start_ms": round((self.start - _t0) * 1000, 3),
+            "wall_ms": round((self.end - self.start) * 1000, 3),
+            "cpu_ms": round((self.cpu_end - self.cpu) * 1000, 3),
+            "blocks": self.blocks_end - self.blocks,
+        }
+        if self.traced_end is not None:
+            out["traced_bytes"] = self.traced_end - self.traced
+        if self.children:
+            out["children"] = [c.as_dict() for c in self.children if c.end]
+        return out
+
+
+def _open(name, stage=False):
+    span = _Span(name, stage)
+    (_stack[-1].children if _stack else _roots).append(span)
+    _stack.append(span)
+    return span
+
+
+def _close(span):
+    # a span ends any stages still open inside it
+    while _stack:
+        top = _stack.pop()
+        top.close()
+        if top is span:
+            break
+
+
+class _Scope:
+    __slots__ = ("name", "span")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.span = _open(self.name)
+        return self.span
+
+    def __exit__(self, *exc):
+        _close(self.span)
+
+
+class _Off:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return None
+
+
+_OFF = _Off()
+
+
+# ---------- Marking code ----------
+def span(name):
+    """Context manager timing the block inside it as a child span."""
+    return _Scope(name) if _active else _OFF
+
+
+def stage(name):
+    """End the current stage (if any) of the open span and start a new one."""
+    if not _active or not _stack:
+        return
+    if _stack[-1].stage:
+        _close(_stack[-1])
+    _open(name, stage=True)
+
+
+def traced(name):
+    """Decorator running the whole function inside a span called name."""
+
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _active:
+                return fn(*args, **kwargs)
+            with _Scope(name):
+                return fn(*args, **kwargs)
+
+        return inner
+
+    return wrap
+
+
+# ---------- Switching on and reporting ----------
+def enable():
+    """Start recording (dropping anything recorded before)."""
+    global _active, _t0
+    _stack.clear()
+    _roots.clear()
+    _t0 = time.perf_counter()
+    _active = True
+
+
+def disable():
+    global _active
+    _active = False
+
+
+def enabled():
+    return _active
+
+
+def spans():
+    """The finished top-level spans as nested dicts."""
+    return [s.as_dict() for s in _roots if s.end]
+
+
+def _chrome_events(nodes, pid):
+    for node in nodes:
+        args = {k: node[k] for k in ("cpu_ms", "blocks", "traced_bytes") if k in node}
+        yield {
+            "name": node["name"],
+            "ph": "X",
+            "ts": round(node["start_ms"] * 1000),
+            "dur": round(node["wall_ms"] * 1000),
+            "pid": pid,
+            "tid": 0,
+            "args": args,
+        }
+        yield from _chrome_events(node.get("children", []), pid)
+
+
+def dump(path, fmt="json"):
+    """Write the recorded spans to path as a span tree or a Chrome trace."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown trace format {fmt!r} (use one of {FORMATS})")
+    tree = spans()
+    if fmt == "chrome":
+        report = {"traceEvents": list(_chrome_events(tree, os.getpid()))}
+    else:
+        report = {"spans": tree}
+    Path(path).write_text(json.dumps(report, indent=1), encoding="utf-8")
+
+
+if os.environ.get("XLSX_TRACE"):
+    enable()
+    atexit.register(
+        dump, os.environ["XLSX_TRACE"], os.environ.get("XLSX_TRACE_FORMAT", "json")
+    )
@@ -0,0 +1,374 @@
+# lint.py
+# Checks the references in a generated workbook against the workbook itself.
+#
+# Formula strings are put together by hand with f-strings, so a range that
+# doesn't match the data ($G$2:$G$21 over 40 records) or points at a renamed
+# sheet only shows up when a student sees wrong numbers. check(wb) parses
+# every cell formula, data-validation list, conditional-formatting formula,
+# chart series, table and defined name (with formula_eval's parser) and
+# reports:
+#   - references to sheets, tables, table columns or names that don't exist
+#   - references past the sheet's limits
+#   - ranges that stop short of the data in their columns, or run on past it
+#   - criteria/sum ranges of different sizes in COUNTIFS, SUMIFS, AVERAGEIFS
+#     (SUMIF and AVERAGEIF resize their sum range to the criteria range, as
+#     Excel and formula_eval do, so theirs may differ)
+# The data in a column is the unbroken run of filled cells from the range's
+# first row; a totals row under the data (one with a formula that totals the
+# cells above it) ends the run.
+#
+# Parsed formulas are cached by text, so linting many variants of the same
+# topic in one process costs little more than walking the cells. Set
+# XLSX_LINT=1 (or pass --lint to build_all.py / variants.py) and
+# xlsx_io.save() checks every workbook before writing it, failing the build
+# with LintError if anything is wrong.
+#
+# Usage:
+#   python lint.py                           # build every topic in memory, check it
+#   python lint.py topic9 topic10b --rows 60 # with 60 records (sample rows repeated)
+#   python lint.py dist/*.xlsx               # saved workbooks
+#   python -m doctest lint.py                # the same-size rules' own examples
+
+import argparse
+import functools
+import importlib
+import os
+import sys
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import cycle, islice
+from pathlib import Path
+
+from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+
+import formula_eval
+import xlsx_io
+
+Problem = namedtuple("Problem", "where ref message")
+
+_MAX_ROW, _MAX_COL = 1048576, 16384
+# functions whose range arguments must all be the same size: which
+# arguments those are (the criteria themselves may be single cells). Not
+# SUMIF or AVERAGEIF, whose sum range is resized (formula_eval._RESIZED).
+_SAME_SHAPE = {
+    "COUNTIFS": lambda args: args[0::2],
+    "SUMIFS": lambda args: args[:1] + args[1::2],
+    "AVERAGEIFS": lambda args: args[:1] + args[1::2],
+}
+
+
+class LintError(Exception):
+    """A workbook failed check(); problems holds what was found."""
+
+    def __init__(self, problems):
+        super().__init__(
+            f"{len(problems)} reference problem(s):\n"
+            + "\n".join(f"  {p.where}: {p.ref}: {p.message}" for p in problems)
+        )
+        self.problems = problems
+
+
+def enabled():
+    """True when xlsx_io.save() should lint workbooks (XLSX_LINT is set)."""
+    return os.environ.get("XLSX_LINT", "") not in ("", "0")
+
+
+@functools.lru_cache(maxsize=None)
+def _parse(formula):
+    try:
+        return formula_eval._Parser(formula).parse()
+    except Exception:  # not formula_eval's dialect; nothing to check
+        return None
+
+
+def _coord(row, col):
+    return f"{get_column_letter(col)}{row}"
+
+
+def _area_text(sheet, min_row, min_col, max_row, max_col):
+    cells = _coord(min_row, min_col)
+    if (min_row, min_col) != (max_row, max_col):
+        cells += ":" + _coord(max_row, max_col)
+    return f"{sheet}!{cells}"
+
+
+# ---------- Workbook facts ----------
+class _Book:
+    """What the checks need to know about a workbook, worked out once."""
+
+    def __init__(self, wb):
+        self.wb = wb
+        self.evaluator = formula_eval.Evaluator.for_workbook(wb)
+        self.titles = set(wb.sheetnames)
+        self._runs = {}  # (sheet, col) -> [(first row, last row), ...]
+        self.totals = set()  # (sheet, row) of rows holding column totals
+
+    def runs(self, sheet, col):
+        """The unbroken runs of filled cells in a column, top to bottom.
+
+        Rows still to be streamed in (xlsx_io.stream_rows) count as filled
+        in the columns the record above them fills.
+
+        >>> import io, topic5
+        >>> os.environ["XLSX_LINT"] = "1"
+        >>> try:
+        ...     _ = topic5.build(io.BytesIO(), rows=topic5.ROWS * 125, stream=True)
+        ... finally:
+        ...     del os.environ["XLSX_LINT"]
+        """
+        key = (sheet, col)
+        if key not in self._runs:
+            filled = {
+                r
+                for (r, c), cell in self.wb[sheet]._cells.items()
+                if c == col and cell.value not in (None, "")
+            }
+            streamed = xlsx_io.streamed(self.wb[sheet])
+            if streamed and streamed[0] - 1 in filled:
+                filled.update(range(streamed[0], streamed[1] + 1))
+            rows = sorted(r for r in filled if (sheet, r) not in self.totals)
+            runs = []
+            for r in rows:
+                if runs and runs[-1][1] == r - 1:
+                    runs[-1][1] = r
+                else:
+                    runs.append([r, r])
+            self._runs[key] = runs
+        return self._runs[key]
+
+    def data_end(self, sheet, row, col):
+        """Last row of the unbroken run of filled cells from row down
+        (row - 1 if the cell at row is empty)."""
+        runs = self.runs(sheet, col)
+        i = bisect_right(runs, [row, _MAX_ROW]) - 1
+        if i >= 0 and runs[i][0] <= row <= runs[i][1]:
+            return runs[i][1]
+        return row - 1
+
+
+# ---------- Reference walking ----------
+def _areas(book, node, sheet, row, problems, where, seen=frozenset()):
+    """The (sheet, min_row, min_col, max_row, max_col) areas node reads, as
+    written; missing sheets, names and tables are added to problems."""
+    kind = node[0]
+    if kind == "ref":
+        _, ref_sheet, min_row, min_col, max_row, max_col, _ = node
+        ref_sheet = ref_sheet or sheet
+        if ref_sheet not in book.titles:
+            problems.append(Problem(where, ref_sheet, "no such sheet"))
+            return []
+        return [(ref_sheet, min_row, min_col, max_row, max_col)]
+    if kind == "table":
+        try:
+            ref = book.evaluator.table_ref(node, sheet, row)
+        except formula_eval.ExcelError:
+            name = node[1] or "[this table]"
+            column = f"[{node[3]}]" if node[3] else ""
+            problems.append(Problem(where, name + column, "no such table or column"))
+            return []
+        return _areas(book, ref, sheet, row, problems, where, seen)
+    if kind == "name":
+        name = node[1].upper()
+        defined = book.evaluator.names.get(name)
+        if defined is None:
+            problems.append(Problem(where, node[1], "no such defined name"))
+            return []
+        tree = _parse(f"={defined}")
+        if tree is None or name in seen:
+            return []
+        return _areas(book, tree, sheet, row, problems, where, seen | {name})
+    children = ()
+    if kind == "call":
+        children = node[2]
+    elif kind == "op":
+        children = node[2:]
+    elif kind == "neg":
+        children = node[1:]
+    found = []
+    for child in children:
+        found += _areas(book, child, sheet, row, problems, where, seen)
+    return found
+
+
+def _check_area(book, area, where, here, problems):
+    """Bounds and data-size checks for one area read from cell here."""
+    sheet, min_row, min_col, max_row, max_col = area
+    text = _area_text(sheet, min_row or 1, min_col or 1, max_row or 1, max_col or 1)
+    if (max_row or 0) > _MAX_ROW or (max_col or 0) > _MAX_COL:
+        problems.append(Problem(where, text, "past the end of the sheet"))
+        return
+    if None in area or max_row == min_row:
+        return  # whole columns/rows and single rows follow the data anyway
+    ends = []
+    for col in range(min_col, max_col + 1):
+        end = book.data_end(sheet, min_row, col)
+        if here is not None and here[0] == sheet and here[2] == col:
+            if min_row <= here[1] <= end:  # don't count the formula's own cell
+                end = here[1] - 1
+        ends.append(end)
+    end = max(ends)
+    if end < min_row:
+        return  # an input area (nothing filled in yet)
+    if end > max_row:
+        problems.append(
+            Problem(where, text, f"stops at row {max_row}; data runs to row {end}")
+        )
+    elif end < max_row:
+        problems.append(
+            Problem(where, text, f"runs to row {max_row}; data ends at row {end}")
+        )
+
+
+def _check_shapes(node, sheet, problems, where):
+    """Criteria and sum ranges of one COUNTIFS/SUMIFS/... call must match.
+
+    >>> def shapes(formula):
+    ...     problems = []
+    ...     _check_shapes(_parse(formula), "Data", problems, "A1")
+    ...     return [p.message for p in problems]
+    >>> shapes("=SUMIFS(C2:C10,A2:A10,F2)")
+    []
+    >>> shapes("=AVERAGEIFS(C2:C10,A2:A10,F2,B2:B10,G2)")
+    []
+    >>> shapes("=SUMIFS(C2:C10,A2:A9,F2)")
+    ['ranges of different sizes']
+    >>> shapes("=COUNTIFS(A2:A10,F2,B2:B11,G2)")
+    ['ranges of different sizes']
+    >>> shapes('=SUMIF(A2:A10,">1",B2)')  # sums B2:B10
+    []
+    >>> shapes('=AVERAGEIF(A2:A10,">1",B2:B5)')
+    []
+    """
+    if node[0] == "call":
+        picked = _SAME_SHAPE.get(node[1])
+        if picked is not None:
+            shapes = {
+                (n[4] - n[2], n[5] - n[3])
+                for n in picked(node[2])
+                if n[0] == "ref" and None not in n[2:6]
+            }
+            if len(shapes) > 1:
+                problems.append(Problem(where, node[1], "ranges of different sizes"))
+        for child in node[2]:
+            _check_shapes(child, sheet, problems, where)
+    elif node[0] == "op":
+        _check_shapes(node[2], sheet, problems, where)
+        _check_shapes(node[3], sheet, problems, where)
+    elif node[0] == "neg":
+        _check_shapes(node[1], sheet, problems, where)
+
+
+def _formulas(wb):
+    """(where, sheet, (sheet, row, col) or None, formula) for every formula
+    the workbook holds: cells, validation lists, conditional formats, chart
+    series and defined names."""
+    for ws in wb.worksheets:
+        for (row, col), cell in ws._cells.items():
+            if formula_eval._is_formula(cell):
+                here = (ws.title, row, col)
+                yield f"{ws.title}!{cell.coordinate}", ws.title, here, cell.value
+        for dv in ws.data_validations.dataValidation:
+            for text in (dv.formula1, dv.formula2):
+                if text:
+                    where = f"{ws.title} validation on {dv.sqref}"
+                    yield where, ws.title, None, "=" + text.lstrip("=")
+        for cf in ws.conditional_formatting:
+            for rule in cf.rules:
+                for text in rule.formula or ():
+                    where = f"{ws.title} conditional format on {cf.sqref}"
+                    yield where, ws.title, None, "=" + text.lstrip("=")
+        for n, chart in enumerate(ws._charts, start=1):
+            for part in getattr(chart, "_charts", [chart]):
+                for s, series in enumerate(part.series, start=1):
+                    for label, source in (
+                        ("title", series.tx),
+                        ("categories", series.cat),
+                        ("values", series.val),
+                        ("x values", series.xVal),
+                        ("y values", series.yVal),
+                    ):
+                        for kind in ("strRef", "numRef"):
+                            ref = getattr(source, kind, None)
+                            if ref is not None and ref.f:
+                                where = f"{ws.title} chart {n} series {s} {label}"
+                                yield where, ws.title, None, "=" + ref.f
+    for name, defined in wb.defined_names.items():
+        if defined.attr_text:
+            yield f"defined name {name}", None, None, "=" + defined.attr_text
+
+
+def check(wb):
+    """Every reference problem in wb, as Problems (an empty list if none)."""
+    book = _Book(wb)
+    problems = []
+    work = []
+    for where, sheet, here, formula in _formulas(wb):
+        tree = _parse(formula)
+        if tree is None:
+            continue
+        row = here[1] if here else None
+        areas = _areas(book, tree, sheet, row, problems, where)
+        _check_shapes(tree, sheet, problems, where)
+        work.append((where, here, areas))
+        # a formula totalling the cells right above it makes a totals row
+        if here is not None:
+            s, r, c = here
+            for a in areas:
+                if a[0] == s and None not in a and a[2] <= c <= a[4]:
+                    if a[1] < a[3] == r - 1:
+                        book.totals.add((s, r))
+    for where, here, areas in work:
+        for area in dict.fromkeys(areas):
+            _check_area(book, area, where, here, problems)
+    for ws in wb.worksheets:
+        for name in ws.tables:
+            t = book.evaluator.tables[name.upper()]
+            area = (t.sheet, t.min_row, t.min_col, t.max_row - t.totals, t.max_col)
+            _check_area(book, area, f"{ws.title} table {name}", None, problems)
+    return problems
+
+
+def check_or_raise(wb):
+    """Raise LintError if check(wb) finds anything."""
+    problems = check(wb)
+    if problems:
+        raise LintError(problems)
+
+
+# ---------- Command line ----------
+def _topic_rows(topic, rows):
+    module = importlib.import_module(topic)
+    if rows is None:
+        return None
+    return [list(r) for r in islice(cycle(module.ROWS), rows)]
+
+
+def main(argv=None):
+    import build_all
+
+    parser = argparse.ArgumentParser(description="Check workbook references.")
+    parser.add_argument(
+        "inputs", nargs="*", help="topic names or .xlsx files (default: all topics)"
+    )
+    parser.add_argument(
+        "--rows", type=int, help="Data records per topic (sample rows repeated)"
+    )
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for item in args.inputs or build_all.find_topics():
+        if item.endswith(".xlsx") or Path(item).exists():
+            wb = load_workbook(item)
+        else:
+            module = importlib.import_module(item)
+            wb = module.build(rows=_topic_rows(item, args.rows))
+        problems = check(wb)
+        for p in problems:
+            print(f"{item}: {p.where}: {p.ref}: {p.message}")
+        failed += bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# shared_styles.py
+# One place to build the fonts, fills, borders and alignments the topic
+# generators use, plus bulk helpers to apply them.
+#
+# Every factory is interned: font(bold=True) returns the same Font object on
+# every call, in every generator. A Style bundles those parts into a handle;
+# apply()/apply_row()/apply_column() resolve a handle to the workbook's style
+# ids once and then stamp the ids onto each cell, instead of assigning (and
+# re-hashing) Font/PatternFill/Border objects cell by cell.
+#
+# Usage:
+#   from shared_styles import Style, font, fill, border, apply, apply_row
+#   HEADER = Style(font=font(bold=True), fill=fill("F2F2F2"), border=border())
+#   apply_row(ws, 1, HEADER, max_col=4)
+#   apply(ws, "A2:D41", Style(border=border(color="CCCCCC")))
+
+import weakref
+from collections import namedtuple
+from functools import lru_cache
+
+from openpyxl.cell import Cell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.utils import range_boundaries
+
+
+# ---------- Interned parts ----------
+@lru_cache(maxsize=None)
+def font(bold=None, size=None, color=None, italic=None, underline=None):
+    return Font(b=bold, sz=size, color=color, i=italic, u=underline)
+
+
+@lru_cache(maxsize=None)
+def fill(color):
+    """Solid fill, e.g. fill("F2F2F2")."""
+    return PatternFill("solid", fgColor=color)
+
+
+@lru_cache(maxsize=None)
+def side(style="thin", color=None):
+    return Side(style=style, color=color)
+
+
+@lru_cache(maxsize=None)
+def border(style="thin", color=None):
+    """The same side on all four edges (a plain box)."""
+    s = side(style, color)
+    return Border(left=s, right=s, top=s, bottom=s)
+
+
+@lru_cache(maxsize=None)
+def align(horizontal=None, vertical=None, wrap=None):
+    return Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap)
+
+
+# ---------- Style handles ----------
+# Parts left as None are not touched when the style is applied, so a border
+# applied over a header keeps the header's font and fill.
+Style = namedtuple(
+    "Style", "font fill border alignment number_format", defaults=(None,) * 5
+)
+
+# workbook -> {Style: [(StyleArray field, id), ...]}
+_IDS = weakref.WeakKeyDictionary()
+
+
+def _resolve(ws, style):
+    wb = ws.parent
+    cache = _IDS.setdefault(wb, {})
+    ids = cache.get(style)
+    if ids is None:
+        # Let openpyxl register each part once (via a detached scratch cell)
+        # and remember the ids it hands back.
+        scratch = Cell(ws)
+        ids = []
+        for part, field in (
+            ("font", "fontId"),
+            ("fill", "fillId"),
+            ("border", "borderId"),
+            ("alignment", "alignmentId"),
+            ("number_format", "numFmtId"),
+        ):
+            value = getattr(style, part)
+            if value is not None:
+                setattr(scratch, part, value)
+                ids.append((field, getattr(scratch._style, field)))
+        cache[style] = ids
+    return ids
+
+
+def apply_cells(ws, cells, style):
+    """Apply style to an iterable of cells on ws."""
+    ids = _resolve(ws, style)
+    for cell in cells:
+        arr = cell._style
+        if arr is None:
+            arr = cell._style = StyleArray()
+        for field, value in ids:
+            setattr(arr, field, value)
+
+
+def apply(ws, ref, style):
+    """Apply style to every cell in a range such as "A1:D10" (or one cell)."""
+    min_col, min_row, max_col, max_row = range_boundaries(ref)
+    for row in ws.iter_rows(min_row, max_row or min_row, min_col, max_col or min_col):
+        apply_cells(ws, row, style)
+
+
+def apply_row(ws, row, style, min_col=1, max_col=None):
+    """Apply style across one row (default: up to the sheet's last column)."""
+    max_col = max_col or ws.max_column
+    apply_cells(ws, next(ws.iter_rows(row, row, min_col, max_col)), style)
+
+
+def apply_column(ws, col, style, min_row=1, max_row=None):
+    """Apply style down one column (index or letter), to the last row by default."""
+    if isinstance(col, str):
+        col = range_boundaries(f"{col}1")[0]
+    max_row = max_row or ws.max_row
+    cells = (row[0] for row in ws.iter_rows(min_row, max_row, col, col))
+    apply_cells(ws, cells, style)
@@ -0,0 +1,164 @@
+# templates.py
+# Template-clone fast path for per-student variants.
+#
+# In topics that define DATA_FIRST_ROW (topic5, topic11) a student's records
+# only ever change the Data sheet's record cells; every other sheet, the
+# styles, tables, charts and the formulas in Answers depend on nothing but how
+# many records there are. So a Template builds the workbook once per record
+# count and keeps each zip member exactly as saved, still compressed. Saving a
+# variant rewrites the record cells of the Data sheet, re-evaluates the
+# formulas to refresh the cached results of the sheets that hold them, and
+# splices the cached members around those, skipping openpyxl's writer.
+#
+# Usage:
+#   import templates
+#   tmpl = templates.template_for("topic5", rows)   # cached per (topic, len(rows))
+#   tmpl.save("Alex.xlsx", rows)
+#   tmpl.save(fh, other_rows)                       # any binary stream
+
+import importlib
+import io
+import os
+import struct
+import zipfile
+import zlib
+
+import xlsx_io
+
+# Local file header, central directory entry and end-of-directory record
+_LOCAL = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL = struct.Struct("<4s4B4HL2L5H2L")
+_END = struct.Struct("<4s4H2LH")
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+
+def supports(topic):
+    """True if topic's records can be patched into a template."""
+    return hasattr(importlib.import_module(topic), "DATA_FIRST_ROW")
+
+
+class Template:
+    """A topic's saved workbook, ready to take a new set of Data records."""
+
+    def __init__(self, topic, rows, sheet="Data"):
+        module = importlib.import_module(topic)
+        self.topic = topic
+        self.first_row = module.DATA_FIRST_ROW
+        self.count = len(rows)
+
+        buf = io.BytesIO()
+        self.wb = module.build(rows=rows)
+        xlsx_io.save(self.wb, buf)
+        data = buf.getvalue()
+        self.data_title = sheet
+        self.sheet = self.wb[sheet].path[1:]
+        # sheets whose xml is patched per variant: the Data sheet and any
+        # sheet with formulas (their cached results change)
+        formulas = xlsx_io.evaluate(self.wb)
+        patched = {
+            ws.path[1:]: ws.title
+            for ws in self.wb.worksheets
+            if ws.title == sheet or ws.title in formulas
+        }
+
+        # [(ZipInfo, compressed bytes)] in archive order; patched sheets are
+        # kept as uncompressed xml in self.patched instead
+        self.members = []
+        self.patched = {}
+        with zipfile.ZipFile(buf) as zf:
+            for info in zf.infolist():
+                if info.filename in patched:
+                    title = patched[info.filename]
+                    self.patched[info.filename] = (title, zf.read(info))
+                    self.members.append((info, None))
+                    continue
+                # skip the local header; the bytes after it go out unchanged
+                name_len, extra_len = struct.unpack(
+                    "<2H", data[info.header_offset + 26 : info.header_offset + 30]
+                )
+                start = info.header_offset + 30 + name_len + extra_len
+                self.members.append((info, data[start : start + info.compress_size]))
+
+    def patch(self, rows):
+        """{member: (xml, compressed xml)} of the sheets that change for rows."""
+        if len(rows) != self.count:
+            raise ValueError(
+                f"{self.topic} template holds {self.count} records, got {len(rows)}"
+            )
+        ws = self.wb[self.data_title]
+        for r, record in enumerate(rows, start=self.first_row):
+            for c, value in enumerate(record, start=1):
+                ws.cell(r, c).value = value
+        values = xlsx_io.evaluate(self.wb)
+
+        out = {}
+        for name, (title, xml) in self.patched.items():
+            if name == self.sheet:
+                buf = io.BytesIO()
+                last_row = self.first_row + self.count - 1
+                xlsx_io.write_rows(buf, xml, rows, self.first_row, last_row)
+                xml = buf.getvalue()
+            xml = xlsx_io.cache_values(xml, values.get(title, {}))
+            packer = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            out[name] = xml, packer.compress(xml) + packer.flush()
+        return out
+
+    def save(self, output, rows):
+        """Write the workbook for rows to a path or binary stream."""
+        if isinstance(output, (str, os.PathLike)):
+            with open(output, "wb") as fh:
+                self.save(fh, rows)
+            return
+        patches = self.patch(rows)
+        central = []
+        offset = 0
+        for info, payload in self.members:
+            crc, size = info.CRC, info.file_size
+            if payload is None:
+                xml, payload = patches[info.filename]
+                crc, size = zlib.crc32(xml), len(xml)
+            name = info.filename.encode("utf-8")
+            dos_time = (info.date_time[3] << 11) | (info.date_time[4] << 5)
+            dos_time |= info.date_time[5] // 2
+            dos_date = (info.date_time[0] - 1980) << 9
+            dos_date |= (info.date_time[1] << 5) | info.date_time[2]
+            # sizes are always in the local header (no data descriptor)
+            flags = info.flag_bits & ~0x08
+            header = _LOCAL.pack(
+                b"PK\x03\x04", 20, 0, flags, info.compress_type,
+                dos_time, dos_date, crc, len(payload), size, len(name), 0,
+            )  # fmt: skip
+            output.write(header + name)
+            output.write(payload)
+            central.append(
+                _CENTRAL.pack(
+                    b"PK\x01\x02", 20, info.create_system, 20, 0, flags,
+                    info.compress_type, dos_time, dos_date, crc, len(payload),
+                    size, len(name), 0, 0, 0, 0, info.external_attr, offset,
+                )  # fmt: skip
+                + name
+            )
+            offset += len(header) + len(name) + len(payload)
+        directory = b"".join(central)
+        if offset + len(directory) > _ZIP32_LIMIT:
+            raise ValueError("workbook too large for a template; use stream=True")
+        output.write(directory)
+        count = len(central)
+        output.write(
+            _END.pack(b"PK\x05\x06", 0, 0, count, count, len(directory), offset, 0)
+        )
+
+
+# (topic, record count, SOURCE_DATE_EPOCH) -> Template, per process
+_TEMPLATES = {}
+
+
+def template_for(topic, rows):
+    """The cached Template for topic with len(rows) records.
+
+    The first call for a record count builds the template from rows.
+    """
+    key = (topic, len(rows), xlsx_io.source_date_epoch())
+    if key not in _TEMPLATES:
+        _TEMPLATES[key] = Template(topic, rows)
+    return _TEMPLATES[key]
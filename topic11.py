@@ -1,25 +1,39 @@
 # create_simple_data_analysis_workbook.py
 # N Level Excel Starter: Simple Data Analysis (Percentages, Conditional Formatting, Charts)
 # Creates sheets: Instructions, Data, Tasks, Hints, Answers, Checklist, Lookup
+#
+# The Data formulas come in two styles. "classic" (the default, as the
+# syllabus teaches it) fills plain references down every row, each Share cell
+# summing the whole 2025 column again. "table" writes them with the table's
+# structured references ([@[2025 Sales]]) and divides by the one 2025 total
+# under the table, so each row costs the same however many products there are.
+#
+# Usage:
+#   python topic11.py                   # classic formulas
+#   python topic11.py --formulas table  # structured references
+
+import argparse
 
 from openpyxl import Workbook
-from openpyxl.styles import (
-    Font,
-    Alignment,
-    PatternFill,
-    Border,
-    Side,
-    NamedStyle,
-    numbers,
-)
+from openpyxl.styles import PatternFill, numbers
 from openpyxl.worksheet.table import Table, TableStyleInfo
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.chart import PieChart, BarChart, Reference
 from openpyxl.formatting.rule import CellIsRule
 
+import answer_key
+import instrument
+import xlsx_io
+from shared_styles import Style, align, apply, apply_row, border, fill, font
+
 # ---------- Helpers ----------
-thin = Side(style="thin", color="CCCCCC")
-border_all = Border(left=thin, right=thin, top=thin, bottom=thin)
+border_all = border(color="CCCCCC")
+HEADER = Style(
+    font=font(bold=True),
+    fill=fill("F2F2F2"),
+    border=border_all,
+    alignment=align(horizontal="center"),
+)
 
 
 def set_col_widths(ws, widths):
@@ -29,86 +43,20 @@ def set_col_widths(ws, widths):
 
 def title(ws, text, cell="A1"):
     ws[cell] = text
-    ws[cell].font = Font(size=16, bold=True)
+    ws[cell].font = font(size=16, bold=True)
     ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=8)
 
 
-# ---------- Workbook & Sheets ----------
-wb = Workbook()
-ws_instr = wb.active
-ws_instr.title = "Instructions"
-ws_data = wb.create_sheet("Data")
-ws_tasks = wb.create_sheet("Tasks")
-ws_hints = wb.create_sheet("Hints")
-ws_answers = wb.create_sheet("Answers")
-ws_check = wb.create_sheet("Checklist")
-ws_lookup = wb.create_sheet("Lookup")
-
-# ---------- Instructions ----------
-title(ws_instr, "Simple Data Analysis – Starter Workbook")
-ws_instr["A3"] = "Objective:"
-ws_instr["A3"].font = Font(bold=True)
-ws_instr["B3"] = (
-    "Calculate % change, share of total, and highlight trends with conditional formatting."
-)
-
-ws_instr["A5"] = "Skills covered:"
-ws_instr["A5"].font = Font(bold=True)
-ws_instr["B5"] = (
-    "Formulas, absolute references ($), percentages, conditional formatting, chart creation, sorting/filtering."
-)
+FILENAME = "Simple_Data_Analysis_Starter.xlsx"
 
-ws_instr["A7"] = "Keyboard shortcuts (Windows / Mac):"
-ws_instr["A7"].font = Font(bold=True)
-ws_instr["B7"] = (
-    "Copy: Ctrl+C / Cmd+C | Paste: Ctrl+V / Cmd+V | Fill down: Ctrl+D / Cmd+D"
-)
-ws_instr["B8"] = (
-    "Format cells: Ctrl+1 / Cmd+1 | Create chart: Alt+N then pick chart / Cmd+Option+R (Excel menu)"
-)
+FORMULA_STYLES = ("classic", "table")
 
-ws_instr["A10"] = "How to use:"
-ws_instr["A10"].font = Font(bold=True)
-ws_instr["B11"] = "1) Go to the Data sheet. Review sample products."
-ws_instr["B12"] = "2) Enter or edit 2024 and 2025 sales."
-ws_instr["B13"] = "3) Check formulas auto-filled in % Change and Share of Total."
-ws_instr["B14"] = (
-    "4) See conditional formatting highlight increases (green) and decreases (red)."
-)
-ws_instr["B15"] = "5) Explore the Tasks sheet, use Hints if stuck, then check Answers."
-ws_instr["B16"] = "6) Use Checklist to self-assess."
-ws_instr["B17"] = (
-    "7) View the chart (Data sheet). Try changing the data and see it update."
-)
+# Data sheet row of the first product. Nothing but the product count depends
+# on the products themselves, so templates.py can reuse every other part.
+DATA_FIRST_ROW = 3
 
-set_col_widths(ws_instr, {"A": 22, "B": 100})
-for r in range(3, 18):
-    ws_instr[f"A{r}"].alignment = Alignment(vertical="top")
-    ws_instr[f"B{r}"].alignment = Alignment(wrap_text=True, vertical="top")
-
-# ---------- Lookup (for validation lists, references) ----------
-title(ws_lookup, "Lookup & Reference")
-ws_lookup["A3"] = "Categories (for Data validation):"
-ws_lookup["A3"].font = Font(bold=True)
-categories = ["Beverages", "Snacks", "Household", "Personal Care", "Electronics"]
-for i, cat in enumerate(categories, start=4):
-    ws_lookup[f"A{i}"] = cat
-set_col_widths(ws_lookup, {"A": 28, "B": 60})
-
-# ---------- Data (sample table + formulas + CF + chart) ----------
-title(ws_data, "Sales Data (2024 vs 2025)")
-headers = [
-    "Product",
-    "Category",
-    "2024 Sales",
-    "2025 Sales",
-    "% Change",
-    "Share of 2025 Total",
-    "Status",
-]
-ws_data.append(headers)
-
-sample_rows = [
+# Sales data: Product, Category, 2024 Sales, 2025 Sales
+ROWS = [
     ["Cola 330ml", "Beverages", 1200, 1500],
     ["Orange Juice 1L", "Beverages", 980, 920],
     ["Potato Chips", "Snacks", 1500, 1800],
@@ -119,186 +67,355 @@ sample_rows = [
     ["USB Charger", "Electronics", 1000, 900],
 ]
 
-for r in sample_rows:
-    ws_data.append(r + ["", "", ""])  # placeholders for % Change, Share, Status
-
-# Headers style
-for c in range(1, len(headers) + 1):
-    cell = ws_data.cell(row=2, column=c)
-    cell.font = Font(bold=True)
-    cell.fill = PatternFill("solid", fgColor="F2F2F2")
-    cell.border = border_all
-    cell.alignment = Alignment(horizontal="center")
-
-# Freeze header row
-ws_data.freeze_panes = "A3"
-
-# Column widths
-set_col_widths(ws_data, {"A": 22, "B": 18, "C": 14, "D": 14, "E": 12, "F": 20, "G": 12})
-
-# Data range rows (after title row): headers at row 2, data rows 3..10
-first_row = 3
-last_row = first_row + len(sample_rows) - 1  # 10
-total_row = last_row + 1  # 11
-
-# Formulas
-for r in range(first_row, last_row + 1):
-    # % Change = IFERROR((New-Old)/Old,0)
-    ws_data[f"E{r}"] = f"=IFERROR((D{r}-C{r})/C{r},0)"
-    # Share of 2025 Total = IFERROR(D / SUM($D$first:$D$last),0)
-    ws_data[f"F{r}"] = f"=IFERROR(D{r}/SUM($D${first_row}:$D${last_row}),0)"
-    # Status text
-    ws_data[f"G{r}"] = f'=IF(E{r}>0,"Increase",IF(E{r}<0,"Decrease","No change"))'
-
-# Totals row
-ws_data[f"A{total_row}"] = "Total"
-ws_data[f"C{total_row}"] = f"=SUM(C{first_row}:C{last_row})"
-ws_data[f"D{total_row}"] = f"=SUM(D{first_row}:D{last_row})"
-ws_data[f"E{total_row}"] = ""  # leave blank
-ws_data[f"F{total_row}"] = "1"  # total share = 100%
-ws_data[f"G{total_row}"] = ""
-
-# Number formats
-for r in range(first_row, total_row + 1):
-    ws_data[f"C{r}"].number_format = numbers.FORMAT_NUMBER_COMMA_SEPARATED1
-    ws_data[f"D{r}"].number_format = numbers.FORMAT_NUMBER_COMMA_SEPARATED1
-    ws_data[f"E{r}"].number_format = "0%"
-    ws_data[f"F{r}"].number_format = "0%"
-
-# Borders for data area
-for r in range(2, total_row + 1):
-    for c in range(1, len(headers) + 1):
-        ws_data.cell(row=r, column=c).border = border_all
-
-# Table
-table_ref = f"A2:G{total_row}"
-table = Table(displayName="tblSales", ref=table_ref)
-style = TableStyleInfo(
-    name="TableStyleMedium9", showRowStripes=True, showColumnStripes=False
-)
-table.tableStyleInfo = style
-ws_data.add_table(table)
-
-# Data Validation for Category (B column)
-dv = DataValidation(
-    type="list", formula1=f"=Lookup!$A$4:$A${3 + len(categories)}", allow_blank=False
-)
-dv.error = "Please select a category from the list."
-dv.promptTitle = "Category"
-dv.prompt = "Choose a category from Lookup sheet."
-ws_data.add_data_validation(dv)
-dv.add(f"B{first_row}:B{last_row}")
-
-# Conditional Formatting on % Change (E)
-ws_data.conditional_formatting.add(
-    f"E{first_row}:E{last_row}",
-    CellIsRule(
-        operator="greaterThan",
-        formula=["0"],
-        fill=PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
-    ),
-)
-ws_data.conditional_formatting.add(
-    f"E{first_row}:E{last_row}",
-    CellIsRule(
-        operator="lessThan",
-        formula=["0"],
-        fill=PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"),
-    ),
-)
 
-# Chart: Pie of 2025 Sales by Product
-pie = PieChart()
-labels = Reference(ws_data, min_col=1, min_row=first_row, max_row=last_row)  # Product
-data = Reference(
-    ws_data, min_col=4, min_row=2, max_row=last_row
-)  # 2025 Sales incl header
-pie.add_data(data, titles_from_data=True)
-pie.set_categories(labels)
-pie.title = "2025 Sales Share"
-pie.height = 12
-pie.width = 18
-ws_data.add_chart(pie, "I3")
-
-# Chart: Column for 2024 vs 2025 by Product
-bar = BarChart()
-bar.title = "Sales by Product (2024 vs 2025)"
-bar.height = 12
-bar.width = 22
-bar_data = Reference(
-    ws_data, min_col=3, max_col=4, min_row=2, max_row=last_row
-)  # 2024 & 2025
-bar.add_data(bar_data, titles_from_data=True)
-bar.set_categories(Reference(ws_data, min_col=1, min_row=first_row, max_row=last_row))
-ws_data.add_chart(bar, "I20")
-
-# ---------- Tasks ----------
-title(ws_tasks, "Your Tasks")
-tasks = [
-    "Starter: Enter two new products at the bottom with 2024 & 2025 sales. Confirm % Change and Share fill automatically.",
-    "Core: Apply a filter to show only 'Snacks'. Which product improved the most?",
-    "Core: Sort by % Change (largest to smallest). Which 3 products increased the most?",
-    "Stretch: Add a 'Target 2025 Sales' column (e.g., D * 1.10) and a 'Met Target?' column using IF.",
-    "Stretch: Create a new pie chart of 2024 sales share.",
-]
-for i, t in enumerate(tasks, start=3):
-    ws_tasks[f"A{i}"] = f"{i - 2}."
-    ws_tasks[f"B{i}"] = t
-set_col_widths(ws_tasks, {"A": 6, "B": 100})
-
-# ---------- Hints ----------
-title(ws_hints, "Hints")
-hints = [
-    "Percentage change = (New – Old) / Old. In this sheet: =(D - C) / C",
-    "Share of total uses absolute refs: D / SUM($D$start:$D$end)",
-    'IF example: =IF(E2>0,"Increase",IF(E2<0,"Decrease","No change"))',
-    "To copy formulas, use the table fill handle or Ctrl+D (Cmd+D on Mac).",
-    "Filter: Data tab → Filter (or click the ▼ on the table headers).",
-    "Sort: Home → Sort & Filter → Sort Largest to Smallest on % Change.",
-]
-for i, h in enumerate(hints, start=3):
-    ws_hints[f"A{i}"] = f"Hint {i - 2}"
-    ws_hints[f"B{i}"] = h
-set_col_widths(ws_hints, {"A": 12, "B": 100})
-
-# ---------- Answers ----------
-title(ws_answers, "Answers / Checks")
-ws_answers["A3"] = "Key formulas used (check your sheet matches):"
-ws_answers["A3"].font = Font(bold=True)
-ws_answers["A5"] = "% Change (E row):"
-ws_answers["B5"] = "=IFERROR((D2-C2)/C2,0)  → format as %"
-ws_answers["A6"] = "Share of 2025 Total (F row):"
-ws_answers["B6"] = f"=IFERROR(D2/SUM($D${first_row}:$D${last_row}),0)  → format as %"
-ws_answers["A8"] = "Status (G row):"
-ws_answers["B8"] = '=IF(E2>0,"Increase",IF(E2<0,"Decrease","No change"))'
-ws_answers["A10"] = "Totals row:"
-ws_answers["B10"] = (
-    f"2024 Total =SUM(Data!C{first_row}:C{last_row}) | 2025 Total =SUM(Data!D{first_row}:D{last_row})"
-)
-ws_answers["A12"] = "Checks:"
-ws_answers["B12"] = "Share column should sum to 100% (Total row shows 1.00)."
-set_col_widths(ws_answers, {"A": 24, "B": 100})
-
-# ---------- Checklist ----------
-title(ws_check, "Checklist")
-check_items = [
-    "[ ] Entered/edited sales data for all rows",
-    "[ ] % Change shows positives and negatives correctly",
-    "[ ] Share of Total sums to 100%",
-    "[ ] Conditional formatting highlights increases (green) and decreases (red)",
-    "[ ] Applied sort/filter correctly",
-    "[ ] Created and read the chart(s)",
-    "[ ] Used absolute references ($) where needed",
-]
-for i, item in enumerate(check_items, start=3):
-    ws_check[f"A{i}"] = item
-set_col_widths(ws_check, {"A": 80})
-
-# ---------- Finish ----------
-# Make sheets user-friendly starting positions
-for ws in [ws_data, ws_tasks, ws_hints, ws_answers, ws_check, ws_lookup]:
-    ws.sheet_view.zoomScale = 120
-
-# Save
-wb.save("Simple_Data_Analysis_Starter.xlsx")
-print("Workbook created: Simple_Data_Analysis_Starter.xlsx")
+# ---------- Workbook & Sheets ----------
+@instrument.traced("topic11")
+def build(output=None, rows=None, formulas="classic"):
+    """Build the Simple Data Analysis workbook and return it.
+
+    rows replaces the sample products (same column order as ROWS). formulas
+    is "classic" or "table" (structured references; see above). If output is
+    a path or a binary stream, the workbook is also saved there.
+    """
+    if formulas not in FORMULA_STYLES:
+        raise ValueError(f"formulas must be one of {FORMULA_STYLES}, not {formulas!r}")
+    wb = Workbook()
+    ws_instr = wb.active
+    ws_instr.title = "Instructions"
+    ws_data = wb.create_sheet("Data")
+    ws_tasks = wb.create_sheet("Tasks")
+    ws_hints = wb.create_sheet("Hints")
+    ws_answers = wb.create_sheet("Answers")
+    ws_check = wb.create_sheet("Checklist")
+    ws_lookup = wb.create_sheet("Lookup")
+
+    # ---------- Instructions ----------
+    instrument.stage("Instructions")
+    title(ws_instr, "Simple Data Analysis – Starter Workbook")
+    ws_instr["A3"] = "Objective:"
+    ws_instr["A3"].font = font(bold=True)
+    ws_instr["B3"] = (
+        "Calculate % change, share of total, and highlight trends with conditional formatting."
+    )
+
+    ws_instr["A5"] = "Skills covered:"
+    ws_instr["A5"].font = font(bold=True)
+    ws_instr["B5"] = (
+        "Formulas, absolute references ($), percentages, conditional formatting, chart creation, sorting/filtering."
+    )
+
+    ws_instr["A7"] = "Keyboard shortcuts (Windows / Mac):"
+    ws_instr["A7"].font = font(bold=True)
+    ws_instr["B7"] = (
+        "Copy: Ctrl+C / Cmd+C | Paste: Ctrl+V / Cmd+V | Fill down: Ctrl+D / Cmd+D"
+    )
+    ws_instr["B8"] = (
+        "Format cells: Ctrl+1 / Cmd+1 | Create chart: Alt+N then pick chart / Cmd+Option+R (Excel menu)"
+    )
+
+    ws_instr["A10"] = "How to use:"
+    ws_instr["A10"].font = font(bold=True)
+    ws_instr["B11"] = "1) Go to the Data sheet. Review sample products."
+    ws_instr["B12"] = "2) Enter or edit 2024 and 2025 sales."
+    ws_instr["B13"] = "3) Check formulas auto-filled in % Change and Share of Total."
+    ws_instr["B14"] = (
+        "4) See conditional formatting highlight increases (green) and decreases (red)."
+    )
+    ws_instr["B15"] = (
+        "5) Explore the Tasks sheet, use Hints if stuck, then check Answers."
+    )
+    ws_instr["B16"] = "6) Use Checklist to self-assess."
+    ws_instr["B17"] = (
+        "7) View the chart (Data sheet). Try changing the data and see it update."
+    )
+
+    set_col_widths(ws_instr, {"A": 22, "B": 100})
+    apply(ws_instr, "A3:A17", Style(alignment=align(vertical="top")))
+    apply(ws_instr, "B3:B17", Style(alignment=align(vertical="top", wrap=True)))
+
+    # ---------- Lookup (for validation lists, references) ----------
+    instrument.stage("Lookup")
+    title(ws_lookup, "Lookup & Reference")
+    ws_lookup["A3"] = "Categories (for Data validation):"
+    ws_lookup["A3"].font = font(bold=True)
+    categories = ["Beverages", "Snacks", "Household", "Personal Care", "Electronics"]
+    for i, cat in enumerate(categories, start=4):
+        ws_lookup[f"A{i}"] = cat
+    set_col_widths(ws_lookup, {"A": 28, "B": 60})
+
+    # ---------- Data (sample table + formulas + CF + chart) ----------
+    instrument.stage("Data")
+    title(ws_data, "Sales Data (2024 vs 2025)")
+    headers = [
+        "Product",
+        "Category",
+        "2024 Sales",
+        "2025 Sales",
+        "% Change",
+        "Share of 2025 Total",
+        "Status",
+    ]
+    ws_data.append(headers)
+
+    sample_rows = ROWS if rows is None else rows
+
+    for r in sample_rows:
+        ws_data.append(
+            list(r) + ["", "", ""]
+        )  # placeholders for % Change, Share, Status
+
+    # Headers style
+    apply_row(ws_data, 2, HEADER, max_col=len(headers))
+
+    # Freeze header row
+    ws_data.freeze_panes = "A3"
+
+    # Column widths
+    set_col_widths(
+        ws_data, {"A": 22, "B": 18, "C": 14, "D": 14, "E": 12, "F": 20, "G": 12}
+    )
+
+    # Data range rows (after title row): headers at row 2, data rows 3..10
+    first_row = DATA_FIRST_ROW
+    last_row = first_row + len(sample_rows) - 1  # 10
+    total_row = last_row + 1  # 11
+
+    # Formulas
+    if formulas == "table":
+        # the same text on every row; Share divides by the 2025 total below.
+        # Files spell Excel's [@Column] as tblSales[[#This Row],[Column]].
+        old, new, change_ = (f"tblSales[[#This Row],[{name}]]" for name in headers[2:5])
+        change = f"=IFERROR(({new}-{old})/{old},0)"
+        share = f"=IFERROR({new}/$D${total_row},0)"
+        status = f'=IF({change_}>0,"Increase",IF({change_}<0,"Decrease","No change"))'
+    for r in range(first_row, last_row + 1):
+        if formulas == "table":
+            ws_data[f"E{r}"], ws_data[f"F{r}"], ws_data[f"G{r}"] = change, share, status
+            continue
+        # % Change = IFERROR((New-Old)/Old,0)
+        ws_data[f"E{r}"] = f"=IFERROR((D{r}-C{r})/C{r},0)"
+        # Share of 2025 Total = IFERROR(D / SUM($D$first:$D$last),0)
+        ws_data[f"F{r}"] = f"=IFERROR(D{r}/SUM($D${first_row}:$D${last_row}),0)"
+        # Status text
+        ws_data[f"G{r}"] = f'=IF(E{r}>0,"Increase",IF(E{r}<0,"Decrease","No change"))'
+
+    # Totals row
+    ws_data[f"A{total_row}"] = "Total"
+    if formulas == "table":
+        ws_data[f"C{total_row}"] = "=SUM(tblSales[2024 Sales])"
+        ws_data[f"D{total_row}"] = "=SUM(tblSales[2025 Sales])"
+    else:
+        ws_data[f"C{total_row}"] = f"=SUM(C{first_row}:C{last_row})"
+        ws_data[f"D{total_row}"] = f"=SUM(D{first_row}:D{last_row})"
+    ws_data[f"E{total_row}"] = ""  # leave blank
+    ws_data[f"F{total_row}"] = "1"  # total share = 100%
+    ws_data[f"G{total_row}"] = ""
+
+    # Number formats
+    comma = Style(number_format=numbers.FORMAT_NUMBER_COMMA_SEPARATED1)
+    apply(ws_data, f"C{first_row}:D{total_row}", comma)
+    apply(ws_data, f"E{first_row}:F{total_row}", Style(number_format="0%"))
+
+    # Borders for data area
+    apply(ws_data, f"A2:G{total_row}", Style(border=border_all))
+
+    # Table (the totals row stays outside it, so sorting can't move it)
+    table_ref = f"A2:G{last_row}"
+    table = Table(displayName="tblSales", ref=table_ref)
+    style = TableStyleInfo(
+        name="TableStyleMedium9", showRowStripes=True, showColumnStripes=False
+    )
+    table.tableStyleInfo = style
+    ws_data.add_table(table)
+
+    # Data Validation for Category (B column)
+    dv = DataValidation(
+        type="list",
+        formula1=f"=Lookup!$A$4:$A${3 + len(categories)}",
+        allow_blank=False,
+    )
+    dv.error = "Please select a category from the list."
+    dv.promptTitle = "Category"
+    dv.prompt = "Choose a category from Lookup sheet."
+    ws_data.add_data_validation(dv)
+    dv.add(f"B{first_row}:B{last_row}")
+
+    # Conditional Formatting on % Change (E)
+    instrument.stage("Conditional formatting")
+    ws_data.conditional_formatting.add(
+        f"E{first_row}:E{last_row}",
+        CellIsRule(
+            operator="greaterThan",
+            formula=["0"],
+            fill=PatternFill(
+                start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"
+            ),
+        ),
+    )
+    ws_data.conditional_formatting.add(
+        f"E{first_row}:E{last_row}",
+        CellIsRule(
+            operator="lessThan",
+            formula=["0"],
+            fill=PatternFill(
+                start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"
+            ),
+        ),
+    )
+
+    # Chart: Pie of 2025 Sales by Product
+    instrument.stage("Chart")
+    pie = PieChart()
+    labels = Reference(
+        ws_data, min_col=1, min_row=first_row, max_row=last_row
+    )  # Product
+    data = Reference(
+        ws_data, min_col=4, min_row=2, max_row=last_row
+    )  # 2025 Sales incl header
+    pie.add_data(data, titles_from_data=True)
+    pie.set_categories(labels)
+    pie.title = "2025 Sales Share"
+    pie.height = 12
+    pie.width = 18
+    ws_data.add_chart(pie, "I3")
+
+    # Chart: Column for 2024 vs 2025 by Product
+    bar = BarChart()
+    bar.title = "Sales by Product (2024 vs 2025)"
+    bar.height = 12
+    bar.width = 22
+    bar_data = Reference(
+        ws_data, min_col=3, max_col=4, min_row=2, max_row=last_row
+    )  # 2024 & 2025
+    bar.add_data(bar_data, titles_from_data=True)
+    bar.set_categories(
+        Reference(ws_data, min_col=1, min_row=first_row, max_row=last_row)
+    )
+    ws_data.add_chart(bar, "I20")
+
+    # ---------- Tasks ----------
+    instrument.stage("Tasks")
+    title(ws_tasks, "Your Tasks")
+    tasks = [
+        "Starter: Enter two new products at the bottom with 2024 & 2025 sales. Confirm % Change and Share fill automatically.",
+        "Core: Apply a filter to show only 'Snacks'. Which product improved the most?",
+        "Core: Sort by % Change (largest to smallest). Which 3 products increased the most?",
+        "Stretch: Add a 'Target 2025 Sales' column (e.g., D * 1.10) and a 'Met Target?' column using IF.",
+        "Stretch: Create a new pie chart of 2024 sales share.",
+    ]
+    for i, t in enumerate(tasks, start=3):
+        ws_tasks[f"A{i}"] = f"{i - 2}."
+        ws_tasks[f"B{i}"] = t
+    set_col_widths(ws_tasks, {"A": 6, "B": 100})
+
+    # ---------- Hints ----------
+    instrument.stage("Hints")
+    title(ws_hints, "Hints")
+    share_hint = "Share of total uses absolute refs: D / SUM($D$start:$D$end)"
+    if formulas == "table":
+        share_hint = (
+            f"Share of total divides by the one 2025 total: "
+            f"[@[2025 Sales]] / $D${total_row}"
+        )
+    hints = [
+        "Percentage change = (New – Old) / Old. In this sheet: =(D - C) / C",
+        share_hint,
+        'IF example: =IF(E2>0,"Increase",IF(E2<0,"Decrease","No change"))',
+        "To copy formulas, use the table fill handle or Ctrl+D (Cmd+D on Mac).",
+        "Filter: Data tab → Filter (or click the ▼ on the table headers).",
+        "Sort: Home → Sort & Filter → Sort Largest to Smallest on % Change.",
+    ]
+    for i, h in enumerate(hints, start=3):
+        ws_hints[f"A{i}"] = f"Hint {i - 2}"
+        ws_hints[f"B{i}"] = h
+    set_col_widths(ws_hints, {"A": 12, "B": 100})
+
+    # ---------- Answers ----------
+    instrument.stage("Answers")
+    title(ws_answers, "Answers / Checks")
+    ws_answers["A3"] = "Key formulas used (check your sheet matches):"
+    ws_answers["A3"].font = font(bold=True)
+    ws_answers["A5"] = "% Change (E row):"
+    ws_answers["B5"] = "=IFERROR((D2-C2)/C2,0)  → format as %"
+    ws_answers["A6"] = "Share of 2025 Total (F row):"
+    ws_answers["B6"] = (
+        f"=IFERROR(D2/SUM($D${first_row}:$D${last_row}),0)  → format as %"
+    )
+    ws_answers["A8"] = "Status (G row):"
+    ws_answers["B8"] = '=IF(E2>0,"Increase",IF(E2<0,"Decrease","No change"))'
+    if formulas == "table":
+        # as Excel shows them: [@[2025 Sales]]
+        change, share, status = (
+            f.replace("tblSales[[#This Row],", "[@") for f in (change, share, status)
+        )
+        ws_answers["B5"] = f"{change}  → format as %"
+        ws_answers["B6"] = f"{share}  → format as %"
+        ws_answers["B8"] = status
+        for ref in ("B5", "B6", "B8"):  # text to read, not formulas outside the table
+            ws_answers[ref].data_type = "s"
+    ws_answers["A10"] = "Totals row:"
+    ws_answers["B10"] = (
+        f"2024 Total =SUM(Data!C{first_row}:C{last_row}) | 2025 Total =SUM(Data!D{first_row}:D{last_row})"
+    )
+    if formulas == "table":
+        ws_answers["B10"] = (
+            "2024 Total =SUM(tblSales[2024 Sales]) | 2025 Total =SUM(tblSales[2025 Sales])"
+        )
+    # the classic formulas in either style: a student's structured
+    # references are marked on the results they give
+    r = first_row
+    keyed = [
+        ("E", f"=IFERROR((Data!D{r}-Data!C{r})/Data!C{r},0)"),
+        ("F", f"=IFERROR(Data!D{r}/SUM(Data!$D${r}:$D${last_row}),0)"),
+        ("G", f'=IF(Data!E{r}>0,"Increase",IF(Data!E{r}<0,"Decrease","No change"))'),
+    ]
+    for task, (col, expected) in enumerate(keyed, start=1):
+        answer_key.add_task(
+            wb, task, f"Data!{col}{first_row}:{col}{last_row}", expected
+        )
+    ws_answers["A12"] = "Checks:"
+    ws_answers["B12"] = "Share column should sum to 100% (Total row shows 1.00)."
+    set_col_widths(ws_answers, {"A": 24, "B": 100})
+
+    # ---------- Checklist ----------
+    instrument.stage("Checklist")
+    title(ws_check, "Checklist")
+    check_items = [
+        "[ ] Entered/edited sales data for all rows",
+        "[ ] % Change shows positives and negatives correctly",
+        "[ ] Share of Total sums to 100%",
+        "[ ] Conditional formatting highlights increases (green) and decreases (red)",
+        "[ ] Applied sort/filter correctly",
+        "[ ] Created and read the chart(s)",
+        "[ ] Used absolute references ($) where needed",
+    ]
+    for i, item in enumerate(check_items, start=3):
+        ws_check[f"A{i}"] = item
+    set_col_widths(ws_check, {"A": 80})
+
+    # ---------- Finish ----------
+    instrument.stage("Finishing")
+    # Make sheets user-friendly starting positions
+    for ws in [ws_data, ws_tasks, ws_hints, ws_answers, ws_check, ws_lookup]:
+        ws.sheet_view.zoomScale = 120
+
+    # Save
+    instrument.stage("Save")
+    if output is not None:
+        xlsx_io.save(wb, output)
+    return wb
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the Simple Data Analysis workbook."
+    )
+    parser.add_argument(
+        "--formulas",
+        choices=FORMULA_STYLES,
+        default="classic",
+        help="plain fill-down references (default) or table structured references",
+    )
+    args = parser.parse_args()
+    build(FILENAME, formulas=args.formulas)
+    print(f"Workbook created: {FILENAME}")
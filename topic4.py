@@ -17,19 +17,25 @@ Also adds:
 How to run (Windows/Mac):
 1) Ensure Python 3.8+ is installed.
 2) Install openpyxl:  pip install openpyxl
-3) Save this script as generate_core_functions_workbook.py
-4) Run:  python generate_core_functions_workbook.py
-5) The file "Core_Functions_Practice.xlsx" will be created in the same folder.
+3) Run:  python topic4.py
+4) The file "Core_Functions_Practice.xlsx" will be created in the same folder.
 
-Note: This chat can’t auto-download files. Run locally to generate the workbook.
+From Python:
+    import topic4
+    wb = topic4.build()                      # returns the Workbook
+    topic4.build("out.xlsx", rows=my_rows)   # saves to a path or binary stream
 """
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.worksheet.table import Table, TableStyleInfo
 from openpyxl.chart import BarChart, Reference
 from openpyxl.utils import get_column_letter
 
+import answer_key
+import instrument
+import xlsx_io
+from shared_styles import Style, align, apply, apply_row, border, fill, font
+
 # -----------------------------
 # Helper functions
 # -----------------------------
@@ -40,69 +46,19 @@ def set_col_widths(ws, widths):
         ws.column_dimensions[col].width = width
 
 
-thin_border = Border(
-    left=Side(style="thin"),
-    right=Side(style="thin"),
-    top=Side(style="thin"),
-    bottom=Side(style="thin"),
-)
-
-currency_fmt = "#,##0.00"
+thin_border = border()
 
-wb = Workbook()
 
-# Remove default sheet name and start fresh
-ws0 = wb.active
-ws0.title = "Instructions"
+def header(color):
+    return Style(font=font(bold=True), fill=fill(color), border=thin_border)
 
-# -----------------------------
-# Sheet: Instructions
-# -----------------------------
-ws = wb["Instructions"]
-ws.sheet_properties.tabColor = "38B6FF"  # blue
-
-ws["A1"] = "Core Functions Practice: SUM, AVERAGE, MIN, MAX, COUNT, COUNTA"
-ws["A1"].font = Font(size=14, bold=True)
-ws.merge_cells("A1:F1")
-
-text = (
-    "Objective: Use basic summary functions to analyse data quickly.\n\n"
-    "Why it matters: Formulas update automatically when data changes, saving time and reducing errors.\n\n"
-    "What to do:\n"
-    "1) Go to the Data sheet and review the Sales and Scores tables.\n"
-    "2) On the Tasks sheet, enter formulas in the yellow cells.\n"
-    "3) Use the Hints sheet if stuck.\n"
-    "4) Check yourself with the Answers sheet.\n"
-    "5) Tick items on the Checklist when done.\n\n"
-    "Key functions:\n"
-    "- SUM(range): Adds numbers.\n"
-    "- AVERAGE(range): Mean value.\n"
-    "- MIN(range): Smallest number.\n"
-    "- MAX(range): Largest number.\n"
-    "- COUNT(range): Counts numbers only.\n"
-    "- COUNTA(range): Counts non-blank cells (numbers + text).\n"
-)
-ws["A3"] = text
-ws["A3"].alignment = Alignment(wrap_text=True, vertical="top")
-
-set_col_widths(ws, {"A": 90})
-ws.row_dimensions[1].height = 24
-ws.freeze_panes = "A4"
 
-# -----------------------------
-# Sheet: Data
-# -----------------------------
-ws = wb.create_sheet("Data")
-ws.sheet_properties.tabColor = "92D050"  # green
+currency_fmt = "#,##0.00"
 
-# Sales table headers
-ws["A2"].value = "Date"
-ws["B2"].value = "Item"
-ws["C2"].value = "Qty"
-ws["D2"].value = "Unit Price"
-ws["E2"].value = "Amount"
+FILENAME = "Core_Functions_Practice.xlsx"
 
-sales_rows = [
+# Sales table rows: Date, Item, Qty, Unit Price
+ROWS = [
     ["2025-01-05", "Notebooks", 5, 2.5],
     ["2025-01-06", "Pencils", 20, 0.6],
     ["2025-01-06", "Erasers", 8, 0.8],
@@ -117,39 +73,7 @@ sales_rows = [
     ["2025-01-16", "Rulers", 12, 0.9],
 ]
 
-start_row = 3
-for i, (date, item, qty, price) in enumerate(sales_rows, start=start_row):
-    ws.cell(row=i, column=1, value=date)
-    ws.cell(row=i, column=2, value=item)
-    ws.cell(row=i, column=3, value=qty)
-    p = ws.cell(row=i, column=4, value=price)
-    p.number_format = currency_fmt
-    # Amount formula = Qty * Unit Price
-    amt = ws.cell(row=i, column=5)
-    amt.value = f"=C{i}*D{i}"
-    amt.number_format = currency_fmt
-
-# Style header row
-for col in range(1, 6):
-    cell = ws.cell(row=2, column=col)
-    cell.font = Font(bold=True)
-    cell.fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-    cell.border = thin_border
-
-# Create Table for Sales
-last_row = start_row + len(sales_rows) - 1
-sales_table = Table(displayName="SalesTbl", ref=f"A2:E{last_row}")
-sales_style = TableStyleInfo(
-    name="TableStyleMedium9", showRowStripes=True, showColumnStripes=False
-)
-sales_table.tableStyleInfo = sales_style
-ws.add_table(sales_table)
-
-# Scores table headers (placed to the right)
-ws["G2"].value = "Name"
-ws["H2"].value = "Score"
-
-scores_rows = [
+SCORES_ROWS = [
     ["Ali", 65],
     ["Ben", 72],
     ["Clara", 80],
@@ -162,182 +86,292 @@ scores_rows = [
     ["Jin", 74],
 ]
 
-for i, (name, score) in enumerate(scores_rows, start=start_row):
-    ws.cell(row=i, column=7, value=name)
-    ws.cell(row=i, column=8, value=score)
-
-for col in (7, 8):
-    cell = ws.cell(row=2, column=col)
-    cell.font = Font(bold=True)
-    cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    cell.border = thin_border
-
-scores_last_row = start_row + len(scores_rows) - 1
-scores_table = Table(displayName="ScoresTbl", ref=f"G2:H{scores_last_row}")
-scores_style = TableStyleInfo(
-    name="TableStyleMedium7", showRowStripes=True, showColumnStripes=False
-)
-scores_table.tableStyleInfo = scores_style
-ws.add_table(scores_table)
-
-# Column widths and freeze
-set_col_widths(ws, {"A": 12, "B": 16, "C": 8, "D": 12, "E": 12, "G": 14, "H": 10})
-ws.freeze_panes = "A3"
-
-# Add a simple column chart: Sales Amount by Item
-chart = BarChart()
-chart.title = "Sales Amount by Item"
-chart.y_axis.title = "Amount"
-chart.x_axis.title = "Item"
-
-amounts = Reference(ws, min_col=5, min_row=2, max_row=last_row)
-items = Reference(ws, min_col=2, min_row=3, max_row=last_row)
-chart.add_data(amounts, titles_from_data=True)
-chart.set_categories(items)
-ws.add_chart(chart, "A16")
 
 # -----------------------------
-# Sheet: Tasks
+# Build
 # -----------------------------
-ws = wb.create_sheet("Tasks")
-ws.sheet_properties.tabColor = "FFD966"  # yellow
-
-set_col_widths(ws, {"A": 4, "B": 55, "C": 22})
-
-ws["B2"].value = "Enter your formulas in the yellow cells (C column)."
-ws["B2"].font = Font(bold=True)
-
-tasks = [
-    ("Total Sales (SUM of Data!E3:E14)", "=SUM(Data!E3:E14)"),
-    ("Average Sale per order (AVERAGE of Data!E3:E14)", "=AVERAGE(Data!E3:E14)"),
-    ("Smallest sale amount (MIN of Data!E3:E14)", "=MIN(Data!E3:E14)"),
-    ("Largest sale amount (MAX of Data!E3:E14)", "=MAX(Data!E3:E14)"),
-    ("Count of numeric scores (COUNT of Data!H3:H12)", "=COUNT(Data!H3:H12)"),
-    ("Count of names (COUNTA of Data!G3:G12)", "=COUNTA(Data!G3:G12)"),
-    ("BONUS: Total Quantity sold (SUM of Data!C3:C14)", "=SUM(Data!C3:C14)"),
-]
-
-start = 4
-for i, (label, answer_formula) in enumerate(tasks, start=start):
-    ws.cell(row=i, column=2, value=f"{i - start + 1}) {label}")
-    target = ws.cell(row=i, column=3)
-    target.value = None  # student to enter
-    target.number_format = currency_fmt if i in (4, 5, 6, 7) else "General"
-    target.fill = PatternFill(
-        start_color="FFF2CC", end_color="FFF2CC", fill_type="solid"
+@instrument.traced("topic4")
+def build(output=None, rows=None, scores=None):
+    """Build the Core Functions workbook and return it.
+
+    rows/scores replace the sample Sales and Scores tables (same column
+    order as ROWS and SCORES_ROWS). If output is a path or a binary stream,
+    the workbook is also saved there.
+    """
+    wb = Workbook()
+
+    # Remove default sheet name and start fresh
+    ws0 = wb.active
+    ws0.title = "Instructions"
+
+    # -----------------------------
+    # Sheet: Instructions
+    # -----------------------------
+    instrument.stage("Instructions")
+    ws = wb["Instructions"]
+    ws.sheet_properties.tabColor = "38B6FF"  # blue
+
+    ws["A1"] = "Core Functions Practice: SUM, AVERAGE, MIN, MAX, COUNT, COUNTA"
+    ws["A1"].font = font(size=14, bold=True)
+    ws.merge_cells("A1:F1")
+
+    text = (
+        "Objective: Use basic summary functions to analyse data quickly.\n\n"
+        "Why it matters: Formulas update automatically when data changes, saving time and reducing errors.\n\n"
+        "What to do:\n"
+        "1) Go to the Data sheet and review the Sales and Scores tables.\n"
+        "2) On the Tasks sheet, enter formulas in the yellow cells.\n"
+        "3) Use the Hints sheet if stuck.\n"
+        "4) Check yourself with the Answers sheet.\n"
+        "5) Tick items on the Checklist when done.\n\n"
+        "Key functions:\n"
+        "- SUM(range): Adds numbers.\n"
+        "- AVERAGE(range): Mean value.\n"
+        "- MIN(range): Smallest number.\n"
+        "- MAX(range): Largest number.\n"
+        "- COUNT(range): Counts numbers only.\n"
+        "- COUNTA(range): Counts non-blank cells (numbers + text).\n"
     )
-    target.border = thin_border
-
-ws["B12"] = (
-    "Tip: Use = to start every formula. Select the correct range, including the last row."
-)
-ws["B12"].alignment = Alignment(wrap_text=True)
-
-# -----------------------------
-# Sheet: Hints
-# -----------------------------
-ws = wb.create_sheet("Hints")
-ws.sheet_properties.tabColor = "B4A7D6"  # purple
-set_col_widths(ws, {"A": 95})
-
-hints = [
-    "SUM adds numbers: =SUM(Data!E3:E14)",
-    "AVERAGE finds the mean: =AVERAGE(Data!E3:E14)",
-    "MIN gives the smallest value: =MIN(Data!E3:E14)",
-    "MAX gives the largest value: =MAX(Data!E3:E14)",
-    "COUNT counts numbers only: =COUNT(Data!H3:H12)",
-    "COUNTA counts non-blank cells: =COUNTA(Data!G3:G12)",
-    "Bonus idea: Total Qty =SUM(Data!C3:C14)",
-]
-
-ws["A1"].value = "Hints"
-ws["A1"].font = Font(bold=True)
-for i, line in enumerate(hints, start=3):
-    ws.cell(row=i, column=1, value=f"• {line}")
-
-# -----------------------------
-# Sheet: Answers
-# -----------------------------
-ws = wb.create_sheet("Answers")
-ws.sheet_properties.tabColor = "F4CCCC"  # red
-set_col_widths(ws, {"A": 4, "B": 55, "C": 22})
-
-ws["B2"].value = "Model answers (formulas are entered for you):"
-ws["B2"].font = Font(bold=True)
-
-for i, (label, formula) in enumerate(tasks, start=4):
-    ws.cell(row=i, column=2, value=f"{i - 3}) {label}")
-    ans = ws.cell(row=i, column=3, value=formula)
-    ans.number_format = currency_fmt if i in (4, 5, 6, 7) else "General"
-    ans.fill = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")
-    ans.border = thin_border
-
-# -----------------------------
-# Sheet: Checklist
-# -----------------------------
-ws = wb.create_sheet("Checklist")
-ws.sheet_properties.tabColor = "A2C4C9"  # teal
-set_col_widths(ws, {"A": 70, "B": 18})
-
-items = [
-    "I can use =SUM(range) to add numbers.",
-    "I can use =AVERAGE(range) to find the mean.",
-    "I can identify the smallest and largest values using MIN and MAX.",
-    "I know the difference between COUNT (numbers) and COUNTA (non-blanks).",
-    "I can select the correct range, including the last row.",
-]
-
-ws["A1"].value = "Skill"
-ws["B1"].value = "Done [Y/N]"
-ws["A1"].font = Font(bold=True)
-ws["B1"].font = Font(bold=True)
+    ws["A3"] = text
+    ws["A3"].alignment = align(vertical="top", wrap=True)
+
+    set_col_widths(ws, {"A": 90})
+    ws.row_dimensions[1].height = 24
+    ws.freeze_panes = "A4"
+
+    # -----------------------------
+    # Sheet: Data
+    # -----------------------------
+    instrument.stage("Data")
+    ws = wb.create_sheet("Data")
+    ws.sheet_properties.tabColor = "92D050"  # green
+
+    # Sales table headers
+    ws["A2"].value = "Date"
+    ws["B2"].value = "Item"
+    ws["C2"].value = "Qty"
+    ws["D2"].value = "Unit Price"
+    ws["E2"].value = "Amount"
+
+    sales_rows = ROWS if rows is None else rows
+
+    start_row = 3
+    for i, (date, item, qty, price) in enumerate(sales_rows, start=start_row):
+        ws.cell(row=i, column=1, value=date)
+        ws.cell(row=i, column=2, value=item)
+        ws.cell(row=i, column=3, value=qty)
+        p = ws.cell(row=i, column=4, value=price)
+        p.number_format = currency_fmt
+        # Amount formula = Qty * Unit Price
+        amt = ws.cell(row=i, column=5)
+        amt.value = f"=C{i}*D{i}"
+        amt.number_format = currency_fmt
+
+    # Style header row
+    apply(ws, "A2:E2", header("FFF2CC"))
+
+    # Create Table for Sales
+    last_row = start_row + len(sales_rows) - 1
+    sales_table = Table(displayName="SalesTbl", ref=f"A2:E{last_row}")
+    sales_style = TableStyleInfo(
+        name="TableStyleMedium9", showRowStripes=True, showColumnStripes=False
+    )
+    sales_table.tableStyleInfo = sales_style
+    ws.add_table(sales_table)
 
-for i, item in enumerate(items, start=2):
-    ws.cell(row=i, column=1, value=item)
-    ws.cell(row=i, column=2, value="[ ]")
+    # Scores table headers (placed to the right)
+    ws["G2"].value = "Name"
+    ws["H2"].value = "Score"
 
-# -----------------------------
-# Sheet: Lookup
-# -----------------------------
-ws = wb.create_sheet("Lookup")
-ws.sheet_properties.tabColor = "CCCCCC"
-set_col_widths(ws, {"A": 22, "B": 80, "C": 44})
-
-lookup_rows = [
-    ("Function", "Meaning / Syntax", "Example"),
-    ("SUM", "Adds numbers — SUM(range)", "=SUM(Data!E3:E14)"),
-    ("AVERAGE", "Mean value — AVERAGE(range)", "=AVERAGE(Data!E3:E14)"),
-    ("MIN", "Smallest number — MIN(range)", "=MIN(Data!E3:E14)"),
-    ("MAX", "Largest number — MAX(range)", "=MAX(Data!E3:E14)"),
-    ("COUNT", "Counts numbers only — COUNT(range)", "=COUNT(Data!H3:H12)"),
-    ("COUNTA", "Counts non-blanks — COUNTA(range)", "=COUNTA(Data!G3:G12)"),
-]
+    scores_rows = SCORES_ROWS if scores is None else scores
+    for i, (name, score) in enumerate(scores_rows, start=start_row):
+        ws.cell(row=i, column=7, value=name)
+        ws.cell(row=i, column=8, value=score)
 
-for r, row in enumerate(lookup_rows, start=1):
-    for c, val in enumerate(row, start=1):
-        ws.cell(row=r, column=c, value=val)
-        if r == 1:
-            ws.cell(row=r, column=c).font = Font(bold=True)
-            ws.cell(row=r, column=c).fill = PatternFill(
-                start_color="D9D9D9", end_color="D9D9D9", fill_type="solid"
-            )
-        ws.cell(row=r, column=c).border = thin_border
+    apply(ws, "G2:H2", header("C6EFCE"))
 
-# -----------------------------
-# Final touches & Save
-# -----------------------------
-# Set some default fonts/alignments for headers already done. Adjust row heights lightly.
-for wsname in ["Data", "Tasks", "Answers", "Checklist", "Lookup"]:
-    wss = wb[wsname]
-    for row in wss.iter_rows(
-        min_row=1, max_row=wss.max_row, min_col=1, max_col=wss.max_column
-    ):
-        for cell in row:
-            if cell.row in (1, 2) and isinstance(cell.value, str) and cell.value:
-                cell.alignment = Alignment(vertical="center")
-
-# Default active sheet on open
-wb.active = wb["Instructions"]
-
-wb.save("Core_Functions_Practice.xlsx")
-print("Workbook created: Core_Functions_Practice.xlsx")
+    scores_last_row = start_row + len(scores_rows) - 1
+    scores_table = Table(displayName="ScoresTbl", ref=f"G2:H{scores_last_row}")
+    scores_style = TableStyleInfo(
+        name="TableStyleMedium7", showRowStripes=True, showColumnStripes=False
+    )
+    scores_table.tableStyleInfo = scores_style
+    ws.add_table(scores_table)
+
+    # Ranges quoted on the Tasks, Hints and Lookup sheets
+    amount_rng = f"Data!E{start_row}:E{last_row}"
+    qty_rng = f"Data!C{start_row}:C{last_row}"
+    name_rng = f"Data!G{start_row}:G{scores_last_row}"
+    score_rng = f"Data!H{start_row}:H{scores_last_row}"
+
+    # Column widths and freeze
+    set_col_widths(ws, {"A": 12, "B": 16, "C": 8, "D": 12, "E": 12, "G": 14, "H": 10})
+    ws.freeze_panes = "A3"
+
+    # Add a simple column chart: Sales Amount by Item
+    instrument.stage("Chart")
+    chart = BarChart()
+    chart.title = "Sales Amount by Item"
+    chart.y_axis.title = "Amount"
+    chart.x_axis.title = "Item"
+
+    amounts = Reference(ws, min_col=5, min_row=2, max_row=last_row)
+    items = Reference(ws, min_col=2, min_row=3, max_row=last_row)
+    chart.add_data(amounts, titles_from_data=True)
+    chart.set_categories(items)
+    ws.add_chart(chart, f"A{last_row + 2}")
+
+    # -----------------------------
+    # Sheet: Tasks
+    # -----------------------------
+    instrument.stage("Tasks")
+    ws = wb.create_sheet("Tasks")
+    ws.sheet_properties.tabColor = "FFD966"  # yellow
+
+    set_col_widths(ws, {"A": 4, "B": 55, "C": 22})
+
+    ws["B2"].value = "Enter your formulas in the yellow cells (C column)."
+    ws["B2"].font = font(bold=True)
+
+    tasks = [
+        (f"Total Sales (SUM of {amount_rng})", f"=SUM({amount_rng})"),
+        (
+            f"Average Sale per order (AVERAGE of {amount_rng})",
+            f"=AVERAGE({amount_rng})",
+        ),
+        (f"Smallest sale amount (MIN of {amount_rng})", f"=MIN({amount_rng})"),
+        (f"Largest sale amount (MAX of {amount_rng})", f"=MAX({amount_rng})"),
+        (f"Count of numeric scores (COUNT of {score_rng})", f"=COUNT({score_rng})"),
+        (f"Count of names (COUNTA of {name_rng})", f"=COUNTA({name_rng})"),
+        (f"BONUS: Total Quantity sold (SUM of {qty_rng})", f"=SUM({qty_rng})"),
+    ]
+
+    start = 4
+    for i, (label, answer_formula) in enumerate(tasks, start=start):
+        ws.cell(row=i, column=2, value=f"{i - start + 1}) {label}")
+        target = ws.cell(row=i, column=3)
+        target.value = None  # student to enter
+        target.number_format = currency_fmt if i in (4, 5, 6, 7) else "General"
+    last_task = start + len(tasks) - 1
+    apply(ws, f"C{start}:C{last_task}", Style(fill=fill("FFF2CC"), border=thin_border))
+
+    ws["B12"] = (
+        "Tip: Use = to start every formula. Select the correct range, including the last row."
+    )
+    ws["B12"].alignment = align(wrap=True)
+
+    # -----------------------------
+    # Sheet: Hints
+    # -----------------------------
+    instrument.stage("Hints")
+    ws = wb.create_sheet("Hints")
+    ws.sheet_properties.tabColor = "B4A7D6"  # purple
+    set_col_widths(ws, {"A": 95})
+
+    hints = [
+        f"SUM adds numbers: =SUM({amount_rng})",
+        f"AVERAGE finds the mean: =AVERAGE({amount_rng})",
+        f"MIN gives the smallest value: =MIN({amount_rng})",
+        f"MAX gives the largest value: =MAX({amount_rng})",
+        f"COUNT counts numbers only: =COUNT({score_rng})",
+        f"COUNTA counts non-blank cells: =COUNTA({name_rng})",
+        f"Bonus idea: Total Qty =SUM({qty_rng})",
+    ]
+
+    ws["A1"].value = "Hints"
+    ws["A1"].font = font(bold=True)
+    for i, line in enumerate(hints, start=3):
+        ws.cell(row=i, column=1, value=f"• {line}")
+
+    # -----------------------------
+    # Sheet: Answers
+    # -----------------------------
+    instrument.stage("Answers")
+    ws = wb.create_sheet("Answers")
+    ws.sheet_properties.tabColor = "F4CCCC"  # red
+    set_col_widths(ws, {"A": 4, "B": 55, "C": 22})
+
+    ws["B2"].value = "Model answers (formulas are entered for you):"
+    ws["B2"].font = font(bold=True)
+
+    for i, (label, formula) in enumerate(tasks, start=4):
+        ws.cell(row=i, column=2, value=f"{i - 3}) {label}")
+        ans = ws.cell(row=i, column=3, value=formula)
+        ans.number_format = currency_fmt if i in (4, 5, 6, 7) else "General"
+        answer_key.add_task(wb, i - 3, f"Tasks!C{i}", f"Answers!C{i}")
+    apply(ws, f"C4:C{3 + len(tasks)}", Style(fill=fill("E2EFDA"), border=thin_border))
+
+    # -----------------------------
+    # Sheet: Checklist
+    # -----------------------------
+    instrument.stage("Checklist")
+    ws = wb.create_sheet("Checklist")
+    ws.sheet_properties.tabColor = "A2C4C9"  # teal
+    set_col_widths(ws, {"A": 70, "B": 18})
+
+    items = [
+        "I can use =SUM(range) to add numbers.",
+        "I can use =AVERAGE(range) to find the mean.",
+        "I can identify the smallest and largest values using MIN and MAX.",
+        "I know the difference between COUNT (numbers) and COUNTA (non-blanks).",
+        "I can select the correct range, including the last row.",
+    ]
+
+    ws["A1"].value = "Skill"
+    ws["B1"].value = "Done [Y/N]"
+    ws["A1"].font = font(bold=True)
+    ws["B1"].font = font(bold=True)
+
+    for i, item in enumerate(items, start=2):
+        ws.cell(row=i, column=1, value=item)
+        ws.cell(row=i, column=2, value="[ ]")
+
+    # -----------------------------
+    # Sheet: Lookup
+    # -----------------------------
+    instrument.stage("Lookup")
+    ws = wb.create_sheet("Lookup")
+    ws.sheet_properties.tabColor = "CCCCCC"
+    set_col_widths(ws, {"A": 22, "B": 80, "C": 44})
+
+    lookup_rows = [
+        ("Function", "Meaning / Syntax", "Example"),
+        ("SUM", "Adds numbers — SUM(range)", f"=SUM({amount_rng})"),
+        ("AVERAGE", "Mean value — AVERAGE(range)", f"=AVERAGE({amount_rng})"),
+        ("MIN", "Smallest number — MIN(range)", f"=MIN({amount_rng})"),
+        ("MAX", "Largest number — MAX(range)", f"=MAX({amount_rng})"),
+        ("COUNT", "Counts numbers only — COUNT(range)", f"=COUNT({score_rng})"),
+        ("COUNTA", "Counts non-blanks — COUNTA(range)", f"=COUNTA({name_rng})"),
+    ]
+
+    for row in lookup_rows:
+        ws.append(row)
+    apply(ws, f"A1:C{len(lookup_rows)}", Style(border=thin_border))
+    apply_row(ws, 1, header("D9D9D9"), max_col=3)
+
+    # -----------------------------
+    # Final touches & Save
+    # -----------------------------
+    instrument.stage("Finishing")
+    # Set some default fonts/alignments for headers already done. Adjust row heights lightly.
+    for wsname in ["Data", "Tasks", "Answers", "Checklist", "Lookup"]:
+        wss = wb[wsname]
+        for row in wss.iter_rows(
+            min_row=1, max_row=wss.max_row, min_col=1, max_col=wss.max_column
+        ):
+            for cell in row:
+                if cell.row in (1, 2) and isinstance(cell.value, str) and cell.value:
+                    cell.alignment = align(vertical="center")
+
+    # Default active sheet on open
+    wb.active = wb["Instructions"]
+
+    instrument.stage("Save")
+    if output is not None:
+        xlsx_io.save(wb, output)
+    return wb
+
+
+if __name__ == "__main__":
+    build(FILENAME)
+    print(f"Workbook created: {FILENAME}")
@@ -0,0 +1,284 @@
+# variants.py
+# Builds one workbook per student, each with its own randomly generated (but
+# realistic) Data sheet, so answers cannot simply be copied between students.
+#
+# Every (seed, topic, student) triple gets an independent random stream, so a
+# student's workbook is reproduced exactly whatever order, or however many
+# workers, the class is built with.
+#
+# Topics whose records only change the Data sheet (see templates.py) are built
+# once per worker as a template and each student's file is spliced from it;
+# --no-template forces a full build for every student.
+#
+# Usage:
+#   python variants.py topic5 roster.txt                # one file per student
+#   python variants.py topic10a roster.txt --seed 2025 -j 8 --out class_4A
+#   python variants.py topic11 roster.txt --rows 500    # bigger datasets
+#   python variants.py topic10a roster.txt --lint       # check references (lint.py)
+#   python variants.py topic5 roster.txt --answer-keys  # plus <name>.key.jsonl each
+#
+# roster.txt holds one student name per line (blank lines and # comments are
+# skipped).
+
+import argparse
+import hashlib
+import importlib
+import math
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+import templates
+from build_all import atomic_save, save_answer_key
+
+FIRST_NAMES = [
+    "Aaron", "Adam", "Aisha", "Alex", "Amir", "Anna", "Ari", "Ben", "Bella",
+    "Brynn", "Chris", "Clara", "Cody", "Dana", "Devi", "Diana", "Dina", "Eli",
+    "Ethan", "Evan", "Farah", "Fiona", "Gabe", "Gina", "Gwen", "Hadi", "Hana",
+    "Henry", "Iris", "Ivan", "Jack", "Jade", "Jamal", "Kara", "Kai", "Kimi",
+    "Leo", "Lia", "Liam", "Lina", "Maya", "Milo", "Mina", "Nia", "Noah",
+    "Nora", "Olive", "Omar", "Paul", "Pia", "Qadir", "Ravi", "Rina", "Sam",
+    "Sara", "Tara", "Troy", "Uma", "Vik", "Wes", "Xena", "Yasmin", "Zack",
+]  # fmt: skip
+
+
+# ---------- Random streams ----------
+def rng_for(seed, topic, student):
+    """An independent, reproducible random.Random for one student's variant."""
+    key = f"{seed}\x00{topic}\x00{student}".encode()
+    return random.Random(int.from_bytes(hashlib.sha256(key).digest()[:8], "big"))
+
+
+def _names(rng, n):
+    # Unique while the pool lasts, then repeats (large stress datasets)
+    if n <= len(FIRST_NAMES):
+        return rng.sample(FIRST_NAMES, n)
+    return rng.choices(FIRST_NAMES, k=n)
+
+
+def _lognormal(rng, median, spread, n, low, high):
+    mu = math.log(median)
+    return [
+        min(high, max(low, round(rng.lognormvariate(mu, spread)))) for _ in range(n)
+    ]
+
+
+# ---------- Per-topic generators ----------
+# Each takes (rng, n) and returns n rows in the topic's ROWS column order.
+# Whole columns are drawn in one go and then zipped into rows.
+def topic5_rows(rng, n):
+    """Name, Country, Sales, Channel."""
+    names = _names(rng, n)
+    countries = rng.choices(["Singapore", "Malaysia", "Indonesia"], [5, 4, 3], k=n)
+    sales = _lognormal(rng, 105, 0.45, n, 20, 250)
+    channels = rng.choices(["Online", "Store"], k=n)
+    return [list(r) for r in zip(names, countries, sales, channels)]
+
+
+# Product -> (unit price, typical units per order)
+ORDER_PRODUCTS = {
+    "Notebook": (4.50, 20),
+    "Binder": (6.20, 20),
+    "Pen": (1.20, 65),
+    "Pencil": (0.80, 65),
+}
+
+
+def topic10a_rows(rng, n):
+    """Order ID, Date, Name, Region, Product, Units, Unit Price."""
+    first_id = rng.randrange(1001, 9001)
+    start = date(2025, 1, 1) + timedelta(days=rng.randrange(0, 180))
+    # Orders arrive every few days, in date order
+    gaps = rng.choices([0, 1, 2, 3, 4], [1, 3, 4, 3, 1], k=n)
+    days = list(accumulate(gaps))
+    names = _names(rng, n)
+    regions = rng.choices(["East", "West", "North", "South"], k=n)
+    products = rng.choices(list(ORDER_PRODUCTS), k=n)
+    rows = []
+    for i in range(n):
+        price, typical = ORDER_PRODUCTS[products[i]]
+        units = max(1, round(rng.gauss(typical, typical * 0.35)))
+        rows.append(
+            [
+                first_id + i,
+                (start + timedelta(days=days[i])).isoformat(),
+                names[i],
+                regions[i],
+                products[i],
+                units,
+                price,
+            ]
+        )
+    return rows
+
+
+# Product -> (category, typical 2024 sales)
+CATALOGUE = {
+    "Cola 330ml": ("Beverages", 1200),
+    "Orange Juice 1L": ("Beverages", 950),
+    "Green Tea 500ml": ("Beverages", 800),
+    "Mineral Water 1.5L": ("Beverages", 1400),
+    "Potato Chips": ("Snacks", 1500),
+    "Chocolate Bar": ("Snacks", 1100),
+    "Cream Crackers": ("Snacks", 700),
+    "Detergent 2kg": ("Household", 1350),
+    "Dishwashing Liquid": ("Household", 850),
+    "Paper Towels": ("Household", 1000),
+    "Shampoo 500ml": ("Personal Care", 900),
+    "Toothpaste": ("Personal Care", 1150),
+    "Earbuds": ("Electronics", 2100),
+    "USB Charger": ("Electronics", 1000),
+    "Power Bank": ("Electronics", 1600),
+}
+
+
+def topic11_rows(rng, n):
+    """Product, Category, 2024 Sales, 2025 Sales."""
+    if n <= len(CATALOGUE):
+        products = rng.sample(list(CATALOGUE), n)
+    else:
+        products = rng.choices(list(CATALOGUE), k=n)
+    noise = [rng.lognormvariate(0, 0.2) for _ in range(n)]
+    growth = [rng.gauss(0.05, 0.15) for _ in range(n)]
+    rows = []
+    for p, k, g in zip(products, noise, growth):
+        category, typical = CATALOGUE[p]
+        before = int(round(typical * k, -1))
+        rows.append([p, category, before, int(round(before * (1 + g), -1))])
+    return rows
+
+
+GENERATORS = {
+    "topic5": topic5_rows,
+    "topic10a": topic10a_rows,
+    "topic11": topic11_rows,
+}
+
+
+def variant_rows(seed, topic, student, n=None):
+    """The Data rows for one student's variant of topic."""
+    if n is None:
+        n = len(importlib.import_module(topic).ROWS)
+    return GENERATORS[topic](rng_for(seed, topic, student), n)
+
+
+# ---------- Building ----------
+def slug(name):
+    return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "student"
+
+
+def load_roster(path):
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [s.strip() for s in lines if s.strip() and not s.lstrip().startswith("#")]
+
+
+def build_variant(job):
+    """Worker: build one student's workbook, return its file name."""
+    topic, seed, student, n, out_dir, use_template, answer_keys = job
+    module = importlib.import_module(topic)
+    stem = Path(module.FILENAME).stem
+    target = Path(out_dir) / f"{stem}_{slug(student)}.xlsx"
+    rows = variant_rows(seed, topic, student, n)
+    if use_template:
+        tmpl = templates.template_for(topic, rows)
+        atomic_save(tmpl.save, target, rows=rows)
+        wb = tmpl.wb  # holds this student's records after save()
+    else:
+        built = []
+        atomic_save(lambda output: built.append(module.build(output, rows)), target)
+        wb = built[0]
+    if answer_keys:
+        save_answer_key(wb, target)
+    return target.name
+
+
+def build_variants(
+    topic,
+    students,
+    seed=0,
+    n=None,
+    out_dir=".",
+    jobs=None,
+    template=True,
+    answer_keys=False,
+):
+    """Build a workbook per student in parallel; return the file names.
+
+    With template set (the default) topics that support it are spliced from
+    a per-worker template instead of being built from scratch each time.
+    With answer_keys set each student's answer key, worked out on their own
+    records, is exported beside their workbook as <name>.key.jsonl.
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    use_template = template and templates.supports(topic)
+    work = [
+        (topic, seed, s, n, str(out_dir), use_template, answer_keys) for s in students
+    ]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(work) or 1))
+    if jobs == 1:
+        return [build_variant(w) for w in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # batch the small jobs to keep inter-process overhead down
+        chunk = max(1, len(work) // (jobs * 8))
+        return list(pool.map(build_variant, work, chunksize=chunk))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build per-student workbooks.")
+    parser.add_argument("topic", choices=sorted(GENERATORS))
+    parser.add_argument("roster", help="text file, one student per line")
+    parser.add_argument("--seed", default="0", help="class seed (any string)")
+    parser.add_argument("--rows", type=int, default=None, help="Data rows per file")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    parser.add_argument("--out", default="variants", help="output directory")
+    parser.add_argument(
+        "--no-template",
+        dest="template",
+        action="store_false",
+        help="build every workbook from scratch",
+    )
+    parser.add_argument(
+        "--lint",
+        action="store_true",
+        help="check each workbook's references before saving it (lint.py)",
+    )
+    parser.add_argument(
+        "--answer-keys",
+        action="store_true",
+        help="also export each student's answer key as <name>.key.jsonl",
+    )
+    args = parser.parse_args(argv)
+    if args.lint:
+        os.environ["XLSX_LINT"] = "1"  # inherited by the worker processes
+
+    students = load_roster(args.roster)
+    slugs = [slug(s) for s in students]
+    if len(set(slugs)) != len(slugs):
+        parser.error("roster names must be unique (after removing punctuation)")
+
+    started = time.perf_counter()
+    names = build_variants(
+        args.topic,
+        students,
+        args.seed,
+        args.rows,
+        args.out,
+        args.jobs,
+        args.template,
+        args.answer_keys,
+    )
+    wall = time.perf_counter() - started
+    print(f"Built {len(names)} {args.topic} variants in {wall:.2f}s -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
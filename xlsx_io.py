@@ -0,0 +1,403 @@
+# xlsx_io.py
+# Shared save helper for the topic generators.
+#
+# When SOURCE_DATE_EPOCH is set (https://reproducible-builds.org/specs/source-date-epoch/)
+# workbooks are written in reproducible mode: every zip member gets the same
+# timestamp, members are stored in a fixed order and the docProps/core.xml
+# created/modified dates are pinned to SOURCE_DATE_EPOCH, so identical inputs
+# give identical bytes. Without it, save() is a plain wb.save().
+#
+# Large Data sheets can be streamed: stream_rows() registers an iterator of
+# rows that save() writes straight into the sheet's XML inside the zip, so
+# only a handful of rows ever live in memory. Everything else on the sheet
+# (tables, validation, conditional formatting, charts, side summaries) is
+# built by openpyxl as usual and merged around the streamed rows.
+#
+# save() also works out every formula (see formula_eval.py) and writes the
+# results in as the cells' cached values, so the numbers show up in viewers
+# that don't recalculate. Streamed workbooks are saved without them.
+#
+# A column of filled-down formulas (=F2*G2, =F3*G3, ...) is written as one
+# shared formula: the first cell holds the text and the rest point at it, the
+# way Excel saves a fill-down. That keeps the sheet XML to about one line per
+# run, whatever the row count. share_formulas() only shares cells whose
+# formulas differ in nothing but their relative row numbers; streamed sheets
+# are written as they come.
+#
+# Before writing, save() consolidates the workbook's conditional formats
+# (consolidate.py): ranges carrying the same rule are merged, unused dxfs
+# dropped, and stopIfTrue set where it can't change a result.
+#
+# With XLSX_LINT=1 save() first checks the workbook's references (lint.py)
+# and raises lint.LintError instead of writing a workbook with broken ones.
+
+import io
+import os
+import re
+import time
+import weakref
+import zipfile
+from datetime import date, datetime, timezone
+from xml.sax.saxutils import escape
+
+from openpyxl.utils import column_index_from_string, get_column_letter, range_boundaries
+from openpyxl.utils.datetime import to_excel
+
+import consolidate
+import formula_eval
+import instrument
+import lint
+
+# Zip timestamps cannot go before 1980-01-01.
+ZIP_EPOCH = 315532800
+
+
+def source_date_epoch():
+    """SOURCE_DATE_EPOCH as an int, or None when not in reproducible mode."""
+    value = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    return int(value) if value else None
+
+
+def build_time():
+    """Local "now" for footers, or the pinned time in reproducible mode."""
+    epoch = source_date_epoch()
+    if epoch is None:
+        return datetime.now()
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+
+
+def _member_key(name):
+    # [Content_Types].xml first (as Excel writes it), the rest alphabetically
+    return (name != "[Content_Types].xml", name)
+
+
+def _pin_core_dates(xml, stamp):
+    return re.sub(
+        rb"(<dcterms:(?:created|modified)\b[^>]*>)[^<]*(</dcterms:)",
+        lambda m: m.group(1) + stamp.encode() + m.group(2),
+        xml,
+    )
+
+
+# ---------- Streamed rows ----------
+# worksheet -> (rows iterator, first_row, last_row)
+_STREAMS = weakref.WeakKeyDictionary()
+
+_ROW = re.compile(rb"<row\b([^>]*?)(?:/>|>(.*?)</row>)", re.S)
+_CELL = re.compile(rb"<c\b[^>]*?(?:/>|>.*?</c>)", re.S)
+_REF = re.compile(rb'\br="([A-Z]+)(\d+)"')
+_ROW_NUM = re.compile(rb'\br="(\d+)"')
+_STYLE = re.compile(rb'\bs="(\d+)"')
+_DIMENSION = re.compile(rb'(<dimension ref="[A-Z]+\d+:[A-Z]+)(\d+)"')
+
+
+def stream_rows(ws, rows, first_row, last_row):
+    """Write rows into ws at first_row..last_row when the workbook is saved.
+
+    rows is consumed once, during save(). Each streamed cell reuses the
+    style of the cell above it in row first_row - 1, so write (and style)
+    the first record normally and stream the rest.
+    """
+    _STREAMS[ws] = (iter(rows), first_row, last_row)
+
+
+def streamed(ws):
+    """(first_row, last_row) of the rows stream_rows() will write into ws,
+    or None if it has none pending."""
+    stream = _STREAMS.get(ws)
+    return None if stream is None else stream[1:]
+
+
+def _name_table_columns(ws):
+    # openpyxl names table columns from ws[table.ref][0], which would create
+    # every cell in the (streamed) table; read just the header row instead.
+    for table in ws.tables.values():
+        if table.tableColumns or not table.headerRowCount:
+            continue
+        min_col, min_row, max_col, _ = range_boundaries(table.ref)
+        table._initialise_columns()
+        header = next(ws.iter_rows(min_row, min_row, min_col, max_col))
+        for cell, col in zip(header, table.tableColumns):
+            col.name = str(cell.value)
+
+
+def _cell_xml(ref, value, style):
+    s = f' s="{style}"' if style else ""
+    if value is None or value == "":
+        return f'<c r="{ref}"{s}/>' if style else ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{s} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"{s} t="n"><v>{value!r}</v></c>'
+    if isinstance(value, (date, datetime)):
+        return f'<c r="{ref}"{s} t="n"><v>{to_excel(value)!r}</v></c>'
+    value = str(value)
+    if value.startswith("="):
+        return f'<c r="{ref}"{s}><f>{escape(value[1:])}</f></c>'
+    return f'<c r="{ref}"{s} t="inlineStr"><is><t>{escape(value)}</t></is></c>'
+
+
+def _row_cells(body):
+    """{column index: cell xml} for an openpyxl-written <row> body."""
+    cells = {}
+    for m in _CELL.finditer(body or b""):
+        col = column_index_from_string(_REF.search(m.group()).group(1).decode())
+        cells[col] = m.group()
+    return cells
+
+
+def _style_of(cell):
+    m = _STYLE.search(cell)
+    return m.group(1).decode() if m else None
+
+
+def write_rows(fh, xml, rows, first_row, last_row):
+    """Write sheet xml to fh with rows first_row..last_row taken from rows.
+
+    Cells the rows supply replace any cell already at that position (keeping
+    its style); a new cell takes the style of the cell above it in row
+    first_row - 1. Other cells of the sheet are copied as they are.
+    """
+    start = xml.index(b"<sheetData")
+    end = xml.rindex(b"</sheetData>") if b"</sheetData>" in xml else None
+    head = xml[:start]
+    m = _DIMENSION.search(head)
+    if m and int(m.group(2)) < last_row:
+        head = head[: m.start(2)] + str(last_row).encode() + head[m.end(2) :]
+    fh.write(head + b"<sheetData>")
+
+    # The small openpyxl-written rows, keyed by row number
+    existing = {}
+    body = xml[xml.index(b">", start) + 1 : end] if end else b""
+    for m in _ROW.finditer(body):
+        attrs = re.sub(rb'\s(?:r|spans)="[^"]*"', b"", m.group(1))
+        existing[int(_ROW_NUM.search(m.group(1)).group(1))] = (attrs, m.group(2))
+    proto = _row_cells(existing.get(first_row - 1, (b"", b""))[1])
+    styles = {col: _style_of(cell) for col, cell in proto.items()}
+
+    def write_row(r, attrs, cells):
+        joined = b"".join(cells[c] for c in sorted(cells))
+        if joined or attrs.strip():
+            fh.write(b'<row r="%d"%s>%s</row>' % (r, attrs, joined))
+
+    before = sorted(r for r in existing if r < first_row)
+    for r in before:
+        write_row(r, existing[r][0], _row_cells(existing[r][1]))
+
+    r = first_row - 1
+    for r, values in enumerate(rows, start=first_row):
+        if r > last_row:
+            raise ValueError(f"streamed rows run past row {last_row}")
+        attrs, extra = existing.pop(r, (b"", b""))
+        cells = _row_cells(extra)
+        for col, value in enumerate(values, start=1):
+            ref = f"{get_column_letter(col)}{r}"
+            style = _style_of(cells[col]) if col in cells else styles.get(col)
+            xml_ = _cell_xml(ref, value, style)
+            if xml_:
+                cells[col] = xml_.encode()
+            else:
+                cells.pop(col, None)
+        write_row(r, attrs, cells)
+    if r != last_row:
+        raise ValueError(f"expected rows up to {last_row}, streamed up to {r}")
+
+    for r in sorted(existing):
+        if r > last_row:
+            write_row(r, existing[r][0], _row_cells(existing[r][1]))
+    fh.write(b"</sheetData>")
+    fh.write(
+        xml[end + len(b"</sheetData>") :] if end else xml[xml.index(b">", start) + 1 :]
+    )
+
+
+# ---------- Cached formula values ----------
+_FORMULA_CELL = re.compile(
+    rb'<c r="([A-Z]+\d+)"([^>]*)>(<f\b[^>]*/>|<f\b[^>]*>.*?</f>)'
+    rb"(?:<v\s*/>|<v>[^<]*</v>)?</c>",
+    re.S,
+)
+_TYPE = re.compile(rb'\st="[^"]*"')
+
+
+def _value_xml(value):
+    """(type attribute, <v> text) for a formula result."""
+    if isinstance(value, formula_eval.ExcelError):
+        return b' t="e"', escape(value.code).encode()
+    if isinstance(value, bool):
+        return b' t="b"', b"1" if value else b"0"
+    if isinstance(value, (int, float)):
+        return b"", repr(value).encode()
+    return b' t="str"', escape(str(value)).encode()
+
+
+def cache_values(xml, values):
+    """Write values ({"B7": 12, ...}) into sheet xml's formula cells as results.
+
+    Formula cells missing from values are left with no cached result.
+    """
+
+    def fill(m):
+        value = values.get(m.group(1).decode())
+        attrs = _TYPE.sub(b"", m.group(2))
+        if value is None:
+            return b'<c r="%s"%s>%s</c>' % (m.group(1), attrs, m.group(3))
+        kind, text = _value_xml(value)
+        return b'<c r="%s"%s%s>%s<v>%s</v></c>' % (
+            m.group(1),
+            attrs,
+            kind,
+            m.group(3),
+            text,
+        )
+
+    return _FORMULA_CELL.sub(fill, xml)
+
+
+# ---------- Shared formulas ----------
+_PLAIN_FORMULA = re.compile(rb'<c r="([A-Z]+)(\d+)"[^>]*>(<f>([^<]*)</f>)')
+# string literals and quoted sheet names: never references
+_QUOTED = re.compile(rb"(\"[^\"]*\"|'[^']*')")
+_A1 = re.compile(rb"(?<![A-Za-z0-9_.$])(\$?[A-Z]{1,3})(\$?)(\d+)(?![\d(A-Za-z_!])")
+# whole-row references (5:5) move with the row too; those formulas aren't shared
+_ROW_RANGE = re.compile(rb"(?<![A-Za-z0-9_.$])\$?\d+:\$?\d+")
+
+
+def _relative_form(text, row):
+    """text with each relative row number turned into its offset from row,
+    so two cells of a column get the same result exactly when one formula is
+    the other filled down; None for formulas that are never shared."""
+
+    def offset(m):
+        if m.group(2):
+            return m.group()
+        return b"%s[%d]" % (m.group(1), int(m.group(3)) - row)
+
+    parts = _QUOTED.split(text)
+    for i in range(0, len(parts), 2):
+        if _ROW_RANGE.search(parts[i]):
+            return None
+        parts[i] = _A1.sub(offset, parts[i])
+    return b"".join(parts)
+
+
+def share_formulas(xml):
+    """Rewrite runs of filled-down formulas in sheet xml as shared formulas.
+
+    Where the cells below a formula hold the same formula filled down, the
+    first keeps the text (<f t="shared" ref="H2:H41" si="0">F2*G2</f>) and
+    the rest just point at it (<f t="shared" si="0"/>); Excel and openpyxl
+    expand them again on load. Cached results are left as they are.
+    """
+    runs = []  # [relative form, first row, last row, column, formula]
+    current = {}  # column -> its run so far
+    for m in _PLAIN_FORMULA.finditer(xml):
+        col, row = m.group(1), int(m.group(2))
+        form = _relative_form(m.group(4), row)
+        run = current.get(col)
+        if run and form is not None and run[0] == form and run[2] == row - 1:
+            run[2] = row
+            continue
+        current[col] = run = [form, row, row, col, m.group(4)]
+        runs.append(run)
+
+    shared = {}  # cell -> its <f> element
+    si = 0
+    for _, first, last, col, formula in runs:
+        if last == first:
+            continue
+        ref = b"%s%d:%s%d" % (col, first, col, last)
+        master = b'<f t="shared" ref="%s" si="%d">%s</f>' % (ref, si, formula)
+        shared[b"%s%d" % (col, first)] = master
+        for r in range(first + 1, last + 1):
+            shared[b"%s%d" % (col, r)] = b'<f t="shared" si="%d"/>' % si
+        si += 1
+    if not shared:
+        return xml
+
+    def swap(m):
+        f = shared.get(m.group(1) + m.group(2))
+        if f is None:
+            return m.group()
+        return m.group()[: m.start(3) - m.start()] + f
+
+    return _PLAIN_FORMULA.sub(swap, xml)
+
+
+def evaluate(wb):
+    """formula_eval.evaluate(wb), and only ask Excel for a full recalculation
+    on open if some formula is left without a cached value."""
+    with instrument.span("evaluate"):
+        values = formula_eval.evaluate(wb)
+    cached = sum(len(v) for v in values.values())
+    wb.calculation.fullCalcOnLoad = cached < formula_eval.formula_count(wb)
+    return values
+
+
+# ---------- Save ----------
+def _rewrite(data, output, epoch, streams, values, sheets):
+    names = zipfile.ZipFile(io.BytesIO(data)).namelist()
+    if epoch is None:
+        zip_time = time.localtime()[:6]
+    else:
+        names.sort(key=_member_key)
+        zip_time = datetime.fromtimestamp(max(epoch, ZIP_EPOCH), timezone.utc)
+        zip_time = zip_time.timetuple()[:6]
+        stamp = datetime.fromtimestamp(epoch, timezone.utc)
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(
+        output, "w", zipfile.ZIP_DEFLATED
+    ) as dst:
+        for name in names:
+            payload = src.read(name)
+            if name in values:
+                payload = cache_values(payload, values[name])
+            if name in sheets and name not in streams:
+                payload = share_formulas(payload)
+            if name == "docProps/core.xml" and epoch is not None:
+                payload = _pin_core_dates(payload, stamp.strftime("%Y-%m-%dT%H:%M:%SZ"))
+            info = zipfile.ZipInfo(name, zip_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            if name in streams:
+                with dst.open(info, "w", force_zip64=True) as fh:
+                    write_rows(fh, payload, *streams[name])
+            else:
+                dst.writestr(info, payload)
+
+
+def save(wb, output, values=True, shared=True, tidy=True):
+    """Save wb to a path or binary stream, reproducibly if requested.
+
+    With values set (and no streamed sheets) formula results are stored too;
+    with shared set, filled-down formulas are written as shared formulas;
+    with tidy set, conditional formats are consolidated first. Returns the
+    consolidate.Report (None without tidy).
+    """
+    if lint.enabled():
+        with instrument.span("lint"):
+            lint.check_or_raise(wb)
+    report = None
+    if tidy:
+        with instrument.span("consolidate"):
+            report = consolidate.workbook(wb)
+    epoch = source_date_epoch()
+    pending = [ws for ws in wb.worksheets if ws in _STREAMS]
+    computed = evaluate(wb) if values and not pending else {}
+    if epoch is None and not pending and not computed and not shared:
+        with instrument.span("wb.save"):
+            wb.save(output)
+        return report
+    for ws in pending:
+        _name_table_columns(ws)
+    buf = io.BytesIO()
+    with instrument.span("wb.save"):
+        wb.save(buf)
+    # ws.path is only assigned once openpyxl has written the sheet
+    streams = {ws.path[1:]: _STREAMS.pop(ws) for ws in pending}
+    cached = {
+        ws.path[1:]: computed[ws.title] for ws in wb.worksheets if ws.title in computed
+    }
+    sheets = {ws.path[1:] for ws in wb.worksheets} if shared else set()
+    with instrument.span("zip rewrite"):
+        _rewrite(buf.getvalue(), output, epoch, streams, cached, sheets)
+    return report